@@ -0,0 +1,79 @@
+"""Liveness and readiness probes.
+
+    GET /health  – liveness: the process is up and the event loop answers.
+    GET /ready   – readiness: startup finished, not draining, database reachable.
+
+The database check is cached for READY_CACHE_SECONDS and shared by
+concurrent probes, so a fleet of load balancers polling every pod costs at
+most one `SELECT 1` per interval per worker.
+
+    READY_CACHE_SECONDS  secs  – how long a check result is reused (default 2)
+    READY_TIMEOUT        secs  – database check timeout (default 2)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app import lifecycle
+
+READY_CACHE_SECONDS: float = float(os.getenv("READY_CACHE_SECONDS", 2))
+READY_TIMEOUT: float = float(os.getenv("READY_TIMEOUT", 2))
+
+router = APIRouter(tags=["utility"])
+
+
+class _DatabaseCheck:
+    """Single-flight, time-cached `lifecycle.ping()`."""
+
+    def __init__(self) -> None:
+        self.checked_at = 0.0
+        self.error: Optional[str] = None
+        self._running: Optional[asyncio.Task] = None
+
+    async def _check(self) -> None:
+        try:
+            await asyncio.wait_for(lifecycle.ping(), READY_TIMEOUT)
+            self.error = None
+        except Exception as exc:                          # noqa: BLE001 – reported, not raised
+            self.error = f"{type(exc).__name__}: {exc}"[:500]
+        self.checked_at = time.monotonic()
+
+    async def result(self) -> Optional[str]:
+        """None when the database answered recently, else the last error."""
+        if time.monotonic() - self.checked_at >= READY_CACHE_SECONDS:
+            if self._running is None or self._running.done():
+                self._running = asyncio.ensure_future(self._check())
+            await asyncio.shield(self._running)
+        return self.error
+
+    def reset(self) -> None:
+        self.checked_at, self.error, self._running = 0.0, None, None
+
+
+database_check = _DatabaseCheck()
+
+
+@router.get("/health")
+async def health() -> dict[str, str]:
+    """Liveness probe: no I/O, so it stays green while the database is down."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    """Readiness probe: 200 once started and the database answers, 503 otherwise."""
+    state = lifecycle.state
+    if not state.started or state.draining:
+        status = "draining" if state.draining else "starting"
+        return JSONResponse(status_code=503, content={"status": status})
+    error = await database_check.result()
+    if error:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": error})
+    return JSONResponse(content={"status": "ready", "database": "ok", "in_flight": state.in_flight})
@@ -0,0 +1,5 @@
+"""AI gap analysis: chunk a policy document, ask a model for gaps, store them.
+
+Runs as background jobs (`AnalysisJob`) – see `worker.py` – so no API
+worker ever waits on the model.
+"""
@@ -0,0 +1,105 @@
+"""Persistent cache of model output per document chunk.
+
+Key = sha256(prompt version, model name, normalized chunk text), so a cached
+answer is only reused for the exact same question. Entries live in the
+`analysis_cache` table; reads bump `last_used_at` and, once the table holds
+more than ANALYSIS_CACHE_MAX_ENTRIES rows, the least recently used go.
+
+None of these helpers commit – they run inside the caller's transaction.
+
+    ANALYSIS_CACHE_MAX_ENTRIES  int  – size cap, 0 disables the cache (default 50000)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+
+from app.analysis.chunking import normalize
+from app.analysis.client import PROMPT_VERSION, GapFinding
+from app.models import AnalysisCacheEntry, AnalysisJob
+
+ANALYSIS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 50_000))
+
+
+def chunk_key(chunk: str, model: str) -> str:
+    payload = "\0".join((PROMPT_VERSION, model, normalize(chunk)))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_many(session, keys: Iterable[str]) -> Dict[str, List[GapFinding]]:
+    """Cached findings for the keys that are present; bumps their recency."""
+    keys = list(set(keys))
+    if not keys or not ANALYSIS_CACHE_MAX_ENTRIES:
+        return {}
+    rows = (await session.exec(
+        select(AnalysisCacheEntry.key, AnalysisCacheEntry.findings)
+        .where(AnalysisCacheEntry.key.in_(keys))
+    )).all()
+    if rows:
+        await session.exec(
+            update(AnalysisCacheEntry)
+            .where(AnalysisCacheEntry.key.in_([row.key for row in rows]))
+            .values(hits=AnalysisCacheEntry.hits + 1, last_used_at=datetime.utcnow())
+        )
+    return {row.key: [GapFinding(**f) for f in row.findings] for row in rows}
+
+
+async def put_many(session, model: str, results: Dict[str, List[GapFinding]]) -> None:
+    """Store fresh results, then trim the table back to its size cap."""
+    if not results or not ANALYSIS_CACHE_MAX_ENTRIES:
+        return
+    rows = [
+        AnalysisCacheEntry(key=key, model=model, prompt_version=PROMPT_VERSION,
+                           findings=[f.model_dump() for f in findings]).model_dump()
+        for key, findings in results.items()
+    ]
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(session.get_bind().dialect.name)
+    if dialect is None:
+        session.add_all(AnalysisCacheEntry(**row) for row in rows)
+        await session.flush()
+    else:
+        # Another worker may have cached the same chunk meanwhile: keep theirs.
+        await session.exec(dialect.insert(AnalysisCacheEntry).values(rows)
+                           .on_conflict_do_nothing(index_elements=["key"]))
+    await evict(session)
+
+
+async def evict(session, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES) -> int:
+    """Delete the least recently used entries beyond `max_entries`."""
+    total = (await session.exec(select(func.count()).select_from(AnalysisCacheEntry))).one()
+    excess = total - max_entries
+    if excess <= 0:
+        return 0
+    oldest = (select(AnalysisCacheEntry.key)
+              .order_by(AnalysisCacheEntry.last_used_at, AnalysisCacheEntry.key)
+              .limit(excess))
+    await session.exec(delete(AnalysisCacheEntry).where(AnalysisCacheEntry.key.in_(oldest)))
+    return excess
+
+
+async def stats(session) -> dict:
+    """Cache size plus chunk hit rate across all finished analysis jobs."""
+    entries, hits = (await session.exec(
+        select(func.count(), func.coalesce(func.sum(AnalysisCacheEntry.hits), 0))
+        .select_from(AnalysisCacheEntry)
+    )).one()
+    chunks, cached = (await session.exec(
+        select(func.coalesce(func.sum(AnalysisJob.chunks_total), 0),
+               func.coalesce(func.sum(AnalysisJob.chunks_cached), 0))
+        .where(AnalysisJob.status == "done")
+    )).one()
+    return {
+        "entries": entries,
+        "max_entries": ANALYSIS_CACHE_MAX_ENTRIES,
+        "entry_hits": hits,
+        "chunks_analyzed": chunks,
+        "chunks_cached": cached,
+        "hit_rate": cached / chunks if chunks else None,
+    }
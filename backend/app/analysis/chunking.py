@@ -0,0 +1,62 @@
+"""Split policy text into model-sized chunks on paragraph boundaries."""
+
+import hashlib
+import re
+from typing import List
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_SPACES = re.compile(r"[ \t]+")
+
+
+def normalize(text: str) -> str:
+    """Canonical form used for chunking (and hashing): tidy whitespace."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(lines).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for rate limiting."""
+    return max(1, len(text) // 4)
+
+
+def _ends_chunk(paragraph: str, target_chars: int) -> bool:
+    # Chance proportional to length, so chunks average ~target_chars; decided by
+    # the paragraph's own hash, so the same paragraph always decides the same way.
+    digest = hashlib.blake2b(paragraph.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") < len(paragraph) / target_chars * 2 ** 64
+
+
+def split_chunks(text: str, max_chars: int) -> List[str]:
+    """Group whole paragraphs into chunks of at most `max_chars`.
+
+    Boundaries are content-defined: a chunk ends after a paragraph whose
+    hash says so (`_ends_chunk`, about max_chars / 4 per chunk on average),
+    not when the running total fills up. An edit therefore only changes the
+    chunk it falls in – plus, rarely, the next one if a `max_chars` cut was
+    forced – and every other chunk keeps its hash and its cache entry.
+    A paragraph longer than `max_chars` is hard-split into chunks of its own.
+    """
+    target_chars = max(1, max_chars // 4)
+    chunks: List[str] = []
+    current = ""
+    for paragraph in _BLANK_LINES.split(normalize(text)):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars))
+            continue
+        if current and len(current) + 2 + len(paragraph) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        if _ends_chunk(paragraph, target_chars):
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
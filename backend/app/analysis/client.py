@@ -0,0 +1,113 @@
+"""Model clients for gap analysis.
+
+Every client takes a *batch* of chunks and returns one list of findings per
+chunk, so several chunks share one round-trip.
+
+    ANALYSIS_MODEL   stub | openai   (default: openai if OPENAI_API_KEY is set)
+    OPENAI_MODEL     model name      (default gpt-4o-mini)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import List, Literal, Protocol
+
+from pydantic import BaseModel
+
+# Bump when the prompt or output schema changes – cached results key on it.
+PROMPT_VERSION = "gap-v1"
+
+OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+ANALYSIS_MODEL: str = os.getenv("ANALYSIS_MODEL", "openai" if os.getenv("OPENAI_API_KEY") else "stub")
+
+SYSTEM_PROMPT = """You are a HIPAA compliance auditor. For each numbered chunk of a
+clinic policy document, list concrete compliance gaps. Reply with JSON:
+{"results": [{"chunk": <index>, "gaps": [{"description": "...",
+"severity": "low" | "medium" | "high"}]}]}. Use an empty list when a chunk
+has no gaps."""
+
+
+class GapFinding(BaseModel):
+    description: str
+    severity: Literal["low", "medium", "high"]
+
+
+class TransientModelError(Exception):
+    """A failure worth retrying (rate limit, timeout, 5xx)."""
+
+
+class ModelClient(Protocol):
+    name: str
+
+    async def analyze(self, chunks: List[str]) -> List[List[GapFinding]]: ...
+
+
+class StubModelClient:
+    """Offline, deterministic stand-in: flags sentences with tell-tale phrases."""
+
+    name = "stub"
+
+    RULES = [
+        (re.compile(r"\b(not (yet )?implemented|no (formal )?(policy|process)|none in place)\b", re.I), "high"),
+        (re.compile(r"\b(tbd|todo|to be determined|pending review)\b", re.I), "medium"),
+        (re.compile(r"\b(ad[- ]hoc|informally|as needed)\b", re.I), "low"),
+    ]
+    _SENTENCES = re.compile(r"(?<=[.!?])\s+|\n+")
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _findings(self, chunk: str) -> List[GapFinding]:
+        findings = []
+        for sentence in self._SENTENCES.split(chunk):
+            for pattern, severity in self.RULES:
+                if pattern.search(sentence):
+                    findings.append(GapFinding(description=f"Gap: {sentence.strip()[:300]}",
+                                               severity=severity))
+                    break
+        return findings
+
+    async def analyze(self, chunks: List[str]) -> List[List[GapFinding]]:
+        self.calls += 1
+        return [self._findings(chunk) for chunk in chunks]
+
+
+class OpenAIModelClient:
+    """Chat-completions client using JSON mode; one request per batch."""
+
+    def __init__(self, model: str = OPENAI_MODEL, client=None):
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI()
+        self.client = client
+        self.name = model
+
+    async def analyze(self, chunks: List[str]) -> List[List[GapFinding]]:
+        import openai
+
+        prompt = "\n\n".join(f"### Chunk {i}\n{chunk}" for i, chunk in enumerate(chunks))
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.name,
+                temperature=0,
+                response_format={"type": "json_object"},
+                messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                          {"role": "user", "content": prompt}],
+            )
+        except (openai.RateLimitError, openai.APIConnectionError,
+                openai.APITimeoutError, openai.InternalServerError) as exc:
+            raise TransientModelError(str(exc)) from exc
+
+        results: List[List[GapFinding]] = [[] for _ in chunks]
+        payload = json.loads(response.choices[0].message.content or "{}")
+        for item in payload.get("results", []):
+            index = item.get("chunk")
+            if isinstance(index, int) and 0 <= index < len(chunks):
+                results[index] = [GapFinding(**gap) for gap in item.get("gaps", [])]
+        return results
+
+
+def get_model_client() -> ModelClient:
+    return OpenAIModelClient() if ANALYSIS_MODEL == "openai" else StubModelClient()
@@ -0,0 +1,44 @@
+"""Concurrency + token-rate limiting for model calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class RateLimiter:
+    """At most `concurrency` calls in flight and `tokens_per_minute` spent.
+
+    The token budget is a bucket refilled continuously; `tokens_per_minute=0`
+    disables it.
+    """
+
+    def __init__(self, concurrency: int, tokens_per_minute: int):
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self.capacity = tokens_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def _spend(self, tokens: int) -> None:
+        if not self.capacity:
+            return
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.capacity / 60)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) * 60 / self.capacity)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        async with self._slots:
+            await self._spend(tokens)
+            yield
@@ -0,0 +1,160 @@
+"""AI gap-analysis worker.
+
+Turns a queued `AnalysisJob` into `Gap` rows: read the policy file from
+storage, split it into chunks, send batches of chunks to the model under a
+concurrency + token-rate limit (retrying transient errors with exponential
+backoff), then insert every finding in one flush.
+
+Re-analysis is incremental: chunks whose gaps are already on the policy are
+skipped, other chunks are looked up in the analysis cache, and only the
+rest reach the model (see app/analysis/cache.py).
+
+Run it next to the API (one or more processes):
+
+    python -m app.analysis.worker
+
+or set ANALYSIS_INLINE_WORKER=1 to run it inside the API process (dev).
+
+    ANALYSIS_CONCURRENCY        model calls in flight per process (default 4)
+    ANALYSIS_TOKENS_PER_MINUTE  token budget per process, 0 = unlimited (default 60000)
+    ANALYSIS_BATCH_SIZE         chunks per model call (default 4)
+    ANALYSIS_CHUNK_CHARS        max characters per chunk (default 6000)
+    ANALYSIS_MAX_RETRIES        retries per batch on transient errors (default 4)
+    ANALYSIS_MAX_DOC_BYTES      policy bytes read for analysis (default 5 MiB)
+    ANALYSIS_JOB_CONCURRENCY    policies analysed at once per process (default 2)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+import os
+import random
+from typing import Dict, List, Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analysis import cache
+from app.analysis.chunking import estimate_tokens, split_chunks
+from app.analysis.client import GapFinding, ModelClient, TransientModelError, get_model_client
+from app.analysis.limiter import RateLimiter
+from app.jobs import JobRunner, SessionFactory, serve
+from app.models import AnalysisJob, Gap, Policy, Task
+from app.storage import get_storage
+from app.storage.base import StorageBackend
+
+ANALYSIS_CONCURRENCY: int = int(os.getenv("ANALYSIS_CONCURRENCY", 4))
+ANALYSIS_TOKENS_PER_MINUTE: int = int(os.getenv("ANALYSIS_TOKENS_PER_MINUTE", 60_000))
+ANALYSIS_BATCH_SIZE: int = int(os.getenv("ANALYSIS_BATCH_SIZE", 4))
+ANALYSIS_CHUNK_CHARS: int = int(os.getenv("ANALYSIS_CHUNK_CHARS", 6000))
+ANALYSIS_MAX_RETRIES: int = int(os.getenv("ANALYSIS_MAX_RETRIES", 4))
+ANALYSIS_MAX_DOC_BYTES: int = int(os.getenv("ANALYSIS_MAX_DOC_BYTES", 5 * 1024 * 1024))
+ANALYSIS_JOB_CONCURRENCY: int = int(os.getenv("ANALYSIS_JOB_CONCURRENCY", 2))
+ANALYSIS_INLINE_WORKER: bool = os.getenv("ANALYSIS_INLINE_WORKER", "0").lower() in {"1", "true", "yes", "on"}
+
+BACKOFF_BASE = 1.0      # seconds; doubled per attempt, capped at BACKOFF_MAX
+BACKOFF_MAX = 30.0
+
+log = logging.getLogger(__name__)
+
+
+async def read_text(storage: StorageBackend, key: str, limit: int = ANALYSIS_MAX_DOC_BYTES) -> str:
+    """Stream at most `limit` bytes of `key` and decode them as UTF-8."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts: List[str] = []
+    remaining = limit
+    async for chunk in storage.open_range(key, 0, limit - 1):
+        parts.append(decoder.decode(chunk[:remaining]))
+        remaining -= len(chunk)
+        if remaining <= 0:
+            break
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+class GapAnalyzer:
+    """`JobRunner` handler for `AnalysisJob` rows."""
+
+    def __init__(self, client: Optional[ModelClient] = None, storage: Optional[StorageBackend] = None,
+                 limiter: Optional[RateLimiter] = None):
+        self.client = client or get_model_client()
+        self.storage = storage or get_storage()
+        self.limiter = limiter or RateLimiter(ANALYSIS_CONCURRENCY, ANALYSIS_TOKENS_PER_MINUTE)
+
+    async def _call(self, batch: List[str]) -> List[List[GapFinding]]:
+        tokens = sum(estimate_tokens(chunk) for chunk in batch)
+        for attempt in range(ANALYSIS_MAX_RETRIES + 1):
+            try:
+                async with self.limiter.slot(tokens):
+                    return await self.client.analyze(batch)
+            except TransientModelError:
+                if attempt == ANALYSIS_MAX_RETRIES:
+                    raise
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+                await asyncio.sleep(delay * (0.5 + random.random() / 2))   # jitter
+        raise AssertionError("unreachable")
+
+    async def analyze_chunks(self, chunks: List[str]) -> List[List[GapFinding]]:
+        """Findings per chunk; batches run concurrently under the limiter."""
+        batches = [chunks[i:i + ANALYSIS_BATCH_SIZE] for i in range(0, len(chunks), ANALYSIS_BATCH_SIZE)]
+        results = await asyncio.gather(*(self._call(batch) for batch in batches))
+        return [findings for batch in results for findings in batch]
+
+    async def __call__(self, session: AsyncSession, job: AnalysisJob) -> None:
+        policy = await session.get(Policy, job.policy_id)
+        if policy is None:
+            raise LookupError(f"Policy {job.policy_id} no longer exists")
+
+        text = await read_text(self.storage, policy.file_path)
+        chunks: Dict[str, str] = {}                 # cache key → chunk, document order
+        for chunk in split_chunks(text, ANALYSIS_CHUNK_CHARS):
+            chunks.setdefault(cache.chunk_key(chunk, self.client.name), chunk)
+        job.chunks_total, job.chunks_done, job.gaps_created = len(chunks), 0, 0
+        session.add(job)
+        await session.commit()                      # progress is visible while the model runs
+
+        # Chunks whose gaps are already on the policy need nothing at all.
+        existing = (await session.exec(
+            select(Gap).where(Gap.policy_id == policy.id, Gap.source_hash.is_not(None))
+        )).all()
+        current = {gap.source_hash for gap in existing}
+        changed = [key for key in chunks if key not in current]
+
+        findings = await cache.get_many(session, changed)
+        misses = [key for key in changed if key not in findings]
+        fresh = dict(zip(misses, await self.analyze_chunks([chunks[key] for key in misses])))
+        await cache.put_many(session, self.client.name, fresh)
+        findings.update(fresh)
+
+        gaps = [
+            Gap(policy_id=policy.id, description=f.description, severity=f.severity, source_hash=key)
+            for key in changed for f in findings[key]
+        ]
+        session.add_all(gaps)                       # one flush, multi-row INSERT
+
+        # Gaps from edited/removed chunks are dropped unless someone is already
+        # working them (they have tasks).
+        stale = [gap for gap in existing if gap.source_hash not in chunks]
+        tracked = set((await session.exec(
+            select(Task.gap_id).where(Task.gap_id.in_([gap.id for gap in stale]))
+        )).all()) if stale else set()
+        removed = [gap for gap in stale if gap.id not in tracked]
+        for gap in removed:
+            await session.delete(gap)
+
+        job.chunks_done, job.chunks_cached = len(chunks), len(chunks) - len(misses)
+        job.gaps_created, job.gaps_removed = len(gaps), len(removed)
+        log.info("Policy %s: %d chunks (%d model calls skipped), +%d/-%d gaps",
+                 policy.id, len(chunks), job.chunks_cached, len(gaps), len(removed))
+
+
+def build_runner(session_factory: Optional[SessionFactory] = None, **analyzer_kw) -> JobRunner:
+    return JobRunner(AnalysisJob, GapAnalyzer(**analyzer_kw),
+                     concurrency=ANALYSIS_JOB_CONCURRENCY, session_factory=session_factory)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(build_runner()))
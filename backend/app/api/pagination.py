@@ -0,0 +1,60 @@
+"""Keyset (cursor) pagination helpers for list endpoints.
+
+Lists are ordered newest first on `(timestamp, id)`. The cursor is an opaque
+base64 token of the last row's key, so page N costs the same index range
+scan as page 1 – no OFFSET.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(ts: datetime, id_: int) -> str:
+    raw = f"{ts.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, id_ = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(ts), int(id_)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset(statement: Any, ts_col: Any, id_col: Any, cursor: Optional[str], limit: int) -> Any:
+    """Order `statement` by `(ts_col, id_col)` DESC and seek past `cursor`.
+
+    Fetches `limit + 1` rows so `page()` can tell whether more exist.
+    """
+    if cursor:
+        statement = statement.where(tuple_(ts_col, id_col) < decode_cursor(cursor))
+    return statement.order_by(ts_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def page(rows: Sequence[Any], limit: int, ts_attr: str = "created_at") -> dict[str, Any]:
+    """Build a `Page` payload from the `limit + 1` rows `keyset()` fetched."""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, ts_attr), last.id)
+    return {"items": items, "next_cursor": next_cursor}
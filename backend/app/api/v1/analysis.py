@@ -0,0 +1,73 @@
+"""AI gap analysis – enqueue a job, poll its status.
+
+The request only inserts an `AnalysisJob` row; the work happens in
+`app.analysis.worker`, so no API worker is tied up while the model runs.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlmodel import select
+
+from app.analysis import cache
+from app.auth.dependencies import get_current_user
+from app.db import get_async_session
+from app.models import AnalysisJob, Policy, User
+
+router = APIRouter(tags=["analysis"])
+
+
+class AnalysisJobRead(BaseModel):
+    id: int
+    policy_id: int
+    status: str
+    attempts: int
+    error: Optional[str]
+    chunks_total: int
+    chunks_done: int
+    chunks_cached: int
+    gaps_created: int
+    gaps_removed: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+@router.post("/policies/{policy_id}/analysis", response_model=AnalysisJobRead,
+             status_code=status.HTTP_202_ACCEPTED)
+async def start_analysis(policy_id: int, session=Depends(get_async_session),
+                         user: User = Depends(get_current_user)):
+    policy = await session.get(Policy, policy_id)
+    if policy is None:
+        raise HTTPException(status_code=404, detail="Policy not found")
+
+    # One analysis per policy at a time: hand back the job already in flight.
+    pending = (await session.exec(
+        select(AnalysisJob)
+        .where(AnalysisJob.policy_id == policy_id, AnalysisJob.status.in_(("queued", "running")))
+        .order_by(AnalysisJob.id.desc()).limit(1)
+    )).first()
+    if pending is not None:
+        return pending
+
+    job = AnalysisJob(policy_id=policy_id, created_by=user.id)
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+    return job
+
+
+@router.get("/analysis/jobs/{job_id}", response_model=AnalysisJobRead)
+async def get_analysis_job(job_id: int, session=Depends(get_async_session)):
+    job = await session.get(AnalysisJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/analysis/cache")
+async def analysis_cache_stats(session=Depends(get_async_session)) -> dict:
+    """Size of the chunk cache and how many chunks skipped the model."""
+    return await cache.stats(session)
@@ -0,0 +1,271 @@
+"""Bulk import / export of compliance data as NDJSON or CSV.
+
+    POST /import/{gaps|tasks}                       ?format=ndjson|csv&atomic=false
+    GET  /export/{policies|gaps|tasks|evidence}     ?format=ndjson|csv
+
+Imports are spooled to a temp file, then parsed, validated and inserted
+IMPORT_BATCH_SIZE rows at a time with one multi-row INSERT per batch. Bad
+rows (schema errors, unknown parent ids) are reported by row number and
+skipped – or, with `atomic=true`, abort the whole import.
+
+Exports stream from a server-side cursor, EXPORT_BATCH_SIZE rows at a time,
+so memory use is flat however big the table is.
+
+Both are confined to the caller's organization: imported rows are stamped
+with it, parents in other organizations count as missing, and exports only
+contain its rows. Imported tasks also get their first status-history event
+(see app/compliance/history.py) and, when already due, their reminders
+(app/reminders/queue.py); imported rows reach the live change feed like
+any other write (app/realtime/).
+
+    IMPORT_BATCH_SIZE   rows per INSERT (default 1000)
+    IMPORT_MAX_BYTES    request body cap (default 256 MiB)
+    IMPORT_MAX_ERRORS   row errors listed in the report (default 100)
+    EXPORT_BATCH_SIZE   rows fetched per round-trip (default 1000)
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Tuple, Union
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.api.v1.files import declared_length
+from app.compliance import history, scores
+from app.db import get_async_session, stream_partitions
+from app.models import Evidence, Gap, Policy, Task, User
+from app.realtime import hub as realtime
+from app.reminders import queue as reminders
+from app.tenancy import current_tenant, tenant_clause
+
+IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", 256 * 1024 * 1024))
+IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+router = APIRouter(tags=["bulk"])
+
+Format = Literal["ndjson", "csv"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# ---------------------------------------------------------------------------
+# Row schemas ----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class GapImport(BaseModel):
+    policy_id: int
+    description: str = Field(min_length=1)
+    severity: Literal["low", "medium", "high"]
+
+
+class TaskImport(BaseModel):
+    gap_id: int
+    title: str = Field(min_length=1)
+    assigned_to: Optional[int] = None
+    due_date: Optional[datetime] = None
+    status: Literal["open", "in_progress", "done"] = "open"
+
+
+# kind → (table model, row schema, {foreign-key field: referenced model})
+IMPORTS = {
+    "gaps": (Gap, GapImport, {"policy_id": Policy}),
+    "tasks": (Task, TaskImport, {"gap_id": Gap, "assigned_to": User}),
+}
+EXPORTS = {"policies": Policy, "gaps": Gap, "tasks": Task, "evidence": Evidence}
+
+
+class RowError(BaseModel):
+    row: int                      # 1-based data row (CSV) / line (NDJSON)
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    kind: str
+    received: int
+    inserted: int
+    failed: int
+    errors: List[RowError]
+    errors_truncated: bool
+
+# ---------------------------------------------------------------------------
+# Parsing (runs in a worker thread) ------------------------------------------
+# ---------------------------------------------------------------------------
+
+Parsed = Tuple[int, Union[BaseModel, List[str]]]
+
+
+def _records(text: io.TextIOBase, fmt: str) -> Iterator[Tuple[int, Any]]:
+    if fmt == "csv":
+        for n, row in enumerate(csv.DictReader(text), 1):
+            # Empty cells mean "not set", not "empty string".
+            yield n, {k: v for k, v in row.items() if k and v != ""}
+        return
+    for n, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield n, json.loads(line)
+        except ValueError as exc:
+            yield n, [f"invalid JSON: {exc}"]
+
+
+def _validate(records: Iterator[Tuple[int, Any]], schema: type[BaseModel], size: int) -> List[Parsed]:
+    batch: List[Parsed] = []
+    for n, record in itertools.islice(records, size):
+        if isinstance(record, list):
+            batch.append((n, record))
+        elif not isinstance(record, dict):
+            batch.append((n, ["expected an object"]))
+        else:
+            try:
+                batch.append((n, schema.model_validate(record)))
+            except ValidationError as exc:
+                batch.append((n, [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()]))
+    return batch
+
+
+async def _spool(request: Request) -> tempfile.SpooledTemporaryFile:
+    too_large = HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                              detail=f"Import exceeds {IMPORT_MAX_BYTES} bytes")
+    if declared_length(request) > IMPORT_MAX_BYTES:
+        raise too_large
+    # Past max_size the spool rolls over to disk: keep that I/O off the event loop.
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    total = 0
+    async for chunk in request.stream():
+        total += len(chunk)
+        if total > IMPORT_MAX_BYTES:
+            spool.close()
+            raise too_large
+        await anyio.to_thread.run_sync(spool.write, chunk)
+    await anyio.to_thread.run_sync(spool.seek, 0)
+    return spool
+
+
+async def _check_references(session, batch: List[Parsed], references: Dict[str, Any]) -> None:
+    """Turn rows pointing at missing parents into row errors (one query per FK)."""
+    for field, parent in references.items():
+        wanted = {getattr(row, field) for _, row in batch if isinstance(row, BaseModel)}
+        wanted.discard(None)
+        if not wanted:
+            continue
+        found = set((await session.exec(select(parent.id).where(parent.id.in_(wanted)))).all())
+        for i, (n, row) in enumerate(batch):
+            if isinstance(row, BaseModel) and getattr(row, field) not in found | {None}:
+                batch[i] = (n, [f"{field}: {parent.__name__.lower()} {getattr(row, field)} does not exist"])
+
+# ---------------------------------------------------------------------------
+# Endpoints ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@router.post("/import/{kind}", response_model=ImportReport)
+async def bulk_import(
+    kind: Literal["gaps", "tasks"],
+    request: Request,
+    format: Optional[Format] = None,
+    atomic: bool = False,
+    session=Depends(get_async_session),
+):
+    """Insert many gaps/tasks; rows that fail validation are reported, not inserted."""
+    model, schema, references = IMPORTS[kind]
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    report = ImportReport(kind=kind, received=0, inserted=0, failed=0, errors=[], errors_truncated=False)
+
+    touched_gaps: set[int] = set()
+    tenant_id = current_tenant(session)          # Core INSERTs skip the ORM stamping hook
+    spool = await _spool(request)
+    try:
+        text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+        records = _records(text, fmt)
+        while batch := await anyio.to_thread.run_sync(_validate, records, schema, IMPORT_BATCH_SIZE):
+            report.received += len(batch)
+            await _check_references(session, batch, references)
+            rows, now = [], datetime.utcnow()
+            for n, row in batch:
+                if isinstance(row, BaseModel):
+                    # Plain dicts: building table-model instances costs more than the INSERT.
+                    rows.append({**row.model_dump(), "created_at": now, "tenant_id": tenant_id})
+                    continue
+                report.failed += 1
+                if len(report.errors) < IMPORT_MAX_ERRORS:
+                    report.errors.append(RowError(row=n, errors=row))
+                else:
+                    report.errors_truncated = True
+            if not rows or (atomic and report.failed):
+                continue
+            # Multi-row RETURNING has no inherent order; the history pairs ids with rows.
+            stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+            ids = (await session.exec(stmt, params=rows)).scalars().all()
+            report.inserted += len(ids)
+            if model is Task:
+                await session.run_sync(lambda s: history.record(
+                    s.connection(), [(i, row["status"], tenant_id) for i, row in zip(ids, rows)],
+                    actor=s.info.get("actor")))
+                await session.run_sync(lambda s: reminders.queue_for(s.connection(), ids))
+            await session.run_sync(lambda s: realtime.created(s, realtime.KINDS[model], ids, tenant_id))
+            touched_gaps.update(ids if model is Gap else (row["gap_id"] for row in rows))
+    finally:
+        spool.close()
+
+    if atomic and report.failed:
+        await session.rollback()
+        report.inserted = 0
+        return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            content=report.model_dump())
+    # Core inserts skip the ORM flush hook: roll the scores up once, here.
+    await session.run_sync(lambda s: scores.refresh(s.connection(), gap_ids=touched_gaps))
+    await session.commit()
+    return report
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+async def _serialize(rows: AsyncIterator, columns: List[str], fmt: str) -> AsyncIterator[str]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for partition in rows:
+            writer.writerows(
+                ["" if v is None else v.isoformat() if isinstance(v, (datetime, date)) else v for v in row]
+                for row in partition
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+        return
+    async for partition in rows:
+        yield "".join(json.dumps(dict(row._mapping), default=_json_default) + "\n" for row in partition)
+
+
+@router.get("/export/{kind}")
+async def bulk_export(
+    kind: Literal["policies", "gaps", "tasks", "evidence"],
+    format: Format = Query("ndjson"),
+    session=Depends(get_async_session),
+):
+    """Every row of `kind`, oldest id first, streamed as NDJSON or CSV."""
+    table = EXPORTS[kind].__table__
+    # Core statement on its own connection: no ORM tenant criteria, filter here.
+    stmt = table.select().where(tenant_clause(table, session)).order_by(table.c.id)
+    rows = stream_partitions(session, stmt, EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        _serialize(rows, [c.name for c in table.columns], format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
@@ -0,0 +1,141 @@
+"""Compliance dashboard for the current user.
+
+Both endpoints issue a fixed number of queries however large the tree is:
+`/dashboard` rolls counts up with GROUP BY (4 queries), `/dashboard/tree`
+walks Policy → Gap → Task → Evidence with `selectinload` (4 queries).
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.auth.dependencies import get_current_user
+from app.db import get_async_session
+from app.models import Evidence, Gap, Policy, Task, User
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+TASK_STATUSES = ("open", "in_progress", "done")
+SEVERITIES = ("low", "medium", "high")
+
+
+class PolicySummary(BaseModel):
+    policy_id: int
+    title: str
+    tasks: Dict[str, int]
+    gaps: Dict[str, int]
+    evidence: int
+
+
+class _Node(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EvidenceNode(_Node):
+    id: int
+    file_path: str
+    uploaded_at: datetime
+
+
+class TaskNode(_Node):
+    id: int
+    title: str
+    status: str
+    due_date: Optional[datetime] = None
+    assigned_to: Optional[int] = None
+    evidence: List[EvidenceNode]
+
+
+class GapNode(_Node):
+    id: int
+    description: str
+    severity: str
+    tasks: List[TaskNode]
+
+
+class PolicyNode(_Node):
+    id: int
+    title: str
+    created_at: datetime
+    gaps: List[GapNode]
+
+
+@router.get("", response_model=List[PolicySummary])
+async def dashboard_summary(
+    user: User = Depends(get_current_user),
+    session=Depends(get_async_session),
+):
+    """Per-policy task status, gap severity and evidence counts."""
+    policies = (
+        await session.exec(
+            select(Policy.id, Policy.title)
+            .where(Policy.owner_id == user.id)
+            .order_by(Policy.created_at.desc(), Policy.id.desc())
+        )
+    ).all()
+
+    tasks: dict[int, dict[str, int]] = defaultdict(dict)
+    for policy_id, task_status, n in await session.exec(
+        select(Gap.policy_id, Task.status, func.count(Task.id))
+        .join(Task, Task.gap_id == Gap.id)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .where(Policy.owner_id == user.id)
+        .group_by(Gap.policy_id, Task.status)
+    ):
+        tasks[policy_id][task_status] = n
+
+    gaps: dict[int, dict[str, int]] = defaultdict(dict)
+    for policy_id, severity, n in await session.exec(
+        select(Gap.policy_id, Gap.severity, func.count(Gap.id))
+        .join(Policy, Policy.id == Gap.policy_id)
+        .where(Policy.owner_id == user.id)
+        .group_by(Gap.policy_id, Gap.severity)
+    ):
+        gaps[policy_id][severity] = n
+
+    evidence: dict[int, int] = dict(
+        (
+            await session.exec(
+                select(Gap.policy_id, func.count(Evidence.id))
+                .join(Task, Task.gap_id == Gap.id)
+                .join(Evidence, Evidence.task_id == Task.id)
+                .join(Policy, Policy.id == Gap.policy_id)
+                .where(Policy.owner_id == user.id)
+                .group_by(Gap.policy_id)
+            )
+        ).all()
+    )
+
+    return [
+        PolicySummary(
+            policy_id=policy_id,
+            title=title,
+            tasks={s: tasks[policy_id].get(s, 0) for s in TASK_STATUSES},
+            gaps={s: gaps[policy_id].get(s, 0) for s in SEVERITIES},
+            evidence=evidence.get(policy_id, 0),
+        )
+        for policy_id, title in policies
+    ]
+
+
+@router.get("/tree", response_model=List[PolicyNode])
+async def dashboard_tree(
+    user: User = Depends(get_current_user),
+    session=Depends(get_async_session),
+):
+    """The full Policy → Gap → Task → Evidence tree, eager-loaded per level."""
+    result = await session.exec(
+        select(Policy)
+        .where(Policy.owner_id == user.id)
+        .order_by(Policy.created_at.desc(), Policy.id.desc())
+        .options(
+            selectinload(Policy.gaps).selectinload(Gap.tasks).selectinload(Task.evidence)
+        )
+    )
+    return result.all()
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import select
+
+from app.api.pagination import DEFAULT_LIMIT, MAX_LIMIT, Page, keyset, page
+from app.db import get_async_session
+from app.models import Evidence
+
+router = APIRouter(prefix="/evidence", tags=["evidence"])
+
+
+@router.get("", response_model=Page[Evidence])
+async def list_evidence(
+    task_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session=Depends(get_async_session),
+):
+    """Most recently uploaded evidence first."""
+    stmt = select(Evidence)
+    if task_id is not None:
+        stmt = stmt.where(Evidence.task_id == task_id)
+    rows = (
+        await session.exec(keyset(stmt, Evidence.uploaded_at, Evidence.id, cursor, limit))
+    ).all()
+    return page(rows, limit, ts_attr="uploaded_at")
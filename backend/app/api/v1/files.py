@@ -0,0 +1,367 @@
+"""Streaming upload/download of policy documents and evidence files.
+
+Request bodies are raw bytes (not multipart/form-data) and flow straight to
+the storage backend in STORAGE_CHUNK_SIZE blocks while their SHA-256 is
+computed, so memory use is flat regardless of file size.
+
+    PUT    /policies/{id}/file            replace a policy document
+    POST   /tasks/{id}/evidence           attach an evidence file to a task
+    POST   /tasks/{id}/evidence/by-hash   attach already-stored bytes (no upload)
+    DELETE /evidence/{id}                 detach; blob deleted with its last reference
+    GET    /policies/{id}/file            download (supports Range)
+    GET    /evidence/{id}/file            download (supports Range)
+
+Evidence is content-addressed (app/storage/blobs.py): uploads are staged,
+hashed, then either dropped in favour of an existing blob or renamed to
+`blobs/…/<sha256>-<generation>`.
+
+Resumable uploads for large files:
+
+    POST   /uploads                       start → {id}
+    PUT    /uploads/{id}/parts/{n}        send part n (re-send to retry)
+    GET    /uploads/{id}                  parts received so far
+    POST   /uploads/{id}/complete         assemble and attach
+    DELETE /uploads/{id}                  abort
+"""
+
+import re
+import uuid
+from typing import AsyncIterator, List, Literal, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlmodel import select
+
+from app.auth.dependencies import get_current_user
+from app.db import get_async_session
+from app.models import Evidence, Policy, Task, Upload, UploadPart, User
+from app.storage import (
+    STORAGE_CHUNK_SIZE, STORAGE_MAX_UPLOAD_BYTES, ObjectNotFound, PartTooLarge, StorageBackend,
+    StoredObject, blobs, get_storage, rechunk,
+)
+
+router = APIRouter(tags=["files"])
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# ---------------------------------------------------------------------------
+# Helpers --------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                         detail=f"Upload exceeds {STORAGE_MAX_UPLOAD_BYTES} bytes")
+
+
+def declared_length(request: Request) -> int:
+    """The request's Content-Length (0 if absent); 400 if it is not a number."""
+    declared = request.headers.get("content-length")
+    try:
+        return int(declared) if declared else 0
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Length")
+
+
+async def _body(request: Request) -> AsyncIterator[bytes]:
+    """The request body in fixed-size chunks, capped at STORAGE_MAX_UPLOAD_BYTES."""
+    if declared_length(request) > STORAGE_MAX_UPLOAD_BYTES:
+        raise _too_large()
+    total = 0
+    async for chunk in rechunk(request.stream(), STORAGE_CHUNK_SIZE):
+        total += len(chunk)
+        if total > STORAGE_MAX_UPLOAD_BYTES:
+            raise _too_large()
+        yield chunk
+
+
+def _new_key(kind: str, target_id: int) -> str:
+    if kind == "policy":
+        return f"policies/{target_id}/{uuid.uuid4().hex}"
+    return f"staging/{uuid.uuid4().hex}"          # becomes a blob on attach
+
+
+async def _get_or_404(session, model, ident, name: str):
+    row = await session.get(model, ident)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return row
+
+
+async def _attach(session, storage: StorageBackend, kind: str, target_id: int,
+                  stored: StoredObject, filename: Optional[str], content_type: Optional[str]):
+    """Point a Policy at `stored`, or create an Evidence row for its blob."""
+    replaced = None
+    if kind == "policy":
+        row = await _get_or_404(session, Policy, target_id, "Policy")
+        if row.file_path.startswith(f"policies/{target_id}/") and row.file_path != stored.key:
+            replaced = row.file_path                      # a document we stored earlier
+        row.file_path = stored.key
+    else:
+        blob = await blobs.ingest(session, storage, stored)
+        row = Evidence(task_id=target_id, file_path=blob.key, filename=filename)
+    row.size, row.sha256, row.content_type = stored.size, stored.sha256, content_type
+    session.add(row)
+    await session.commit()
+    if replaced is not None:                              # only once nothing points at it
+        await storage.delete(replaced)
+    await session.refresh(row)
+    return row
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int]:
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                            headers={"Content-Range": f"bytes */{size}"})
+    first, last = match.groups()
+    if first == "":                                   # suffix: last N bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise HTTPException(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _content_disposition(filename: str) -> str:
+    """`attachment` with an ASCII fallback name and the exact one per RFC 5987."""
+    fallback = "".join(c if " " <= c < "\x7f" and c not in '"\\' else "_" for c in filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+async def stream_download(storage: StorageBackend, key: str, filename: Optional[str],
+                    content_type: Optional[str], range_header: Optional[str]):
+    try:
+        size = await storage.size(key)
+    except ObjectNotFound:
+        raise HTTPException(status_code=404, detail="File not found")
+    start, end, code = 0, size - 1, status.HTTP_200_OK
+    headers = {"Accept-Ranges": "bytes"}
+    if range_header and size:
+        start, end = _parse_range(range_header, size)
+        code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename)
+    return StreamingResponse(
+        storage.open_range(key, start, end) if size else iter(()),
+        status_code=code,
+        media_type=content_type or "application/octet-stream",
+        headers=headers,
+    )
+
+# ---------------------------------------------------------------------------
+# Single-request uploads & downloads -----------------------------------------
+# ---------------------------------------------------------------------------
+
+@router.put("/policies/{policy_id}/file", response_model=Policy)
+async def upload_policy_file(
+    policy_id: int,
+    request: Request,
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    await _get_or_404(session, Policy, policy_id, "Policy")
+    stored = await storage.put_stream(_new_key("policy", policy_id), _body(request))
+    return await _attach(session, storage, "policy", policy_id, stored, None,
+                         request.headers.get("content-type"))
+
+
+@router.post("/tasks/{task_id}/evidence", response_model=Evidence, status_code=201)
+async def upload_evidence(
+    task_id: int,
+    request: Request,
+    filename: Optional[str] = None,
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    await _get_or_404(session, Task, task_id, "Task")
+    stored = await storage.put_stream(_new_key("evidence", task_id), _body(request))
+    return await _attach(session, storage, "evidence", task_id, stored, filename,
+                         request.headers.get("content-type"))
+
+
+class EvidenceByHash(BaseModel):
+    sha256: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+@router.post("/tasks/{task_id}/evidence/by-hash", response_model=Evidence, status_code=201)
+async def attach_evidence_by_hash(
+    task_id: int,
+    payload: EvidenceByHash,
+    session=Depends(get_async_session),
+):
+    """Reuse stored bytes: a metadata insert, no upload. 404 → upload normally.
+
+    Only bytes the caller's organization already holds as evidence qualify:
+    a hash is no proof of possession, and hashes show up in reports.
+    """
+    await _get_or_404(session, Task, task_id, "Task")
+    sha256 = payload.sha256.lower()
+    # The scoped session limits this to the caller's tenant.
+    held = await session.execute(select(Evidence.id).where(Evidence.sha256 == sha256).limit(1))
+    blob = await blobs.add_reference(session, sha256) if held.first() is not None else None
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Unknown content hash")
+    evidence = Evidence(task_id=task_id, file_path=blob.key, size=blob.size,
+                        sha256=blob.sha256, **payload.model_dump(exclude={"sha256"}))
+    session.add(evidence)
+    await session.commit()
+    await session.refresh(evidence)
+    return evidence
+
+
+@router.delete("/evidence/{evidence_id}", status_code=204)
+async def delete_evidence(
+    evidence_id: int,
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    evidence = await _get_or_404(session, Evidence, evidence_id, "Evidence")
+    orphaned = await blobs.release(session, evidence.sha256) if evidence.sha256 else None
+    if orphaned is None:
+        orphaned = [evidence.file_path]                   # stored before dedup
+    await session.delete(evidence)
+    await session.commit()
+    # Only now: a failed commit must not leave rows pointing at deleted bytes.
+    for key in orphaned:
+        await storage.delete(key)
+
+
+@router.get("/policies/{policy_id}/file")
+async def download_policy_file(
+    policy_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    policy = await _get_or_404(session, Policy, policy_id, "Policy")
+    return await stream_download(storage, policy.file_path, None, policy.content_type, range_header)
+
+
+@router.get("/evidence/{evidence_id}/file")
+async def download_evidence_file(
+    evidence_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    evidence = await _get_or_404(session, Evidence, evidence_id, "Evidence")
+    return await stream_download(storage, evidence.file_path, evidence.filename,
+                           evidence.content_type, range_header)
+
+# ---------------------------------------------------------------------------
+# Resumable multipart uploads ------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class UploadCreate(BaseModel):
+    kind: Literal["policy", "evidence"]
+    target_id: int
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class UploadRead(BaseModel):
+    id: str
+    kind: str
+    target_id: int
+    status: str
+    parts: List[UploadPart]
+
+
+async def _open_upload(session, upload_id: str) -> Upload:
+    upload = await _get_or_404(session, Upload, upload_id, "Upload")
+    if upload.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    return upload
+
+
+async def _parts(session, upload_id: str) -> List[UploadPart]:
+    result = await session.exec(
+        select(UploadPart).where(UploadPart.upload_id == upload_id)
+        .order_by(UploadPart.part_number)
+    )
+    return list(result.all())
+
+
+@router.post("/uploads", response_model=UploadRead, status_code=201)
+async def start_upload(
+    payload: UploadCreate,
+    user: User = Depends(get_current_user),
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    parent = Policy if payload.kind == "policy" else Task
+    await _get_or_404(session, parent, payload.target_id, parent.__name__)
+    key = _new_key(payload.kind, payload.target_id)
+    upload = Upload(
+        id=uuid.uuid4().hex, key=key, backend_upload_id=await storage.create_multipart(key),
+        created_by=user.id, **payload.model_dump(),
+    )
+    session.add(upload)
+    await session.commit()
+    return UploadRead(parts=[], **upload.model_dump())
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadRead)
+async def get_upload(upload_id: str, session=Depends(get_async_session)):
+    upload = await _get_or_404(session, Upload, upload_id, "Upload")
+    return UploadRead(parts=await _parts(session, upload_id), **upload.model_dump())
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}", response_model=UploadPart)
+async def upload_part(
+    upload_id: str,
+    request: Request,
+    part_number: int = Path(ge=1, le=10_000),
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    upload = await _open_upload(session, upload_id)
+    try:
+        stored = await storage.upload_part(upload.key, upload.backend_upload_id, part_number,
+                                           _body(request))
+    except PartTooLarge as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+    part = await session.get(UploadPart, (upload_id, part_number)) or UploadPart(
+        upload_id=upload_id, part_number=part_number, size=0, sha256="")
+    part.size, part.sha256 = stored.size, stored.sha256
+    session.add(part)
+    await session.commit()
+    return part
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    upload = await _open_upload(session, upload_id)
+    numbers = [p.part_number for p in await _parts(session, upload_id)]
+    if not numbers or numbers != list(range(1, len(numbers) + 1)):
+        raise HTTPException(status_code=409, detail=f"Parts must be 1..N, got {numbers}")
+    stored = await storage.complete_multipart(upload.key, upload.backend_upload_id, numbers)
+    upload.status = "complete"
+    session.add(upload)
+    return await _attach(session, storage, upload.kind, upload.target_id, stored,
+                         upload.filename, upload.content_type)
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_upload(
+    upload_id: str,
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+):
+    upload = await _open_upload(session, upload_id)
+    await storage.abort_multipart(upload.key, upload.backend_upload_id)
+    upload.status = "aborted"
+    session.add(upload)
+    await session.commit()
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import select
+
+from app.api.pagination import DEFAULT_LIMIT, MAX_LIMIT, Page, keyset, page
+from app.db import get_async_session
+from app.models import Gap, Policy
+
+router = APIRouter(prefix="/gaps", tags=["gaps"])
+
+
+@router.get("", response_model=Page[Gap])
+async def list_gaps(
+    policy_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    severity: Optional[str] = Query(None, pattern="^(low|medium|high)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session=Depends(get_async_session),
+):
+    """Newest gaps first, optionally narrowed to a policy, owner or severity."""
+    stmt = select(Gap)
+    if policy_id is not None:
+        stmt = stmt.where(Gap.policy_id == policy_id)
+    if owner_id is not None:
+        stmt = stmt.join(Policy).where(Policy.owner_id == owner_id)
+    if severity is not None:
+        stmt = stmt.where(Gap.severity == severity)
+    rows = (await session.exec(keyset(stmt, Gap.created_at, Gap.id, cursor, limit))).all()
+    return page(rows, limit)
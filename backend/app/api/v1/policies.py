@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import select
+
+from app.api.pagination import DEFAULT_LIMIT, MAX_LIMIT, Page, keyset, page
+from app.db import get_async_session
+from app.models import Policy
+
+router = APIRouter(prefix="/policies", tags=["policies"])
+
+
+@router.get("", response_model=Page[Policy])
+async def list_policies(
+    owner_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session=Depends(get_async_session),
+):
+    """Newest policies first; uses `ix_policy_owner_created` when filtered."""
+    stmt = select(Policy)
+    if owner_id is not None:
+        stmt = stmt.where(Policy.owner_id == owner_id)
+    rows = (await session.exec(keyset(stmt, Policy.created_at, Policy.id, cursor, limit))).all()
+    return page(rows, limit)
@@ -0,0 +1,97 @@
+"""Audit reports – served from cache, built in the background on a miss.
+
+    GET /reports/{policies|owners}/{id}?format=html|zip
+        200 + the file when a report for the current data version exists,
+        otherwise 202 + the build job (poll it, then GET again).
+    GET /reports/jobs/{job_id}
+
+The data version is `PolicyScore.version` / `OwnerScore.version`, bumped by
+the rollup hook on every change under the policy or owner, together with
+the newest task status event in scope (the report's history section).
+"""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlmodel import select
+
+from app.api.v1.files import stream_download
+from app.auth.dependencies import get_current_user
+from app.db import get_async_session
+from app.models import OwnerScore, PolicyScore, Report, User
+from app.reports.builder import last_event
+from app.reports.worker import MEDIA_TYPES
+from app.storage import StorageBackend, get_storage
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+SCOPES = {"policies": ("policy", PolicyScore), "owners": ("owner", OwnerScore)}
+
+
+class ReportRead(BaseModel):
+    id: int
+    scope: str
+    scope_id: int
+    format: str
+    version: int
+    events_through: int
+    status: str
+    attempts: int
+    error: Optional[str]
+    size: Optional[int]
+    sha256: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+
+@router.get("/jobs/{job_id}", response_model=ReportRead)
+async def get_report_job(job_id: int, session=Depends(get_async_session)):
+    report = await session.get(Report, job_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
+
+@router.get("/{scope}/{scope_id}", response_model=None,
+            responses={202: {"model": ReportRead, "description": "Report is being built"}})
+async def get_report(
+    scope: Literal["policies", "owners"],
+    scope_id: int,
+    format: Literal["html", "zip"] = "html",
+    session=Depends(get_async_session),
+    storage: StorageBackend = Depends(get_storage),
+    user: User = Depends(get_current_user),
+):
+    name, score_model = SCOPES[scope]
+    score = await session.get(score_model, scope_id)
+    if score is None:
+        raise HTTPException(status_code=404, detail=f"{name.capitalize()} not found")
+
+    same = (Report.scope == name, Report.scope_id == scope_id, Report.format == format)
+    current = (Report.version == score.version,
+               Report.events_through == await last_event(session, name, scope_id))
+    cached = (await session.exec(
+        select(Report).where(*same, Report.status == "done", *current)
+        .order_by(Report.id.desc()).limit(1)
+    )).first()
+    if cached is not None:
+        filename = f"{name}-{scope_id}-v{cached.version}.{format}"
+        return await stream_download(storage, cached.key, filename, MEDIA_TYPES[format], None)
+
+    job = (await session.exec(
+        select(Report).where(*same, Report.status.in_(("queued", "running")))
+        .order_by(Report.id.desc()).limit(1)
+    )).first()
+    if job is None:
+        job = Report(scope=name, scope_id=scope_id, format=format, created_by=user.id)
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=ReportRead.model_validate(job, from_attributes=True).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/reports/jobs/{job.id}"},
+    )
@@ -0,0 +1,24 @@
+"""Aggregate router for /api/v1 – every endpoint here requires a bearer token.
+
+`tenant_session` also scopes the request's session to the caller's
+organization, so every handler below only ever sees its own tenant's rows.
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.tenancy import tenant_session
+from . import analysis, bulk, dashboard, evidence, files, gaps, policies, reports, scores, search, tasks
+
+api_router = APIRouter(dependencies=[Depends(tenant_session)])
+
+api_router.include_router(policies.router)
+api_router.include_router(gaps.router)
+api_router.include_router(tasks.router)
+api_router.include_router(evidence.router)
+api_router.include_router(dashboard.router)
+api_router.include_router(scores.router)
+api_router.include_router(files.router)
+api_router.include_router(analysis.router)
+api_router.include_router(bulk.router)
+api_router.include_router(reports.router)
+api_router.include_router(search.router)
@@ -0,0 +1,50 @@
+"""Compliance scores – primary-key reads from the rollup tables."""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from app.auth.dependencies import get_current_user
+from app.db import get_async_session
+from app.models import OwnerScore, PolicyScore, User
+
+router = APIRouter(prefix="/scores", tags=["scores"])
+
+
+class ScoreRead(BaseModel):
+    score: Optional[float]              # None until the scope has any gaps
+    total_weight: int
+    closed_weight: int
+    gap_count: int
+    closed_gaps: int
+    evidence_count: int
+    version: int
+    updated_at: datetime
+
+
+def _read(row) -> ScoreRead:
+    score = row.closed_weight / row.total_weight if row.total_weight else None
+    return ScoreRead(score=score, **row.model_dump(include=set(ScoreRead.model_fields)))
+
+
+@router.get("/policies/{policy_id}", response_model=ScoreRead)
+async def policy_score(policy_id: int, session=Depends(get_async_session)):
+    row = await session.get(PolicyScore, policy_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Policy not found")
+    return _read(row)
+
+
+@router.get("/owners/{owner_id}", response_model=ScoreRead)
+async def owner_score(owner_id: int, session=Depends(get_async_session)):
+    row = await session.get(OwnerScore, owner_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Owner has no policies")
+    return _read(row)
+
+
+@router.get("/me", response_model=ScoreRead)
+async def my_score(user: User = Depends(get_current_user), session=Depends(get_async_session)):
+    return await owner_score(user.id, session)
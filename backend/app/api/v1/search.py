@@ -0,0 +1,85 @@
+"""Ranked, highlighted search across policies, gaps and tasks.
+
+    GET /search?q=encryption baa&kind=gap&kind=task&limit=20&cursor=…
+
+Every word is prefix-matched and all must appear (Postgres also accepts
+close trigram matches, so small typos still hit). Results are ordered by
+rank; the cursor seeks on `(rank, kind, id)` rather than using OFFSET.
+`highlight` is HTML-escaped text with matches wrapped in `<mark>`.
+"""
+
+import base64
+from collections import defaultdict
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import tuple_, union_all
+from sqlmodel import select
+
+from app.api.pagination import DEFAULT_LIMIT, MAX_LIMIT, Page
+from app.db import get_async_session
+from app.search.query import TABLES, backend_for, snippets, terms
+from app.tenancy import tenant_clause
+
+router = APIRouter(tags=["search"])
+
+Kind = Literal["policy", "gap", "task"]
+
+
+class SearchHit(BaseModel):
+    kind: Kind
+    id: int
+    text: str
+    highlight: str
+    rank: float
+
+
+def _encode(rank: float, kind: str, id_: int) -> str:
+    return base64.urlsafe_b64encode(f"{rank!r}|{kind}|{id_}".encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> tuple[float, str, int]:
+    try:
+        rank, kind, id_ = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        return float(rank), kind, int(id_)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("/search", response_model=Page[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[List[Kind]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session=Depends(get_async_session),
+):
+    words = terms(q)
+    if not words:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query has no searchable words")
+    backend = backend_for(session.get_bind().dialect.name)
+
+    scope = lambda t: tenant_clause(t, session)                      # noqa: E731
+    hits = union_all(*(backend.hits(k, words, q, scope) for k in (kind or TABLES))).subquery("hits")
+    stmt = select(hits.c.kind, hits.c.id, hits.c.rank)
+    if cursor:
+        stmt = stmt.where(tuple_(hits.c.rank, hits.c.kind, hits.c.id) < _decode(cursor))
+    stmt = stmt.order_by(hits.c.rank.desc(), hits.c.kind.desc(), hits.c.id.desc()).limit(limit + 1)
+    rows = (await session.exec(stmt)).all()
+
+    page_rows = rows[:limit]
+    ids_by_kind = defaultdict(list)
+    for row in page_rows:
+        ids_by_kind[row.kind].append(row.id)
+    texts = await snippets(session, backend, words, q, ids_by_kind)
+    items = [
+        SearchHit(kind=row.kind, id=row.id, rank=row.rank, text=texts[(row.kind, row.id)][0],
+                  highlight=texts[(row.kind, row.id)][1])
+        for row in page_rows if (row.kind, row.id) in texts
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page_rows[-1]
+        next_cursor = _encode(last.rank, last.kind, last.id)
+    return {"items": items, "next_cursor": next_cursor}
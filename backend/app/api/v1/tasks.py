@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlmodel import select
+
+from app.api.pagination import DEFAULT_LIMIT, MAX_LIMIT, Page, keyset, page
+from app.compliance import history
+from app.db import get_async_session
+from app.models import Gap, Policy, Task, TaskEvent
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+class TaskUpdate(BaseModel):
+    status: Literal["open", "in_progress", "done"]
+
+
+class TaskEventRead(BaseModel):
+    status: str
+    at: datetime
+    actor: Optional[int]
+
+
+class StatusAsOf(BaseModel):
+    at: datetime
+    snapshot_at: Optional[datetime]     # replay started here (None: from the first event)
+    counts: Dict[str, int]
+    total: int
+
+
+@router.get("", response_model=Page[Task])
+async def list_tasks(
+    gap_id: Optional[int] = None,
+    assigned_to: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    status: Optional[str] = Query(None, pattern="^(open|in_progress|done)$"),
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    session=Depends(get_async_session),
+):
+    """Newest tasks first; `due_after`/`due_before` bound the due window."""
+    stmt = select(Task)
+    if gap_id is not None:
+        stmt = stmt.where(Task.gap_id == gap_id)
+    if assigned_to is not None:
+        stmt = stmt.where(Task.assigned_to == assigned_to)
+    if owner_id is not None:
+        stmt = stmt.join(Gap).join(Policy).where(Policy.owner_id == owner_id)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if due_after is not None:
+        stmt = stmt.where(Task.due_date >= due_after)
+    if due_before is not None:
+        stmt = stmt.where(Task.due_date < due_before)
+    rows = (await session.exec(keyset(stmt, Task.created_at, Task.id, cursor, limit))).all()
+    return page(rows, limit)
+
+
+@router.get("/as-of", response_model=StatusAsOf)
+async def tasks_as_of(at: datetime, policy_id: Optional[int] = None, session=Depends(get_async_session)):
+    """Task counts per status as they stood at `at` (newest snapshot + later events)."""
+    return await session.run_sync(history.status_counts, at, policy_id)
+
+
+@router.patch("/{task_id}", response_model=Task)
+async def update_task(task_id: int, payload: TaskUpdate, session=Depends(get_async_session)):
+    task = await session.get(Task, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task.status = payload.status
+    session.add(task)
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+@router.get("/{task_id}/history", response_model=List[TaskEventRead])
+async def task_history(task_id: int, session=Depends(get_async_session)):
+    """Every status the task has had, oldest first."""
+    events = (await session.exec(
+        select(TaskEvent).where(TaskEvent.task_id == task_id).order_by(TaskEvent.at, TaskEvent.id)
+    )).all()
+    if not events:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return [TaskEventRead(status=history.STATUSES[e.status], at=e.at, actor=e.actor) for e in events]
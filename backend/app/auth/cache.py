@@ -0,0 +1,77 @@
+"""In-process caches for authenticated requests.
+
+✓ `token_cache` – raw JWT → verified claims (skips signature checks).
+✓ `user_cache`  – `sub` → detached `User` snapshot (skips the DB lookup).
+
+Entries never outlive the token's `exp`; user rows are additionally capped
+by AUTH_USER_CACHE_TTL so a role change made on another worker is picked up
+within that window. Call `invalidate_user()` after changing a user's role or
+password in this process.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", 10_000))
+AUTH_USER_CACHE_TTL: int = int(os.getenv("AUTH_USER_CACHE_TTL", 300))
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU map whose entries carry an absolute (epoch) expiry."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Like `get`, without touching LRU order or hit counters."""
+        entry = self._data.get(key)
+        return entry[1] if entry is not None and entry[0] > time.time() else None
+
+    def set(self, key: Hashable, value: V, expires_at: float) -> None:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+token_cache: TTLCache[dict] = TTLCache(AUTH_CACHE_SIZE)
+user_cache: TTLCache[Any] = TTLCache(AUTH_CACHE_SIZE)
+
+
+def invalidate_user(subject: str) -> None:
+    """Forget the cached row for `subject` (the token `sub`, i.e. email)."""
+    user_cache.pop(subject)
+
+
+def stats() -> dict[str, Any]:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
@@ -0,0 +1,63 @@
+"""Reusable FastAPI dependencies for authenticated routes."""
+
+import time
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlmodel import select
+
+from app.db import get_async_session
+from . import cache, models, revocation, security
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified JWT claims, served from `token_cache` when possible."""
+    claims = cache.token_cache.get(token)
+    if claims is None:
+        claims = security.decode_token(token)
+        cache.token_cache.set(token, claims, expires_at=claims["exp"])
+    return claims
+
+
+async def get_active_claims(
+    claims: dict = Depends(get_token_claims),
+    session=Depends(get_async_session),
+) -> dict:
+    """`get_token_claims`, minus revoked tokens (in-memory check, periodic sync)."""
+    await revocation.revocations.sync(session)
+    if revocation.revocations.is_revoked(claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+async def get_current_user(
+    claims: dict = Depends(get_active_claims),
+    session=Depends(get_async_session),
+) -> models.User:
+    """
+    The `User` behind the bearer token.
+
+    Returns a detached snapshot from `user_cache` on the hot path – re-fetch
+    it with `session.get(User, user.id)` before modifying it.
+    """
+    subject = claims["sub"]
+    user = cache.user_cache.get(subject)
+    if user is None:
+        result = await session.exec(select(models.User).where(models.User.email == subject))
+        row = result.first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = models.User(**row.model_dump())
+        expires_at = min(claims["exp"], time.time() + cache.AUTH_USER_CACHE_TTL)
+        cache.user_cache.set(subject, user, expires_at=expires_at)
+    return user
@@ -0,0 +1,112 @@
+"""Bounded executor for password hashing.
+
+bcrypt costs 100–300 ms of CPU per call. Running it on the event loop (or in
+FastAPI's shared threadpool) lets a burst of logins starve every other route,
+so hashing gets its own pool with an admission limit: once `workers` hashes
+are running and `queue_limit` more are waiting, new requests get a 503 with
+`Retry-After` instead of piling up.
+
+Config (env):
+
+    HASH_EXECUTOR        thread | process   (default thread – bcrypt releases the GIL)
+    HASH_WORKERS         int                (default: CPU count)
+    HASH_QUEUE_LIMIT     int                (default 32)
+    HASH_RETRY_AFTER     seconds            (default 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from . import security
+
+HASH_EXECUTOR: str = os.getenv("HASH_EXECUTOR", "thread")
+HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+HASH_QUEUE_LIMIT: int = int(os.getenv("HASH_QUEUE_LIMIT", 32))
+HASH_RETRY_AFTER: int = int(os.getenv("HASH_RETRY_AFTER", 1))
+
+
+class HashingPool:
+    """Executor wrapper with admission control and latency counters.
+
+    Counters are only touched from the event loop thread, so no locking.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, kind: str = "thread"):
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self.kind = kind
+        self._executor: Executor | None = None
+        self.pending = 0                 # running + waiting
+        self.completed = 0
+        self.rejected = 0
+        self.latency_sum = 0.0           # seconds, submit → result
+        self.latency_max = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            cls = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+            self._executor = cls(max_workers=self.workers)
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_limit
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on the pool, or raise 503 if it is saturated."""
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, retry shortly",
+                headers={"Retry-After": str(HASH_RETRY_AFTER)},
+            )
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self.executor.submit(fn, *args))
+        finally:
+            self.pending -= 1
+            elapsed = time.perf_counter() - started
+            self.completed += 1
+            self.latency_sum += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(0, self.pending - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_avg_ms": round(1000 * self.latency_sum / self.completed, 2)
+            if self.completed else 0.0,
+            "latency_max_ms": round(1000 * self.latency_max, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashingPool(HASH_WORKERS, HASH_QUEUE_LIMIT, HASH_EXECUTOR)
+
+
+async def hash_password(password: str) -> str:
+    return await hash_pool.run(security.hash_password, password)
+
+
+async def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Async `security.verify_and_update`: `(ok, new_hash_or_None)`."""
+    return await hash_pool.run(security.verify_and_update, plain_password, hashed_password)
@@ -1,7 +1,4 @@
-from typing import Optional
-from sqlmodel import SQLModel, Field
+# The auth package shares the one `user` table defined with the domain models.
+from app.models import User
 
-class User(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
-    email: str = Field(index=True, nullable=False, unique=True)
-    hashed_password: str
\ No newline at end of file
+__all__ = ["User"]
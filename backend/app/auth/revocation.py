@@ -0,0 +1,104 @@
+"""In-memory mirror of the `revoked_token` table.
+
+Every authenticated request checks its token's `jti` and `sid` against a
+dict held by the worker – two hash lookups, no I/O. The dict is kept in
+step with the table incrementally: at most once per AUTH_REVOCATION_SYNC
+seconds a request pulls rows revoked since the last sync (by `revoked_at`,
+with a small overlap for transactions that committed late). A revocation
+made in this worker applies here immediately; other workers see it within
+the sync interval.
+
+Entries drop out once their token could no longer be valid anyway, so the
+set only ever holds revocations that still matter.
+
+    AUTH_REVOCATION_SYNC     secs – max staleness across workers (default 5)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.models import RefreshToken, RevokedToken
+
+AUTH_REVOCATION_SYNC: float = float(os.getenv("AUTH_REVOCATION_SYNC", 5))
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class RevocationList:
+    """`id → expiry` for revoked token ids and session ids."""
+
+    def __init__(self) -> None:
+        self._expiry: dict[str, float] = {}
+        self.watermark: Optional[datetime] = None     # newest revoked_at seen
+        self.synced_at = 0.0                          # monotonic
+        self.syncs = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def is_revoked(self, claims: dict) -> bool:
+        expiry = self._expiry
+        return claims.get("jti") in expiry or claims.get("sid") in expiry
+
+    def add(self, ids: Iterable[str], expires_at: datetime) -> None:
+        ts = expires_at.replace(tzinfo=timezone.utc).timestamp()      # naive UTC, like every column
+        for token_id in ids:
+            self._expiry[token_id] = max(ts, self._expiry.get(token_id, ts))
+
+    def _forget_expired(self) -> None:
+        now = time.time()
+        for token_id in [k for k, exp in self._expiry.items() if exp <= now]:
+            del self._expiry[token_id]
+
+    async def sync(self, session: Any, *, force: bool = False) -> None:
+        """Pull revocations other workers made since the last sync."""
+        if not force and time.monotonic() - self.synced_at < AUTH_REVOCATION_SYNC:
+            return
+        lock = self._lock = self._lock or asyncio.Lock()
+        async with lock:
+            if not force and time.monotonic() - self.synced_at < AUTH_REVOCATION_SYNC:
+                return                                    # another request just did it
+            stmt = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+                RevokedToken.expires_at > datetime.utcnow())
+            if self.watermark is not None:
+                stmt = stmt.where(RevokedToken.revoked_at >= self.watermark - SYNC_OVERLAP)
+            for jti, expires_at, revoked_at in (await session.exec(stmt)).all():
+                self.add([jti], expires_at)
+                self.watermark = max(self.watermark or revoked_at, revoked_at)
+            self._forget_expired()
+            self.synced_at = time.monotonic()
+            self.syncs += 1
+
+    def clear(self) -> None:
+        self._expiry.clear()
+        self.watermark, self.synced_at, self.syncs, self._lock = None, 0.0, 0, None
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._expiry), "syncs": self.syncs,
+                "watermark": self.watermark.isoformat() if self.watermark else None}
+
+
+revocations = RevocationList()
+
+
+async def revoke(session: Any, ids: Iterable[str], expires_at: datetime) -> None:
+    """Record revocations (caller commits) and apply them to this worker now."""
+    ids = [i for i in ids if i]
+    now = datetime.utcnow()
+    for token_id in ids:
+        existing = await session.get(RevokedToken, token_id)
+        if existing is None:
+            session.add(RevokedToken(jti=token_id, expires_at=expires_at, revoked_at=now))
+    revocations.add(ids, expires_at)
+
+
+async def purge_expired(session: Any) -> None:
+    """Delete revocation and refresh-token rows past their expiry (caller commits)."""
+    now = datetime.utcnow()
+    await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    await session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
@@ -1,31 +1,136 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import update
+from sqlmodel import select
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.db import get_session
-from . import models, schemas, security
+from app.db import get_async_session
+from app.models import Organization, RefreshToken
+from . import cache, hashing, models, revocation, schemas, security
+from .dependencies import get_active_claims
+
+# Expired refresh/revocation rows are deleted when tokens are issued, at most this often.
+PURGE_INTERVAL = 3600
+_last_purge = 0.0
 
 router = APIRouter(tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+async def _new_organization(session, name: str) -> Organization:
+    """Every registration starts its own organization (tenant)."""
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "org"
+    taken = await session.exec(select(Organization.id).where(Organization.slug == slug))
+    if taken.first() is not None:
+        slug = f"{slug}-{uuid.uuid4().hex[:8]}"
+    organization = Organization(name=name, slug=slug)
+    session.add(organization)
+    await session.flush()
+    return organization
+
 @router.post("/register", response_model=schemas.UserRead, status_code=201)
-def register(payload: schemas.UserCreate, session: Session = Depends(get_session)):
-    if session.exec(select(models.User).where(models.User.email == payload.email)).first():
+async def register(payload: schemas.UserCreate, session=Depends(get_async_session)):
+    existing = await session.exec(select(models.User).where(models.User.email == payload.email))
+    if existing.first():
         raise HTTPException(status_code=400, detail="Email already registered")
+    organization = await _new_organization(session, payload.organization or payload.email.rpartition("@")[2])
     user = models.User(
         email=payload.email,
-        hashed_password=security.hash_password(payload.password)
+        hashed_password=await hashing.hash_password(payload.password),
+        tenant_id=organization.id,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 @router.post("/login", response_model=schemas.Token)
-def login(form: OAuth2PasswordRequestForm = Depends(),
-          session: Session = Depends(get_session)):
-    user = session.exec(select(models.User).where(models.User.email == form.username)).first()
-    if not user or not security.verify_password(form.password, user.hashed_password):
+async def login(form: OAuth2PasswordRequestForm = Depends(),
+                session=Depends(get_async_session)):
+    result = await session.exec(select(models.User).where(models.User.email == form.username))
+    user = result.first()
+    verified, new_hash = (
+        await hashing.verify_and_update(form.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Incorrect email or password")
-    token = security.create_access_token(subject=user.email)
-    return {"access_token": token, "token_type": "bearer"}
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made – upgrade it in place.
+        user.hashed_password = new_hash
+        session.add(user)
+        cache.invalidate_user(user.email)
+    return await _issue(session, user, session_id=uuid.uuid4().hex)
+
+
+async def _issue(session, user: models.User, session_id: str) -> dict:
+    """Mint an access token plus the next refresh token of `session_id`, and commit."""
+    global _last_purge
+    if time.monotonic() - _last_purge > PURGE_INTERVAL:
+        _last_purge = time.monotonic()
+        await revocation.purge_expired(session)
+    refresh_token, token_hash = security.new_refresh_token()
+    session.add(RefreshToken(
+        user_id=user.id, session_id=session_id, token_hash=token_hash,
+        expires_at=datetime.utcnow() + timedelta(days=security.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    await session.commit()
+    return {
+        "access_token": security.create_access_token(subject=user.email, session_id=session_id),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": security.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+async def _revoke_session(session, session_id: str) -> None:
+    now = datetime.utcnow()
+    await session.execute(
+        update(RefreshToken).where(RefreshToken.session_id == session_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    # Access tokens of the session carry its `sid`; none outlives the newest refresh token.
+    await revocation.revoke(session, [session_id], now + timedelta(days=security.REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+_invalid_refresh = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh(payload: schemas.RefreshRequest, session=Depends(get_async_session)):
+    """Swap a refresh token for a new access token and a new refresh token (no bcrypt).
+
+    Each refresh token works once. Presenting a rotated one again means it
+    leaked, so the whole session is revoked.
+    """
+    now = datetime.utcnow()
+    token_hash = security.hash_refresh_token(payload.refresh_token)
+    row = (await session.exec(select(RefreshToken).where(RefreshToken.token_hash == token_hash))).first()
+    if row is None or row.revoked_at is not None or row.expires_at <= now:
+        raise _invalid_refresh
+    # Conditional UPDATE: of two concurrent refreshes with one token, exactly one wins.
+    claimed = await session.execute(
+        update(RefreshToken).where(RefreshToken.id == row.id, RefreshToken.used_at.is_(None)).values(used_at=now)
+    )
+    if claimed.rowcount != 1:
+        await _revoke_session(session, row.session_id)
+        await session.commit()
+        raise _invalid_refresh
+    user = await session.get(models.User, row.user_id)
+    if user is None:
+        raise _invalid_refresh
+    return await _issue(session, user, session_id=row.session_id)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(claims: dict = Depends(get_active_claims), session=Depends(get_async_session)):
+    """Revoke the caller's session: its refresh token and every access token issued for it."""
+    if claims.get("sid"):
+        await _revoke_session(session, claims["sid"])
+    else:
+        await revocation.revoke(session, [claims.get("jti")], datetime.utcfromtimestamp(claims["exp"]))
+    await session.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
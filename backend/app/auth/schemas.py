@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class UserBase(BaseModel):
@@ -5,6 +7,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
+    organization: Optional[str] = None    # name of the new organization (default: the email's domain)
 
 class UserRead(UserBase):
     id: int
@@ -14,4 +17,9 @@ class UserRead(UserBase):
 
 class Token(BaseModel):
     access_token: str
-    token_type: str
\ No newline at end of file
+    token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None        # access-token lifetime, seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta
+import hashlib
 import os
+import secrets
+import uuid
 from typing import Any
 
 from jose import JWTError, jwt
@@ -12,11 +15,16 @@ from fastapi import HTTPException, status
 SECRET_KEY: str = os.getenv("JWT_SECRET", "change-me-in-prod")
 ALGORITHM: str   = os.getenv("JWT_ALGO",  "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_EXPIRE_MINUTES", 15))
+REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 30))
+# Raising this makes existing hashes "need update"; they are re-hashed on login.
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
 
 # ────────────────────────────────────────────────────────────
 # 2. Password hashing
 # ────────────────────────────────────────────────────────────
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 def hash_password(password: str) -> str:
     """Return a bcrypt hash of the plaintext password."""
@@ -26,20 +34,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Compare plaintext vs stored hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify, and return a fresh hash if the stored one uses stale settings."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 # ────────────────────────────────────────────────────────────
 # 3. JWT helpers
 # ────────────────────────────────────────────────────────────
 def create_access_token(
     subject: Any,
     expires_delta: timedelta | None = None,
+    session_id: str | None = None,
 ) -> str:
-    """Generate a signed JWT; `sub` can be user id or email."""
+    """Generate a signed JWT; `sub` can be user id or email.
+
+    Every token gets a unique `jti`; tokens minted for a refresh-token
+    session also carry its `sid`, so revoking the session revokes them all.
+    """
     expire = datetime.utcnow() + (expires_delta or timedelta(
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
+    if session_id:
+        to_encode["sid"] = session_id
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def new_refresh_token() -> tuple[str, str]:
+    """(opaque token for the client, sha256 hex to store)."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    # High-entropy random token: a fast hash is enough, no bcrypt needed.
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def decode_token(token: str) -> dict:
     """
     Decode & verify a JWT, raising 401 if it’s invalid.
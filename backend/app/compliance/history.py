@@ -0,0 +1,184 @@
+"""Append-only task status history and "as of" reads.
+
+Every status a task takes is appended to `task_event` – on insert, on a
+status change and on delete – by an `after_flush` hook, one multi-row
+INSERT per flush, inside the same transaction as the change itself.
+Rows are never updated or deleted.
+
+Reconstructing the state at time X does not scan the whole log:
+`task_snapshot` periodically stores every live task's status, so an as-of
+read takes the newest snapshot at or before X and replays only the events
+between it and X.
+
+A snapshot is itself built from the log (previous snapshot + events), at a
+cutoff HISTORY_SNAPSHOT_LAG_MINUTES in the past – not from the task table
+at "now". An event is stamped when it is written but becomes visible only
+when its transaction commits; one stamped before a snapshot yet committed
+after it would otherwise be missing from the snapshot *and* skipped by
+every replay that starts there. (Event ids are handed out at INSERT too,
+so they race the same way.)
+
+✓ Core writes that bypass the ORM (bulk import) call `record()` themselves.
+✓ `actor` is the user the request's session was scoped for (see
+  app/tenancy.py); workers and CLI writes record None.
+
+Take snapshots from cron (skipped when the newest is younger than
+HISTORY_SNAPSHOT_HOURS, so running it often is harmless):
+
+    python -m app.compliance.history snapshot [--force]
+
+    HISTORY_SNAPSHOT_HOURS         min hours between snapshots (default 24)
+    HISTORY_SNAPSHOT_LAG_MINUTES   snapshot cutoff behind now; > any transaction (default 60)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import case, event, func, insert, inspect, literal, select, union_all
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models import Gap, Task, TaskEvent, TaskSnapshot
+
+HISTORY_SNAPSHOT_HOURS: float = float(os.getenv("HISTORY_SNAPSHOT_HOURS", 24))
+HISTORY_SNAPSHOT_LAG_MINUTES: float = float(os.getenv("HISTORY_SNAPSHOT_LAG_MINUTES", 60))
+
+# Stored as smallint codes; append only, never renumber.
+STATUSES = ("open", "in_progress", "done", "deleted")
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+DELETED = STATUS_CODES["deleted"]
+
+task_event = TaskEvent.__table__
+task_snapshot = TaskSnapshot.__table__
+
+
+def code(status: str) -> int:
+    try:
+        return STATUS_CODES[status]
+    except KeyError:
+        raise ValueError(f"Unknown task status {status!r}") from None
+
+
+def record(conn: Connection, changes: Iterable[tuple[int, str, Optional[int]]],
+           actor: Optional[int] = None, at: Optional[datetime] = None) -> int:
+    """Append `(task_id, status, tenant_id)` events in one INSERT; return the count."""
+    at = at or datetime.utcnow()
+    rows = [{"task_id": task_id, "status": code(status), "tenant_id": tenant_id, "at": at, "actor": actor}
+            for task_id, status, tenant_id in changes]
+    if rows:
+        conn.execute(insert(task_event), rows)
+    return len(rows)
+
+# ---------------------------------------------------------------------------
+# Snapshots ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def latest_snapshot(conn: Connection) -> Optional[datetime]:
+    return conn.execute(select(func.max(task_snapshot.c.taken_at))).scalar()
+
+
+def _base(session: Any, at: datetime) -> Optional[datetime]:
+    return session.execute(select(func.max(TaskSnapshot.taken_at)).where(TaskSnapshot.taken_at <= at)).scalar()
+
+
+def _state(base: Optional[datetime], at: datetime):
+    """Subquery of `(task_id, status, tenant_id)` for every task at `at`, replayed from `base`."""
+    events = select(
+        TaskEvent.task_id, TaskEvent.status, TaskEvent.tenant_id,
+        func.row_number().over(partition_by=TaskEvent.task_id,
+                               order_by=(TaskEvent.at.desc(), TaskEvent.id.desc())).label("n"),
+    ).where(TaskEvent.at <= at)
+    if base is not None:
+        events = events.where(TaskEvent.at > base)
+    events = events.subquery("events")
+    replayed = select(events.c.task_id, events.c.status, events.c.tenant_id).where(events.c.n == 1)
+    if base is None:
+        return replayed.subquery("state")
+    untouched = select(TaskSnapshot.task_id, TaskSnapshot.status, TaskSnapshot.tenant_id).where(
+        TaskSnapshot.taken_at == base, TaskSnapshot.task_id.not_in(select(events.c.task_id)))
+    return union_all(replayed, untouched).subquery("state")
+
+
+def snapshot(conn: Connection, at: Optional[datetime] = None) -> int:
+    """Store every live task's status as of `at` (default: the lagged cutoff); return the row count."""
+    at = at or datetime.utcnow() - timedelta(minutes=HISTORY_SNAPSHOT_LAG_MINUTES)
+    base = _base(conn, at)
+    state = _state(base, at)
+    live = select(state.c.task_id, state.c.status, state.c.tenant_id).where(state.c.status != DELETED)
+    # Tasks no write path ever logged (e.g. rows seeded with raw SQL): take them as they are.
+    untracked = select(Task.id, case(STATUS_CODES, value=Task.status, else_=STATUS_CODES["open"]),
+                       Task.tenant_id).where(~select(TaskEvent.id).where(TaskEvent.task_id == Task.id).exists())
+    if base is not None:
+        untracked = untracked.where(
+            Task.id.not_in(select(TaskSnapshot.task_id).where(TaskSnapshot.taken_at == base)))
+    rows = union_all(live, untracked).subquery("rows")
+    return conn.execute(insert(task_snapshot).from_select(
+        ["taken_at", "task_id", "status", "tenant_id"],
+        select(literal(at, task_snapshot.c.taken_at.type), *rows.c),
+    )).rowcount
+
+
+def snapshot_if_due(conn: Connection, now: Optional[datetime] = None) -> Optional[int]:
+    cutoff = (now or datetime.utcnow()) - timedelta(minutes=HISTORY_SNAPSHOT_LAG_MINUTES)
+    newest = latest_snapshot(conn)
+    if newest is not None and cutoff - newest < timedelta(hours=HISTORY_SNAPSHOT_HOURS):
+        return None
+    return snapshot(conn, cutoff)
+
+# ---------------------------------------------------------------------------
+# As-of reads (sync Session: `await session.run_sync(status_counts, at)`) ----
+# ---------------------------------------------------------------------------
+# ORM statements, so a tenant-scoped session only sees its own history.
+
+def _state_as_of(session: Session, at: datetime):
+    """(snapshot time, subquery of `(task_id, status, tenant_id)` for every task at `at`)."""
+    base = _base(session, at)
+    return base, _state(base, at)
+
+
+def status_counts(session: Session, at: datetime, policy_id: Optional[int] = None) -> dict[str, Any]:
+    """How many tasks were in each status at `at` (optionally under one policy)."""
+    base, state = _state_as_of(session, at)
+    stmt = select(state.c.status, func.count()).where(state.c.status != DELETED).group_by(state.c.status)
+    if policy_id is not None:
+        # Tasks deleted since `at` no longer know their policy and drop out here.
+        stmt = stmt.where(state.c.task_id.in_(select(Task.id).join(Gap).where(Gap.policy_id == policy_id)))
+    counts = {name: 0 for name in STATUSES if name != "deleted"}
+    for status, n in session.execute(stmt).all():
+        counts[STATUSES[status]] = n
+    return {"at": at, "snapshot_at": base, "counts": counts, "total": sum(counts.values())}
+
+# ---------------------------------------------------------------------------
+# ORM hook -------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Session, "after_flush")
+def _record_status_changes(session: Session, flush_context) -> None:
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.append((obj.id, obj.status, obj.tenant_id))
+    for obj in session.dirty:
+        if isinstance(obj, Task) and inspect(obj).attrs.status.history.has_changes():
+            changes.append((obj.id, obj.status, obj.tenant_id))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            changes.append((obj.id, "deleted", obj.tenant_id))
+    if changes:
+        record(session.connection(), changes, actor=session.info.get("actor"))
+
+# ---------------------------------------------------------------------------
+# CLI: python -m app.compliance.history snapshot [--force] -------------------
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    from app.db import engine
+
+    if sys.argv[1:2] != ["snapshot"]:
+        sys.exit("usage: python -m app.compliance.history snapshot [--force]")
+    with engine.begin() as conn:
+        taken = snapshot(conn) if "--force" in sys.argv else snapshot_if_due(conn)
+    print("Snapshot skipped (recent one exists)." if taken is None else f"Snapshot of {taken} tasks taken.")
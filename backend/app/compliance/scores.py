@@ -0,0 +1,256 @@
+"""Incrementally maintained compliance scores.
+
+A gap counts as *closed* when it has at least one task and every task is
+`done`. Scores are the severity-weighted share of closed gaps:
+
+    score = closed_weight / total_weight
+
+Three rollup tables (`gap_score` → `policy_score` → `owner_score`) hold the
+sums, so reading a score is a primary-key lookup no matter how many tasks
+sit underneath. An `after_flush` hook recomputes only the rows touched by
+the flush (task, gap, evidence and policy inserts/edits/deletes) inside the
+same transaction.
+
+Writes that bypass the ORM (bulk Core inserts) must call `refresh_gaps` /
+`refresh_policies` themselves. To repair drift, run a full rebuild:
+
+    python -m app.compliance.scores rebuild
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from sqlalchemy import case, delete, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models import Evidence, Gap, GapScore, OwnerScore, Policy, PolicyScore, Task
+
+SEVERITY_WEIGHTS = {"low": 1, "medium": 2, "high": 3}
+BATCH_SIZE = 500
+
+gap_score = GapScore.__table__
+policy_score = PolicyScore.__table__
+owner_score = OwnerScore.__table__
+
+
+def _chunks(ids: Iterable[int]) -> Iterator[list[int]]:
+    ids = sorted(i for i in ids if i is not None)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def _upsert(conn: Connection, table, rows: list[dict], key: str) -> None:
+    """Insert rows, overwriting on `key` conflicts and bumping `version`."""
+    if not rows:
+        return
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+    if dialect is None:
+        conn.execute(delete(table).where(table.c[key].in_([r[key] for r in rows])))
+        conn.execute(table.insert(), rows)
+        return
+    stmt = dialect.insert(table)
+    updates = {c.name: stmt.excluded[c.name] for c in table.columns if c.name != key}
+    if "version" in table.c:
+        updates["version"] = table.c.version + 1
+    conn.execute(stmt.on_conflict_do_update(index_elements=[key], set_=updates), rows)
+
+# ---------------------------------------------------------------------------
+# Recompute helpers (each returns the parent keys it touched) ----------------
+# ---------------------------------------------------------------------------
+
+def refresh_gaps(conn: Connection, gap_ids: Iterable[int]) -> set[int]:
+    """Recompute `gap_score` for `gap_ids`; return affected policy ids."""
+    policies: set[int] = set()
+    done = func.sum(case((Task.status == "done", 1), else_=0))
+    for chunk in _chunks(gap_ids):
+        policies.update(conn.execute(
+            select(gap_score.c.policy_id).where(gap_score.c.gap_id.in_(chunk))
+        ).scalars())
+        rows = conn.execute(
+            select(Gap.id, Gap.policy_id, Gap.severity, Gap.tenant_id, func.count(Task.id), done)
+            .select_from(Gap)
+            .outerjoin(Task, Task.gap_id == Gap.id)
+            .where(Gap.id.in_(chunk))
+            .group_by(Gap.id, Gap.policy_id, Gap.severity, Gap.tenant_id)
+        ).all()
+        live = {r[0] for r in rows}
+        if missing := set(chunk) - live:
+            conn.execute(delete(gap_score).where(gap_score.c.gap_id.in_(missing)))
+        _upsert(conn, gap_score, [
+            {
+                "gap_id": gap_id,
+                "policy_id": policy_id,
+                "tenant_id": tenant_id,
+                "weight": SEVERITY_WEIGHTS.get(severity, 1),
+                "closed": bool(n_tasks) and n_done == n_tasks,
+            }
+            for gap_id, policy_id, severity, tenant_id, n_tasks, n_done in rows
+        ], "gap_id")
+        policies.update(r[1] for r in rows)
+    return policies
+
+
+def policies_for_tasks(conn: Connection, task_ids: Iterable[int]) -> set[int]:
+    policies: set[int] = set()
+    for chunk in _chunks(task_ids):
+        policies.update(conn.execute(
+            select(Gap.policy_id).join(Task, Task.gap_id == Gap.id).where(Task.id.in_(chunk))
+        ).scalars())
+    return policies
+
+
+def refresh_policies(conn: Connection, policy_ids: Iterable[int]) -> set[int]:
+    """Recompute `policy_score` for `policy_ids`; return affected owner ids."""
+    owners: set[int] = set()
+    closed_weight = func.sum(case((gap_score.c.closed, gap_score.c.weight), else_=0))
+    closed_gaps = func.sum(case((gap_score.c.closed, 1), else_=0))
+    now = datetime.utcnow()
+    for chunk in _chunks(policy_ids):
+        owners.update(conn.execute(
+            select(policy_score.c.owner_id).where(policy_score.c.policy_id.in_(chunk))
+        ).scalars())
+        live = {
+            policy_id: (owner_id, tenant_id)
+            for policy_id, owner_id, tenant_id in conn.execute(
+                select(Policy.id, Policy.owner_id, Policy.tenant_id).where(Policy.id.in_(chunk)))
+        }
+        sums = {
+            r[0]: r[1:]
+            for r in conn.execute(
+                select(gap_score.c.policy_id, func.sum(gap_score.c.weight),
+                       closed_weight, func.count(), closed_gaps)
+                .where(gap_score.c.policy_id.in_(chunk))
+                .group_by(gap_score.c.policy_id)
+            )
+        }
+        evidence = dict(conn.execute(
+            select(Gap.policy_id, func.count(Evidence.id))
+            .join(Task, Task.gap_id == Gap.id)
+            .join(Evidence, Evidence.task_id == Task.id)
+            .where(Gap.policy_id.in_(chunk))
+            .group_by(Gap.policy_id)
+        ).all())
+        if missing := set(chunk) - set(live):
+            conn.execute(delete(policy_score).where(policy_score.c.policy_id.in_(missing)))
+        rows = []
+        for policy_id, (owner_id, tenant_id) in live.items():
+            total, closed, n_gaps, n_closed = sums.get(policy_id, (0, 0, 0, 0))
+            rows.append({
+                "policy_id": policy_id, "owner_id": owner_id, "tenant_id": tenant_id,
+                "total_weight": total or 0, "closed_weight": closed or 0,
+                "gap_count": n_gaps, "closed_gaps": n_closed or 0,
+                "evidence_count": evidence.get(policy_id, 0),
+                "version": 1, "updated_at": now,
+            })
+        _upsert(conn, policy_score, rows, "policy_id")
+        owners.update(owner_id for owner_id, _ in live.values())
+    return owners
+
+
+def refresh_owners(conn: Connection, owner_ids: Iterable[int]) -> None:
+    """Recompute `owner_score` for `owner_ids` from their policy rows."""
+    now = datetime.utcnow()
+    ps = policy_score.c
+    for chunk in _chunks(owner_ids):
+        rows = conn.execute(
+            select(ps.owner_id, func.max(ps.tenant_id), func.sum(ps.total_weight), func.sum(ps.closed_weight),
+                   func.sum(ps.gap_count), func.sum(ps.closed_gaps),
+                   func.sum(ps.evidence_count), func.count())
+            .where(ps.owner_id.in_(chunk))
+            .group_by(ps.owner_id)
+        ).all()
+        if missing := set(chunk) - {r[0] for r in rows}:
+            conn.execute(delete(owner_score).where(owner_score.c.owner_id.in_(missing)))
+        _upsert(conn, owner_score, [
+            {
+                "owner_id": owner_id, "tenant_id": tenant_id, "total_weight": total, "closed_weight": closed,
+                "gap_count": n_gaps, "closed_gaps": n_closed, "evidence_count": n_evidence,
+                "policy_count": n_policies, "version": 1, "updated_at": now,
+            }
+            for owner_id, tenant_id, total, closed, n_gaps, n_closed, n_evidence, n_policies in rows
+        ], "owner_id")
+
+
+def refresh(conn: Connection, gap_ids: Iterable[int] = (), task_ids: Iterable[int] = (),
+            policy_ids: Iterable[int] = ()) -> None:
+    """Propagate changes to the given rows all the way up to `owner_score`."""
+    policies = set(policy_ids) | refresh_gaps(conn, gap_ids) | policies_for_tasks(conn, task_ids)
+    refresh_owners(conn, refresh_policies(conn, policies))
+
+
+def rebuild(conn: Connection) -> None:
+    """Drop and recompute every rollup row (repair / first deploy)."""
+    for table in (gap_score, policy_score, owner_score):
+        conn.execute(delete(table))
+    refresh(conn, gap_ids=conn.execute(select(Gap.id)).scalars().all(),
+            policy_ids=conn.execute(select(Policy.id)).scalars().all())
+
+# ---------------------------------------------------------------------------
+# ORM hook -------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _changed(obj, *attrs: str) -> list:
+    """Old values of `attrs` that changed on `obj` (empty if none changed)."""
+    state = inspect(obj)
+    old = []
+    for attr in attrs:
+        history = state.attrs[attr].history
+        if history.has_changes():
+            old.extend(history.deleted or [None])
+    return old
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_scores(session: Session, flush_context) -> None:
+    gaps: set[int] = set()
+    tasks: set[int] = set()
+    policies: set[int] = set()
+
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Task):
+            gaps.add(obj.gap_id)
+        elif isinstance(obj, Gap):
+            gaps.add(obj.id)
+            policies.add(obj.policy_id)
+        elif isinstance(obj, Evidence):
+            tasks.add(obj.task_id)
+        elif isinstance(obj, Policy):
+            policies.add(obj.id)
+    # Any edit counts, not just score inputs: `version` doubles as the
+    # data-version stamp that cached reports are keyed on.
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, Task):
+            gaps.add(obj.gap_id)
+            gaps.update(_changed(obj, "gap_id"))
+        elif isinstance(obj, Gap):
+            gaps.add(obj.id)
+        elif isinstance(obj, Evidence):
+            tasks.add(obj.task_id)
+            tasks.update(_changed(obj, "task_id"))
+        elif isinstance(obj, Policy):
+            policies.add(obj.id)
+
+    gaps.discard(None)
+    tasks.discard(None)
+    policies.discard(None)
+    if gaps or tasks or policies:
+        refresh(session.connection(), gap_ids=gaps, task_ids=tasks, policy_ids=policies)
+
+# ---------------------------------------------------------------------------
+# CLI: python -m app.compliance.scores rebuild -------------------------------
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    from app.db import engine
+
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m app.compliance.scores rebuild")
+    with engine.begin() as conn:
+        rebuild(conn)
+    print("Compliance score rollups rebuilt.")
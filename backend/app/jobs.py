@@ -0,0 +1,193 @@
+"""Minimal database-backed job runner.
+
+Job rows (see `JobBase` in app/models.py) are the queue: API handlers insert
+`queued` rows and return immediately; one or more worker processes claim
+them and run a handler under a concurrency limit.
+
+✓ Claims are race-free across workers (`FOR UPDATE SKIP LOCKED` on Postgres,
+  a conditional `UPDATE … WHERE status = 'queued'` everywhere).
+✓ A job still `running` after JOB_LEASE_SECONDS (crashed worker) is re-claimed.
+✓ Failures are retried up to JOB_MAX_ATTEMPTS, then marked `failed`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Type
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import get_async_engine
+from app.models import JobBase
+
+JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", 2))
+JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", 900))
+JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+log = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+Handler = Callable[[AsyncSession, JobBase], Awaitable[None]]
+
+
+def default_session_factory() -> AsyncSession:
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+class JobRunner:
+    """Claim rows of `model` and run `handler(session, job)` for each."""
+
+    def __init__(self, model: Type[JobBase], handler: Handler, *, concurrency: int = 2,
+                 session_factory: Optional[SessionFactory] = None):
+        self.model = model
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.session_factory = session_factory or default_session_factory
+
+    async def claim(self, limit: int) -> list[int]:
+        """Atomically move up to `limit` claimable jobs to `running`."""
+        job = self.model
+        now = datetime.utcnow()
+        claimable = or_(
+            job.status == "queued",
+            and_(job.status == "running", job.started_at < now - timedelta(seconds=JOB_LEASE_SECONDS)),
+        )
+        async with self.session_factory() as session:
+            candidates = (await session.exec(
+                select(job.id).where(claimable).order_by(job.created_at, job.id)
+                .limit(limit).with_for_update(skip_locked=True)
+            )).all()
+            claimed = []
+            for job_id in candidates:
+                result = await session.execute(
+                    update(job).where(job.id == job_id, claimable)
+                    .values(status="running", started_at=now, attempts=job.attempts + 1)
+                )
+                if result.rowcount == 1:
+                    claimed.append(job_id)
+            await session.commit()
+        return claimed
+
+    async def _run(self, job_id: int) -> None:
+        async with self.session_factory() as session:
+            job = await session.get(self.model, job_id)
+            try:
+                await self.handler(session, job)
+                job.status, job.error = "done", None
+            except Exception as exc:                          # noqa: BLE001 – job boundary
+                log.exception("%s %s failed", self.model.__name__, job_id)
+                await session.rollback()
+                job = await session.get(self.model, job_id)
+                job.status = "failed" if job.attempts >= JOB_MAX_ATTEMPTS else "queued"
+                job.error = f"{type(exc).__name__}: {exc}"[:2000]
+            job.finished_at = datetime.utcnow()
+            session.add(job)
+            await session.commit()
+
+    async def run_once(self) -> int:
+        """Claim and finish one batch of jobs; returns how many ran."""
+        claimed = await self.claim(self.concurrency)
+        await asyncio.gather(*(self._run(job_id) for job_id in claimed))
+        return len(claimed)
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Keep up to `concurrency` jobs in flight until `stop` is set, then drain."""
+        stop = stop or asyncio.Event()
+        running: set[asyncio.Task] = set()
+        log.info("%s runner started (concurrency=%d)", self.model.__name__, self.concurrency)
+        while not stop.is_set():
+            claimed: list[int] = []
+            if free := self.concurrency - len(running):
+                try:
+                    claimed = await self.claim(free)
+                except Exception:                             # noqa: BLE001 – keep polling
+                    log.exception("%s runner poll failed", self.model.__name__)
+            for job_id in claimed:
+                task = asyncio.create_task(self._run(job_id))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if not claimed or len(running) >= self.concurrency:
+                # Sleep until a slot frees up, the poll interval passes, or we're stopped.
+                stopped = asyncio.ensure_future(stop.wait())
+                await asyncio.wait({stopped, *running}, timeout=JOB_POLL_INTERVAL,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                stopped.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+
+class BatchJobRunner(JobRunner):
+    """Like `JobRunner`, but hands every claimed batch to one `handler(session, jobs)` call.
+
+    For many small jobs (notifications) where a round-trip per job would
+    dominate. A handler exception requeues (or fails) the whole batch.
+    """
+
+    def __init__(self, model: Type[JobBase], handler: Callable[[AsyncSession, list], Awaitable[None]],
+                 *, batch_size: int = 100, session_factory: Optional[SessionFactory] = None):
+        super().__init__(model, handler, concurrency=batch_size, session_factory=session_factory)
+
+    async def _run_batch(self, job_ids: list[int]) -> bool:
+        model = self.model
+        ok = True
+        async with self.session_factory() as session:
+            jobs = (await session.exec(select(model).where(model.id.in_(job_ids)))).all()
+            try:
+                await self.handler(session, jobs)
+                for job in jobs:
+                    job.status, job.error = "done", None
+            except Exception as exc:                          # noqa: BLE001 – job boundary
+                log.exception("%s batch of %d failed", model.__name__, len(job_ids))
+                ok = False
+                await session.rollback()
+                jobs = (await session.exec(select(model).where(model.id.in_(job_ids)))).all()
+                for job in jobs:
+                    job.status = "failed" if job.attempts >= JOB_MAX_ATTEMPTS else "queued"
+                    job.error = f"{type(exc).__name__}: {exc}"[:2000]
+            now = datetime.utcnow()
+            for job in jobs:
+                job.finished_at = now
+            session.add_all(jobs)
+            await session.commit()
+        return ok
+
+    async def run_once(self) -> int:
+        """Claim and handle one batch; returns how many succeeded.
+
+        A failed batch returns 0 so callers back off instead of re-claiming
+        the requeued jobs straight away.
+        """
+        claimed = await self.claim(self.concurrency)
+        if claimed and await self._run_batch(claimed):
+            return len(claimed)
+        return 0
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Drain batches back to back; poll every JOB_POLL_INTERVAL when idle."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                ran = await self.run_once()
+            except Exception:                                 # noqa: BLE001 – keep polling
+                log.exception("%s runner poll failed", self.model.__name__)
+                ran = 0
+            if not ran:
+                try:
+                    await asyncio.wait_for(stop.wait(), JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def serve(*runners: JobRunner) -> None:
+    """Run `runners` until SIGINT/SIGTERM, then let in-flight jobs finish."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await asyncio.gather(*(runner.run_forever(stop) for runner in runners))
@@ -0,0 +1,190 @@
+"""Process startup / shutdown steps used by the lifespan in app/main.py.
+
+✓ `prepare_schema()` – `create_all` in development; in production only a
+  one-off check that the database is at the Alembic head (no DDL, no
+  catalog storm when many workers boot at once).
+✓ `prewarm()` – open the pool's connections and load the bcrypt backend
+  before the first request instead of during it.
+✓ `state` + `InFlightMiddleware` – what GET /ready reports, and what
+  `drain()` waits on at shutdown.
+✓ `install_sigterm_handler()` – uvicorn stops accepting connections as soon
+  as it gets SIGTERM, and runs the lifespan shutdown only after that, so
+  flipping /ready there would be too late. The handler marks the process
+  draining first, keeps serving for SHUTDOWN_DELAY_SECONDS (long enough for
+  the load balancer to see /ready fail and stop routing here), then hands
+  the signal to uvicorn. A second SIGTERM skips the wait. Under a server
+  that does not run the lifespan in the main thread (e.g. gunicorn
+  workers), use a preStop sleep of the same length instead.
+
+    DB_AUTO_CREATE          1/0   – create_all on startup (default: on unless APP_ENV=production)
+    APP_PREWARM             1/0   – prewarm on startup (default: on when APP_ENV=production)
+    DB_PREWARM_CONNECTIONS  int   – connections to open when prewarming (default DB_POOL_SIZE)
+    SHUTDOWN_DELAY_SECONDS  secs  – not-ready but still serving after SIGTERM; 0 = off (default 5)
+    SHUTDOWN_DRAIN_SECONDS  secs  – max wait for in-flight requests at shutdown (default 25)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlmodel import SQLModel
+
+from app.auth.hashing import hash_pool
+from app.auth import security
+from app.db import APP_ENV, DB_ASYNC, DB_POOL_SIZE, _env_flag, engine, get_async_engine
+
+DB_AUTO_CREATE: bool = _env_flag("DB_AUTO_CREATE", APP_ENV != "production")
+APP_PREWARM: bool = _env_flag("APP_PREWARM", APP_ENV == "production")
+DB_PREWARM_CONNECTIONS: int = int(os.getenv("DB_PREWARM_CONNECTIONS", DB_POOL_SIZE))
+SHUTDOWN_DELAY_SECONDS: float = float(os.getenv("SHUTDOWN_DELAY_SECONDS", 5))
+SHUTDOWN_DRAIN_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", 25))
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+log = logging.getLogger(__name__)
+
+
+class LifecycleState:
+    """Where this process is in its life; read by GET /ready."""
+
+    def __init__(self) -> None:
+        self.started = False            # lifespan startup finished
+        self.draining = False           # shutdown began: stop routing traffic here
+        self.in_flight = 0              # requests currently being handled
+
+
+state = LifecycleState()
+
+# ---------------------------------------------------------------------------
+# Startup --------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def schema_heads(conn: Any) -> tuple[set[str], set[str]]:
+    """(revisions the database is at, head revisions in migrations/)."""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    expected = set(ScriptDirectory.from_config(config).get_heads())
+    current = set(MigrationContext.configure(conn).get_current_heads())
+    return current, expected
+
+
+def prepare_schema() -> None:
+    """create_all (dev) or verify the Alembic head (production); sync, run it in a thread."""
+    if DB_AUTO_CREATE:
+        SQLModel.metadata.create_all(bind=engine)
+        return
+    with engine.connect() as conn:
+        current, expected = schema_heads(conn)
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {sorted(current) or 'no revision'}, this build expects "
+            f"{sorted(expected)}; run `alembic upgrade head` before starting the API."
+        )
+    log.info("database schema at head %s", ", ".join(sorted(expected)))
+
+
+async def ping() -> None:
+    """One round-trip on the engine that serves requests."""
+    if DB_ASYNC:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    else:
+        def _ping() -> None:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        await run_in_threadpool(_ping)
+
+
+async def prewarm(connections: int = DB_PREWARM_CONNECTIONS) -> None:
+    """Fill the pool and load the password-hashing backend ahead of traffic."""
+    started = time.perf_counter()
+    # Concurrent pings hold separate connections, so each one stays pooled afterwards.
+    await asyncio.gather(*(ping() for _ in range(max(1, connections))))
+    # passlib loads (and self-tests) bcrypt on first use: pay that here.
+    await hash_pool.run(security.hash_password, "prewarm")
+    log.info("prewarmed %d connection(s) in %.0f ms", connections, 1000 * (time.perf_counter() - started))
+
+# ---------------------------------------------------------------------------
+# Shutdown -------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def install_sigterm_handler(delay: float = SHUTDOWN_DELAY_SECONDS) -> Optional[Callable[[], None]]:
+    """Drain on SIGTERM before the server's own handler runs; returns an uninstaller.
+
+    No-op (None) when `delay` is 0 or off the main thread, where signal
+    handlers cannot be set.
+    """
+    if delay <= 0 or threading.current_thread() is not threading.main_thread():
+        return None
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def hand_over(signum: int) -> None:
+        signal.signal(signal.SIGTERM, previous)
+        if callable(previous):
+            previous(signum, None)
+        else:                                           # SIG_DFL: exit as if we were never here
+            signal.raise_signal(signum)
+
+    def on_sigterm(signum: int, frame: Any) -> None:
+        if state.draining:                              # second SIGTERM: stop waiting
+            hand_over(signum)
+            return
+        state.draining = True
+        log.info("SIGTERM: reporting not-ready, shutting down in %.0fs", delay)
+        loop.call_soon_threadsafe(loop.call_later, delay, hand_over, signum)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    def uninstall() -> None:
+        if signal.getsignal(signal.SIGTERM) is on_sigterm:
+            signal.signal(signal.SIGTERM, previous)
+    return uninstall
+
+
+async def drain(timeout: float = SHUTDOWN_DRAIN_SECONDS) -> bool:
+    """Stop reporting ready and wait up to `timeout` for in-flight requests to finish.
+
+    The lifespan's last line of defence: under uvicorn the server has
+    already waited for open requests by the time this runs (see
+    `install_sigterm_handler` for the part that matters to the load
+    balancer).
+    """
+    state.draining = True
+    deadline = time.monotonic() + timeout
+    while state.in_flight:
+        if time.monotonic() >= deadline:
+            log.warning("shutdown: %d request(s) still in flight after %.0fs", state.in_flight, timeout)
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+class InFlightMiddleware:
+    """Count requests in flight so shutdown can wait for them."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            state.in_flight -= 1
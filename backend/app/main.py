@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from sqlmodel import SQLModel
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 
-from app.db import engine                    # Database engine
+from app import lifecycle, metrics, ratelimit
+from app.db import DB_ASYNC, engine, get_async_engine  # Database engines
+from app.Routers import health
 from app.auth.routes import router as auth 
+from app.auth.hashing import hash_pool
+from app.analysis import worker as analysis_worker
+from app.analysis.worker import ANALYSIS_INLINE_WORKER
+from app.reminders.scheduler import REMINDERS_INLINE_WORKER, ReminderScheduler
+from app.reports import worker as reports_worker
+from app.reports.worker import REPORTS_INLINE_WORKER
+from app.api.v1.router import api_router as v1_router
+from app.realtime import backplane, hub as realtime
+from app.realtime.routes import router as realtime_router
 
 from fastapi import Depends
-from fastapi.security import OAuth2PasswordBearer
-from app.auth.security import decode_token  # <-- new import
+from app.auth import cache as auth_cache
+from app.auth.revocation import revocations
+from app.auth.dependencies import get_current_user
+from app.auth.models import User
 
 
 # ---------------------------------------------------------------------------
@@ -23,12 +38,49 @@ async def lifespan(app: FastAPI):
     """
     Code in this block runs once on startup, and again on shutdown.
 
-    • Creates all tables from SQLModel metadata (idempotent).
-    • Put other one-time startup / teardown tasks here.
+    • Creates all tables (dev) or checks the Alembic head (production, no DDL).
+    • Prewarms the pool and hashing backend (APP_PREWARM=1), then reports ready.
+    • Optionally runs the analysis/report/reminder workers in-process (*_INLINE_WORKER=1).
+    • Listens for other workers' changes (REALTIME_BACKPLANE=postgres).
+    • On SIGTERM: reports not-ready for SHUTDOWN_DELAY_SECONDS while still
+      serving, then lets uvicorn stop accepting and finish open requests.
+    • On shutdown: waits out any requests still in flight, stops workers and
+      disposes the pools.
     """
-    SQLModel.metadata.create_all(bind=engine)
+    lifecycle.state.started = lifecycle.state.draining = False
+    health.database_check.reset()
+    await run_in_threadpool(lifecycle.prepare_schema)
+    if lifecycle.APP_PREWARM:
+        await lifecycle.prewarm()
+    # In-process job workers: dev convenience; run them as separate processes in prod.
+    runners = []
+    if ANALYSIS_INLINE_WORKER:
+        runners.append(analysis_worker.build_runner())
+    if REPORTS_INLINE_WORKER:
+        runners.append(reports_worker.build_runner())
+    if REMINDERS_INLINE_WORKER:
+        runners.append(ReminderScheduler())
+    stop_workers = asyncio.Event()
+    workers = [asyncio.create_task(runner.run_forever(stop_workers)) for runner in runners]
+    listener = None
+    if realtime.REALTIME_BACKPLANE == "postgres" and engine.dialect.name == "postgresql":
+        listener = backplane.Listener(engine.url.render_as_string(hide_password=False))
+        listener.start()
+    uninstall_sigterm = lifecycle.install_sigterm_handler()
+    lifecycle.state.started = True
     yield
-    # --- shutdown logic (if any) -------------------------------------------
+    # --- shutdown logic ------------------------------------------------------
+    if uninstall_sigterm is not None:
+        uninstall_sigterm()
+    await lifecycle.drain()
+    stop_workers.set()
+    await asyncio.gather(*workers)
+    if listener is not None:
+        await listener.stop()
+    hash_pool.shutdown()
+    if DB_ASYNC:
+        await get_async_engine().dispose()
+    engine.dispose()
 
 
 # ---------------------------------------------------------------------------
@@ -40,32 +92,51 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
 )
+app.add_middleware(ratelimit.RateLimitMiddleware)  # 429 before any work; inside metrics so it's counted
+app.add_middleware(metrics.MetricsMiddleware)      # latency, SQL counts → GET /metrics
+app.add_middleware(lifecycle.InFlightMiddleware)   # lets shutdown wait for requests
 
 # ---------------------------------------------------------------------------
 # Register routers -----------------------------------------------------------
 # ---------------------------------------------------------------------------
 
+app.include_router(health.router)              # /health, /ready
 app.include_router(auth, prefix="/auth")      # /auth/register, /auth/login …
 
-# JWT-backed “who am I” endpoint
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
+# JWT-backed “who am I” endpoint (cached: no crypto, no SQL when warm)
 @app.get("/me", summary="Get current user", tags=["auth"])
-async def read_current_user(token: str = Depends(oauth2_scheme)):
-    payload = decode_token(token)
-    return {"email": payload["sub"]}
+async def read_current_user(user: User = Depends(get_current_user)):
+    return {"email": user.email}
 
-# TODO: from app.api.v1.router import api_router as v1_router
-# app.include_router(v1_router, prefix="/api/v1")
+app.include_router(v1_router, prefix="/api/v1")   # /api/v1/policies, /tasks …
+app.include_router(realtime_router)                # /realtime/events, /realtime/ws
 
 # ---------------------------------------------------------------------------
 # Utility / sanity-check endpoints ------------------------------------------
 # ---------------------------------------------------------------------------
 
-@app.get("/health", tags=["utility"])
-async def health() -> dict[str, str]:
-    """Kubernetes-friendly liveness & readiness probe."""
-    return {"status": "ok"}
+@app.get("/metrics", tags=["utility"], response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Request, SQL and pool metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/hashing", tags=["utility"])
+async def hashing_metrics() -> dict:
+    """Password-hashing pool: queue depth, rejections and latency."""
+    return hash_pool.stats()
+
+
+@app.get("/metrics/auth-cache", tags=["utility"])
+async def auth_cache_metrics() -> dict:
+    """Hit/miss counters for the token/user caches, plus the revocation set."""
+    return {**auth_cache.stats(), "revocations": revocations.stats()}
+
+
+@app.get("/metrics/realtime", tags=["utility"])
+async def realtime_metrics() -> dict:
+    """Open change-feed connections, buffered changes and resyncs."""
+    return realtime.hub.stats()
 
 
 @app.get("/", tags=["utility"])
@@ -0,0 +1,307 @@
+"""Request and database instrumentation, exposed in Prometheus text format.
+
+✓ `MetricsMiddleware` – per-route latency histograms, in-flight gauge, and
+  the number/duration of SQL statements each request ran.
+✓ Statement timing hooks on every `Engine` (sync, async and background
+  workers alike) plus pool checkout waits via `TimedQueuePool`.
+✓ Opt-in slow-query / slow-request logging, so hot paths show up in
+  production without turning on DB_ECHO.
+
+No client library: the handful of metric types we need are below, and
+`render()` produces the text exposition format served at GET /metrics.
+
+    METRICS_ENABLED     1/0   – record request/SQL metrics (default 1)
+    SLOW_QUERY_MS       int   – log statements slower than this (0 = off)
+    SLOW_REQUEST_MS     int   – log requests slower than this (0 = off)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", 0))
+SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", 0))
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# ---------------------------------------------------------------------------
+# Metric types ---------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()          # SQL hooks also fire on threadpool threads
+        self._values: dict[tuple, Any] = {}
+        REGISTRY.append(self)
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, key)} {value}"
+
+    def render(self) -> str:
+        with self._lock:
+            samples = list(self._samples())
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *samples])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: Any, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels: Any, value: float) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self) -> Iterable[str]:
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {total}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {count}"
+
+
+REGISTRY: list[_Metric] = []
+# Callbacks that refresh gauges (pool status, …) right before a scrape.
+COLLECTORS: list[Callable[[], None]] = []
+
+
+def render() -> str:
+    """Every registered metric in Prometheus text exposition format."""
+    for collect in COLLECTORS:
+        try:
+            collect()
+        except Exception:                                   # noqa: BLE001 – never fail a scrape
+            log.exception("metrics collector %r failed", collect)
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def reset() -> None:
+    """Zero every metric (tests)."""
+    for metric in REGISTRY:
+        metric.clear()
+
+# ---------------------------------------------------------------------------
+# Metrics --------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+http_requests = Counter("http_requests_total", "Requests handled.", ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "Request latency, first byte in to last byte out.",
+                         ("method", "route"))
+http_in_progress = Gauge("http_requests_in_progress", "Requests currently being handled.", ("method",))
+request_queries = Histogram("http_request_db_queries", "SQL statements executed per request.",
+                            ("method", "route"), buckets=COUNT_BUCKETS)
+request_db_time = Histogram("http_request_db_seconds", "Time spent in SQL per request.", ("method", "route"))
+db_queries = Counter("db_queries_total", "SQL statements executed (requests and background jobs).")
+db_latency = Histogram("db_query_duration_seconds", "Per-statement SQL latency.")
+pool_wait = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+                      ("pool",))
+pool_connections = Gauge("db_pool_connections", "Pooled connections by state.", ("pool", "state"))
+
+# ---------------------------------------------------------------------------
+# SQL hooks ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class RequestStats:
+    """Mutable per-request tally; shared with threadpool/streaming tasks via the contextvar."""
+
+    __slots__ = ("queries", "db_seconds", "scope")
+
+    def __init__(self, scope: dict) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        # Routing fills scope["route"] in place, so this is known once the handler runs.
+        return _route(self.scope)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if METRICS_ENABLED:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_queries.inc()
+    db_latency.observe(value=elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        log.warning("slow query (%.1f ms%s): %s", elapsed * 1000,
+                    f", {stats.route}" if stats else "", " ".join(statement.split())[:1000])
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+class _TimedPoolMixin:
+    """Record how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(self.metrics_name, value=time.perf_counter() - start)
+
+    @property
+    def metrics_name(self) -> str:
+        return "async" if isinstance(self, AsyncAdaptedQueuePool) else "sync"
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def watch_pool(engine: Any) -> None:
+    """Publish `engine`'s pool occupancy as gauges at scrape time."""
+    def collect() -> None:
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            name = getattr(pool, "metrics_name", "sync")
+            pool_connections.set(name, "checked_out", value=pool.checkedout())
+            pool_connections.set(name, "idle", value=pool.checkedin())
+            pool_connections.set(name, "overflow", value=max(0, pool.overflow()))
+    COLLECTORS.append(collect)
+
+# ---------------------------------------------------------------------------
+# ASGI middleware ------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """Pure ASGI (not BaseHTTPMiddleware) so streaming bodies are timed to the last byte."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_progress.dec(method)
+            _current.reset(token)
+            route = stats.route
+            http_requests.inc(method, route, status_code)
+            http_latency.observe(method, route, value=elapsed)
+            request_queries.observe(method, route, value=stats.queries)
+            request_db_time.observe(method, route, value=stats.db_seconds)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                log.warning("slow request (%.1f ms, %d queries, %.1f ms in SQL): %s %s -> %d",
+                            elapsed * 1000, stats.queries, stats.db_seconds * 1000,
+                            method, route, status_code)
+
+
+def _route(scope) -> str:
+    # The matched path template keeps label cardinality bounded (/policies/{policy_id}).
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
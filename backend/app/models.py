@@ -1,13 +1,36 @@
 from datetime import datetime
 from typing import Optional, List
 
+from sqlalchemy import JSON, BigInteger, Index, Integer, SmallInteger
 from sqlmodel import SQLModel, Field, Relationship
 
 
-class User(SQLModel, table=True):
+# ---------------------------------------------------------------------------
+# Tenancy (scoping rules live in app/tenancy.py) -----------------------------
+# ---------------------------------------------------------------------------
+
+class Organization(SQLModel, table=True):
+    """A tenant: every user and every row below it belongs to exactly one."""
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    email: str = Field(index=True, unique=True)
+    slug: str = Field(unique=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TenantScoped(SQLModel):
+    # Nullable so single-tenant installs and pre-tenancy rows keep working;
+    # scoped sessions stamp it on insert and filter every read by it.
+    tenant_id: Optional[int] = Field(default=None, foreign_key="organization.id")
+
+
+class User(TenantScoped, table=True):
+    __table_args__ = (Index("ix_user_tenant_id", "tenant_id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: Optional[str] = None
+    email: str = Field(index=True, nullable=False, unique=True)
+    hashed_password: str
     role: str = "owner"          # owner, staff, admin
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -16,29 +39,62 @@ class User(SQLModel, table=True):
     tasks:    List["Task"]   = Relationship(back_populates="assignee")
 
 
-class Policy(SQLModel, table=True):
+# Composite indexes below back the keyset-paginated list endpoints in
+# app/api/v1: every filter column leads, `(created_at, id)` follows so the
+# `ORDER BY created_at DESC, id DESC` + cursor seek is a pure index range scan.
+# The `tenant_id` ones serve the unfiltered lists of a tenant-scoped session,
+# so a small tenant never walks past a big tenant's rows.
+
+class Policy(TenantScoped, table=True):
+    __table_args__ = (
+        Index("ix_policy_created_at_id", "created_at", "id"),
+        Index("ix_policy_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_policy_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_id: int = Field(foreign_key="user.id")
     title: str
     file_path: str                   # S3/MinIO key
+    size: Optional[int] = Field(default=None, sa_type=BigInteger)  # bytes, set on upload
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     owner: "User"              = Relationship(back_populates="policies")
     gaps:  List["Gap"]         = Relationship(back_populates="policy")
 
 
-class Gap(SQLModel, table=True):
+class Gap(TenantScoped, table=True):
+    __table_args__ = (
+        Index("ix_gap_created_at_id", "created_at", "id"),
+        Index("ix_gap_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_gap_policy_id_created_at_id", "policy_id", "created_at", "id"),
+        Index("ix_gap_tenant_id_severity_created_at_id", "tenant_id", "severity", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     policy_id: int = Field(foreign_key="policy.id")
     description: str
     severity: str               # low / medium / high
+    source_hash: Optional[str] = None   # analysis-cache key of the chunk it came from (AI gaps)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     policy: "Policy"            = Relationship(back_populates="gaps")
     tasks:  List["Task"]        = Relationship(back_populates="gap")
 
 
-class Task(SQLModel, table=True):
+class Task(TenantScoped, table=True):
+    __table_args__ = (
+        Index("ix_task_created_at_id", "created_at", "id"),
+        Index("ix_task_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_task_gap_id_created_at_id", "gap_id", "created_at", "id"),
+        Index("ix_task_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_task_tenant_id_status_created_at_id", "tenant_id", "status", "created_at", "id"),
+        Index("ix_task_tenant_id_due_date", "tenant_id", "due_date"),
+        Index("ix_task_due_date", "due_date"),         # reminder scan: every tenant
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     gap_id: int = Field(foreign_key="gap.id")
     assigned_to: Optional[int] = Field(default=None, foreign_key="user.id")
@@ -52,10 +108,254 @@ class Task(SQLModel, table=True):
     evidence: List["Evidence"]  = Relationship(back_populates="task")
 
 
-class Evidence(SQLModel, table=True):
+class Evidence(TenantScoped, table=True):
+    __table_args__ = (
+        Index("ix_evidence_uploaded_at_id", "uploaded_at", "id"),
+        Index("ix_evidence_tenant_id_uploaded_at_id", "tenant_id", "uploaded_at", "id"),
+        Index("ix_evidence_task_id_uploaded_at_id", "task_id", "uploaded_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     task_id: int = Field(foreign_key="task.id")
     file_path: str                   # S3/MinIO key
+    filename: Optional[str] = None
+    size: Optional[int] = Field(default=None, sa_type=BigInteger)
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
     task: "Task"              = Relationship(back_populates="evidence")
+
+
+class Blob(SQLModel, table=True):
+    """One stored copy of some bytes, shared by every Evidence with that hash."""
+
+    sha256: str = Field(primary_key=True)
+    key: str                                 # blobs/ab/cd/<sha256>-<generation>
+    size: int = Field(sa_type=BigInteger)
+    refcount: int = 0                        # Evidence rows pointing here
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Upload(TenantScoped, table=True):
+    """A resumable multipart upload in progress (see app/api/v1/files.py)."""
+
+    id: str = Field(primary_key=True)        # opaque id handed to the client
+    kind: str                                # policy / evidence
+    target_id: int                           # policy.id or task.id
+    key: str                                 # destination storage key
+    backend_upload_id: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    status: str = "open"                     # open / complete / aborted
+    created_by: Optional[int] = Field(default=None, foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class UploadPart(SQLModel, table=True):
+    __tablename__ = "upload_part"
+
+    upload_id: str = Field(foreign_key="upload.id", primary_key=True)
+    part_number: int = Field(primary_key=True)
+    size: int = Field(sa_type=BigInteger)
+    sha256: str
+
+
+# ---------------------------------------------------------------------------
+# Sessions (see app/auth/) ---------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class RefreshToken(SQLModel, table=True):
+    """One link in a session's refresh-token chain; only the hash is stored."""
+
+    __tablename__ = "refresh_token"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    session_id: str = Field(index=True)             # shared by every rotation of one login (`sid`)
+    token_hash: str = Field(unique=True)            # sha256 of the opaque token
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
+    used_at: Optional[datetime] = None              # rotated: presenting it again is a replay
+    revoked_at: Optional[datetime] = None
+
+
+class RevokedToken(SQLModel, table=True):
+    """A revoked access-token `jti` or session `sid`; mirrored in memory by app/auth/revocation.py."""
+
+    __tablename__ = "revoked_token"
+
+    jti: str = Field(primary_key=True)
+    expires_at: datetime = Field(index=True)        # safe to forget after this
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """One token bucket of `ratelimit.DatabaseStore` (RATE_LIMIT_STORE=database)."""
+
+    __tablename__ = "rate_limit_bucket"
+
+    key: str = Field(primary_key=True)              # "<rule>|<ip|user|route>|<subject>"
+    tokens: float
+    updated_at: float = Field(index=True)           # epoch seconds: plain arithmetic on every dialect
+    allowed: bool = True                            # outcome of the last take
+
+
+# ---------------------------------------------------------------------------
+# Background jobs (claimed and run by app/jobs.py) ---------------------------
+# ---------------------------------------------------------------------------
+
+class JobBase(TenantScoped):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: str = Field(default="queued", index=True)  # queued / running / done / failed
+    attempts: int = 0
+    error: Optional[str] = None
+    created_by: Optional[int] = Field(default=None, foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class AnalysisJob(JobBase, table=True):
+    __tablename__ = "analysis_job"
+
+    policy_id: int = Field(foreign_key="policy.id", index=True)
+    chunks_total: int = 0
+    chunks_done: int = 0
+    chunks_cached: int = 0              # unchanged or cache-hit chunks: no model call
+    gaps_created: int = 0
+    gaps_removed: int = 0
+
+
+class Report(JobBase, table=True):
+    """A generated audit report; doubles as its build job (app/reports/)."""
+
+    __table_args__ = (
+        Index("ix_report_scope_scope_id_format_version", "scope", "scope_id", "format", "version"),
+    )
+
+    scope: str                          # policy / owner
+    scope_id: int
+    format: str                         # html / zip
+    version: int = 0                    # PolicyScore/OwnerScore.version the data was read at
+    events_through: int = Field(default=0, sa_type=BigInteger)   # newest task_event.id read
+    key: Optional[str] = None           # storage key once built
+    size: Optional[int] = Field(default=None, sa_type=BigInteger)
+    sha256: Optional[str] = None
+
+
+class Reminder(JobBase, table=True):
+    """A due-soon / overdue notification; delivered by app/reminders/."""
+
+    task_id: int = Field(foreign_key="task.id", index=True)
+    kind: str                           # due_soon / overdue
+    due_date: datetime                  # the due date this reminder is about
+    recipient_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    idempotency_key: str = Field(unique=True)   # "<task>:<kind>:<due date>"
+
+
+class SchedulerState(SQLModel, table=True):
+    """Per-scheduler watermark: due dates up to here have been scanned."""
+
+    __tablename__ = "scheduler_state"
+
+    name: str = Field(primary_key=True)
+    watermark: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class AnalysisCacheEntry(SQLModel, table=True):
+    """Model output for one normalized chunk (see app/analysis/cache.py)."""
+
+    __tablename__ = "analysis_cache"
+
+    key: str = Field(primary_key=True)       # sha256(prompt version, model, chunk)
+    model: str
+    prompt_version: str
+    findings: list = Field(default_factory=list, sa_type=JSON)
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+# ---------------------------------------------------------------------------
+# Compliance-score rollups (maintained by app/compliance/scores.py) ----------
+# ---------------------------------------------------------------------------
+# No foreign keys on purpose (not even `tenant_id`): rows are rewritten in
+# the same flush that deletes their source rows, and reads must stay
+# single-row lookups.
+
+class GapScore(TenantScoped, table=True):
+    __tablename__ = "gap_score"
+
+    tenant_id: Optional[int] = None
+    gap_id: int = Field(primary_key=True)
+    policy_id: int = Field(index=True)
+    weight: int                         # from Gap.severity
+    closed: bool = False                # ≥1 task and every task is done
+
+
+class PolicyScore(TenantScoped, table=True):
+    __tablename__ = "policy_score"
+
+    tenant_id: Optional[int] = None
+    policy_id: int = Field(primary_key=True)
+    owner_id: int = Field(index=True)
+    total_weight: int = 0
+    closed_weight: int = 0
+    gap_count: int = 0
+    closed_gaps: int = 0
+    evidence_count: int = 0
+    version: int = 0                    # bumped on every change to the policy's tree
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class OwnerScore(TenantScoped, table=True):
+    __tablename__ = "owner_score"
+
+    tenant_id: Optional[int] = None
+    owner_id: int = Field(primary_key=True)
+    total_weight: int = 0
+    closed_weight: int = 0
+    gap_count: int = 0
+    closed_gaps: int = 0
+    evidence_count: int = 0
+    policy_count: int = 0
+    version: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# ---------------------------------------------------------------------------
+# Task status history (written by app/compliance/history.py) -----------------
+# ---------------------------------------------------------------------------
+# Append-only and compact: the status is a smallint code, there are no
+# foreign keys (history outlives deleted tasks and users), and on Postgres
+# `at` gets a BRIN index – rows arrive in time order, so a few pages of
+# block ranges index millions of events.
+
+class TaskEvent(TenantScoped, table=True):
+    __tablename__ = "task_event"
+    __table_args__ = (
+        Index("ix_task_event_task_id_at", "task_id", "at"),
+        Index("ix_task_event_at", "at", postgresql_using="brin"),
+    )
+
+    tenant_id: Optional[int] = None
+    # SQLite only auto-increments an INTEGER primary key.
+    id: Optional[int] = Field(default=None, sa_type=BigInteger().with_variant(Integer, "sqlite"),
+                              primary_key=True)
+    task_id: int
+    status: int = Field(sa_type=SmallInteger)      # history.STATUS_CODES
+    at: datetime = Field(default_factory=datetime.utcnow)
+    actor: Optional[int] = None                     # user id; None for workers / imports
+
+
+class TaskSnapshot(TenantScoped, table=True):
+    """Every live task's status at `taken_at`: as-of queries replay from here."""
+
+    __tablename__ = "task_snapshot"
+
+    tenant_id: Optional[int] = None
+    taken_at: datetime = Field(primary_key=True)
+    task_id: int = Field(primary_key=True)
+    status: int = Field(sa_type=SmallInteger)
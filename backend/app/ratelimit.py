@@ -0,0 +1,327 @@
+"""Token-bucket rate limiting for every request, before any work is done.
+
+Rules match a method and path prefix and name one or more buckets:
+
+    POST /auth/login    ip=10/60 route=100/1
+
+allows each client IP bursts of 10 logins refilled at 10 per 60 s, and all
+clients together 100 per second. Bucket keys:
+
+✓ `ip`    – the client address (see RATE_LIMIT_PROXIES);
+✓ `user`  – the bearer token's subject if the token cache knows it, else
+  the token itself (anonymous requests skip `user` buckets);
+✓ `route` – one bucket shared by every caller of the rule.
+
+Every response from a limited route carries `RateLimit-Limit`,
+`RateLimit-Remaining`, `RateLimit-Reset` and `RateLimit-Policy` for its
+tightest bucket; a refusal is a 429 with `Retry-After`.
+
+Stores: `MemoryStore` (default) keeps buckets in a dict on this worker – one
+dict lookup and a little arithmetic, no locks (all of it runs between two
+awaits on the event loop). `DatabaseStore` keeps them in the
+`rate_limit_bucket` table, so every worker enforces one shared budget; each
+check is a single atomic upsert.
+
+    RATE_LIMIT_ENABLED    1/0 (default 1)
+    RATE_LIMITS           rules, `;`-separated (default: DEFAULT_RULES)
+    RATE_LIMIT_STORE      memory | database (default memory)
+    RATE_LIMIT_PROXIES    trusted reverse-proxy hops in X-Forwarded-For (default 0)
+    RATE_LIMIT_MAX_KEYS   buckets a MemoryStore holds before sweeping (default 100000)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import case, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from app import metrics
+from app.auth import cache as auth_cache
+from app.models import RateLimitBucket
+
+DEFAULT_RULES = (
+    "POST /auth/login ip=10/60 route=100/1;"
+    "POST /auth/register ip=5/600;"
+    "POST /auth/refresh ip=60/60;"
+    "GET /realtime/ ip=30/60;"
+    "* /api/v1/ user=1200/60 ip=2400/60"
+)
+
+RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+RATE_LIMITS: str = os.getenv("RATE_LIMITS", DEFAULT_RULES)
+RATE_LIMIT_STORE: str = os.getenv("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_PROXIES: int = int(os.getenv("RATE_LIMIT_PROXIES", 0))
+RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100_000))
+
+rate_limited = metrics.Counter("http_rate_limited_total", "Requests refused with 429.", ("rule", "bucket"))
+
+# ---------------------------------------------------------------------------
+# Rules ----------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Limit:
+    key: str                # ip / user / route
+    capacity: int           # burst size
+    period: float           # seconds to refill `capacity` tokens
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+@dataclass(frozen=True)
+class Rule:
+    method: str             # "*" = any
+    prefix: str
+    limits: tuple[Limit, ...]
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.prefix}"
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method == "*" or self.method == method) and path.startswith(self.prefix)
+
+
+def parse_rules(spec: str) -> list[Rule]:
+    """`METHOD /prefix key=N/SECONDS …; …` → rules, first match wins."""
+    rules = []
+    for entry in filter(None, (e.strip() for e in spec.split(";"))):
+        method, prefix, *limits = entry.split()
+        parsed = []
+        for limit in limits:
+            key, _, budget = limit.partition("=")
+            count, _, period = budget.partition("/")
+            if key not in {"ip", "user", "route"} or not count or not period:
+                raise ValueError(f"Bad rate limit {limit!r} in {entry!r} (want ip|user|route=N/SECONDS)")
+            parsed.append(Limit(key, int(count), float(period)))
+        rules.append(Rule(method.upper(), prefix, tuple(parsed)))
+    return rules
+
+# ---------------------------------------------------------------------------
+# Stores ---------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: float        # tokens left after this request
+    retry_after: float      # seconds until one token (0 if allowed)
+    reset: float            # seconds until the bucket is full again
+
+
+def _decide(limit: Limit, tokens: float, allowed: bool) -> Decision:
+    return Decision(allowed, tokens, 0.0 if allowed else (1 - tokens) / limit.rate,
+                    (limit.capacity - tokens) / limit.rate)
+
+
+class Store(Protocol):
+    async def take(self, key: str, limit: Limit, now: float) -> Decision: ...
+
+
+class MemoryStore:
+    """Per-worker buckets: `key → [tokens, updated, full_at]`."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: dict[str, list[float]] = {}
+
+    def take_now(self, key: str, limit: Limit, now: float) -> Decision:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._sweep(now)
+            bucket = self._buckets[key] = [float(limit.capacity), now, now]
+        tokens = min(limit.capacity, bucket[0] + max(0.0, now - bucket[1]) * limit.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        bucket[:] = tokens, now, now + (limit.capacity - tokens) / limit.rate
+        return _decide(limit, tokens, allowed)
+
+    async def take(self, key: str, limit: Limit, now: float) -> Decision:
+        return self.take_now(key, limit, now)
+
+    def _sweep(self, now: float) -> None:
+        # A bucket that has refilled completely is the same as no bucket.
+        for key in [k for k, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:          # still full: forget the stalest half
+            stale = sorted(self._buckets, key=lambda k: self._buckets[k][1])[: len(self._buckets) // 2]
+            for key in stale:
+                del self._buckets[key]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class DatabaseStore:
+    """Buckets shared by every worker, one upsert per check.
+
+    Works on any engine the app uses (sync → threadpool, or async); rows
+    idle for longer than PURGE_AFTER seconds are deleted now and then.
+    """
+
+    PURGE_AFTER = 86400.0
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self._purged_at = 0.0
+
+    def _statement(self, key: str, limit: Limit, now: float, dialect_name: str):
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}[dialect_name]
+        table = RateLimitBucket.__table__
+        stmt = dialect.insert(table).values(key=key, tokens=limit.capacity - 1, updated_at=now, allowed=True)
+        elapsed = case((stmt.excluded.updated_at > table.c.updated_at,
+                        stmt.excluded.updated_at - table.c.updated_at), else_=0.0)
+        refilled = table.c.tokens + elapsed * limit.rate
+        tokens = case((refilled > limit.capacity, float(limit.capacity)), else_=refilled)
+        return stmt.on_conflict_do_update(index_elements=["key"], set_={
+            "tokens": case((tokens >= 1, tokens - 1), else_=tokens),
+            "allowed": tokens >= 1,
+            "updated_at": case((stmt.excluded.updated_at > table.c.updated_at, stmt.excluded.updated_at),
+                               else_=table.c.updated_at),
+        }).returning(table.c.tokens, table.c.allowed)
+
+    def _purge(self, conn, now: float) -> None:
+        if now - self._purged_at >= 60:
+            self._purged_at = now
+            table = RateLimitBucket.__table__
+            conn.execute(delete(table).where(table.c.updated_at < now - self.PURGE_AFTER))
+
+    def _take_sync(self, key: str, limit: Limit, now: float) -> Decision:
+        with self.engine.begin() as conn:
+            tokens, allowed = conn.execute(self._statement(key, limit, now, conn.dialect.name)).one()
+            self._purge(conn, now)
+        return _decide(limit, tokens, bool(allowed))
+
+    async def take(self, key: str, limit: Limit, now: float) -> Decision:
+        if not isinstance(self.engine, AsyncEngine):
+            return await run_in_threadpool(self._take_sync, key, limit, now)
+        async with self.engine.begin() as conn:
+            result = await conn.execute(self._statement(key, limit, now, conn.dialect.name))
+            tokens, allowed = result.one()
+            await conn.run_sync(self._purge, now)
+        return _decide(limit, tokens, bool(allowed))
+
+
+_store: Optional[Store] = None
+
+
+def get_store() -> Store:
+    """The process-wide store picked by RATE_LIMIT_STORE."""
+    global _store
+    if _store is None:
+        if RATE_LIMIT_STORE == "database":
+            from app.db import DB_ASYNC, engine, get_async_engine
+
+            _store = DatabaseStore(get_async_engine() if DB_ASYNC else engine)
+        elif RATE_LIMIT_STORE == "memory":
+            _store = MemoryStore()
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_STORE {RATE_LIMIT_STORE!r} (memory | database)")
+    return _store
+
+# ---------------------------------------------------------------------------
+# Middleware -----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def client_ip(scope, proxies: Optional[int] = None) -> str:
+    proxies = RATE_LIMIT_PROXIES if proxies is None else proxies
+    if proxies:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                hops = [h.strip() for h in value.decode("latin-1").split(",")]
+                if len(hops) >= proxies:
+                    return hops[-proxies]         # the address our outermost proxy saw
+                break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            claims = auth_cache.token_cache.peek(token)    # verified earlier; never decode here
+            return f"sub:{claims['sub']}" if claims else f"token:{token[-43:]}"
+    return None
+
+
+class RateLimitMiddleware:
+    """Pure ASGI: refused requests never reach routing, auth or the database."""
+
+    def __init__(self, app: Any, rules: Optional[list[Rule]] = None, store: Optional[Store] = None):
+        self.app = app
+        self.rules = parse_rules(RATE_LIMITS) if rules is None else rules
+        self.store = store or get_store()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        rule = next((r for r in self.rules if r.matches(scope["method"], scope["path"])), None)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        tightest: Optional[tuple[Limit, Decision]] = None
+        for limit in rule.limits:
+            if limit.key == "ip":
+                subject = client_ip(scope)
+            elif limit.key == "user":
+                subject = _user(scope)
+                if subject is None:
+                    continue
+            else:
+                subject = ""
+            decision = await self.store.take(f"{rule.name}|{limit.key}|{subject}", limit, now)
+            if not decision.allowed:
+                rate_limited.inc(rule.name, limit.key)
+                await self._refuse(send, limit, decision)
+                return
+            if tightest is None or decision.remaining / limit.capacity < tightest[1].remaining / tightest[0].capacity:
+                tightest = (limit, decision)
+
+        if tightest is None:
+            await self.app(scope, receive, send)
+            return
+        headers = _headers(*tightest)
+
+        async def send_with_headers(message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _refuse(self, send, limit: Limit, decision: Decision) -> None:
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({"type": "http.response.start", "status": 429, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(math.ceil(decision.retry_after)).encode()),
+            *_headers(limit, decision),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _headers(limit: Limit, decision: Decision) -> list[tuple[bytes, bytes]]:
+    return [
+        (b"ratelimit-limit", str(limit.capacity).encode()),
+        (b"ratelimit-remaining", str(int(decision.remaining)).encode()),
+        (b"ratelimit-reset", str(math.ceil(decision.reset)).encode()),
+        (b"ratelimit-policy", f"{limit.capacity};w={limit.period:g}".encode()),
+    ]
@@ -0,0 +1,14 @@
+"""Live change feed: task, gap and evidence changes pushed to the UI.
+
+    GET /realtime/events?access_token=…&kind=task     Server-Sent Events
+    WS  /realtime/ws?access_token=…&kind=task         WebSocket (same payloads)
+
+Committed ORM writes become `{"kind", "id", "op"}` changes (`op` is
+created / updated / deleted). `hub.py` fans them out to the connections of
+the same tenant; each connection coalesces bursts into one batch and keeps
+a bounded buffer – a consumer that falls too far behind gets a single
+`resync` message (refetch your lists) instead of an ever-growing queue.
+
+With REALTIME_BACKPLANE=postgres, changes travel through Postgres
+LISTEN/NOTIFY (`backplane.py`) so every worker process sees every commit.
+"""
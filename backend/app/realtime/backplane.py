@@ -0,0 +1,101 @@
+"""Postgres LISTEN/NOTIFY backplane for the change feed.
+
+Writers `NOTIFY` inside their own transaction (`notify()`, called from the
+flush hook), so Postgres delivers the changes only if – and when – the
+transaction commits. Every worker runs one `Listener`: a dedicated asyncpg
+connection that LISTENs and hands payloads to the local hub. While it is
+reconnecting, notifications are lost, so every connection is told to
+resync once it is back.
+
+    REALTIME_CHANNEL   NOTIFY channel (default complipilot_changes)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, make_url
+
+from app.realtime.hub import Change, hub
+
+REALTIME_CHANNEL: str = os.getenv("REALTIME_CHANNEL", "complipilot_changes")
+MAX_PAYLOAD = 7000          # Postgres caps a NOTIFY payload at 8000 bytes
+RECONNECT_DELAY = 1.0
+
+log = logging.getLogger(__name__)
+
+
+def _payloads(changes: list[Change]) -> list[str]:
+    payloads, batch, size = [], [], 2
+    for change in changes:
+        item = json.dumps(change, separators=(",", ":"))
+        if batch and size + len(item) + 1 > MAX_PAYLOAD:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(item)
+        size += len(item) + 1
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+def notify(connection: Connection, changes: list[Change]) -> None:
+    for payload in _payloads(changes):
+        connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                           {"channel": REALTIME_CHANNEL, "payload": payload})
+
+
+class Listener:
+    """LISTEN on REALTIME_CHANNEL and feed the hub until stopped."""
+
+    def __init__(self, database_url: str):
+        url = make_url(database_url)
+        # asyncpg takes a plain libpq-style DSN, whatever driver SQLAlchemy uses.
+        self.dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            hub.fan_out(json.loads(payload))
+        except ValueError:
+            log.warning("Ignoring malformed change notification: %.200s", payload)
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        lost = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as exc:
+                log.warning("Change-feed listener cannot connect (%s); retrying", exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            try:
+                await connection.add_listener(REALTIME_CHANNEL, self._on_notify)
+                self.connected = True
+                if lost:
+                    hub.resync_all()
+                while not connection.is_closed():
+                    await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                self.connected = False
+                lost = True
+                if not connection.is_closed():
+                    await connection.close()
+            log.warning("Change-feed listener lost its connection; reconnecting")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,206 @@
+"""In-process pub/sub for change events, plus the session hooks that feed it.
+
+✓ `publish()` never blocks and may be called from any thread: fan-out is
+  handed to the event loop the subscribers live on.
+✓ Subscribers are indexed by tenant, so a commit only touches the
+  connections that may see it.
+✓ Each `Subscription` keeps at most one pending change per `(kind, id)` –
+  ten rapid edits to a task are delivered once – and waits
+  REALTIME_COALESCE_MS after the first change so a burst goes out as one
+  batch.
+✓ Backpressure: past REALTIME_MAX_PENDING distinct pending changes the
+  buffer is dropped and the connection gets one `resync` instead.
+✓ Core writes that bypass the ORM (bulk import) call `created()`
+  themselves; a batch too big to list becomes one resync for the tenant.
+
+    REALTIME_BACKPLANE     none | postgres – cross-worker fan-out (default none)
+    REALTIME_COALESCE_MS   batching window per connection (default 250)
+    REALTIME_MAX_PENDING   pending changes per connection before resync (default 1000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import Evidence, Gap, Task
+
+REALTIME_BACKPLANE: str = os.getenv("REALTIME_BACKPLANE", "none").lower()
+REALTIME_COALESCE_MS: float = float(os.getenv("REALTIME_COALESCE_MS", 250))
+REALTIME_MAX_PENDING: int = int(os.getenv("REALTIME_MAX_PENDING", 1000))
+
+KINDS = {Task: "task", Gap: "gap", Evidence: "evidence"}
+RESYNC = {"op": "resync"}
+
+Change = dict[str, Any]          # {"kind", "id", "op", "tenant_id"}
+
+
+class Subscription:
+    """One connection's view of the feed: filtered, coalesced, bounded."""
+
+    def __init__(self, tenant_id: Optional[int], kinds: Iterable[str]):
+        self.tenant_id = tenant_id
+        self.kinds = frozenset(kinds)
+        self._pending: dict[tuple[str, int], Change] = {}
+        self._overflowed = False
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.resyncs = 0
+
+    def offer(self, change: Change) -> None:
+        """Queue a change (event-loop thread only; never blocks)."""
+        if change["op"] == "resync":
+            self.overflow()
+            return
+        if change["kind"] not in self.kinds or self._overflowed:
+            return
+        key = (change["kind"], change["id"])
+        earlier = self._pending.pop(key, None)
+        if earlier is not None and earlier["op"] == "created" and change["op"] == "updated":
+            change = earlier                      # still news to this client: keep "created"
+        self._pending[key] = change               # re-insert: batches stay in change order
+        if len(self._pending) > REALTIME_MAX_PENDING:
+            self.overflow()
+        self._ready.set()
+
+    def overflow(self) -> None:
+        """Forget what is pending; the client refetches instead."""
+        self._pending.clear()
+        self._overflowed = True
+        self._ready.set()
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Optional[list[Change]]:
+        """Wait for changes, then the coalescing window; None on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if REALTIME_COALESCE_MS > 0 and not self._overflowed:
+            await asyncio.sleep(REALTIME_COALESCE_MS / 1000)
+        self._ready.clear()
+        if self._overflowed:
+            self._overflowed = False
+            self.resyncs += 1
+            return [RESYNC]
+        batch = [{k: v for k, v in c.items() if k != "tenant_id"} for c in self._pending.values()]
+        self._pending.clear()
+        self.delivered += len(batch)
+        return batch
+
+
+class Hub:
+    def __init__(self) -> None:
+        self._by_tenant: dict[Optional[int], set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+
+    def subscribe(self, tenant_id: Optional[int], kinds: Iterable[str]) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(tenant_id, kinds)
+        self._by_tenant[tenant_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._by_tenant.get(subscription.tenant_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._by_tenant[subscription.tenant_id]
+
+    def publish(self, changes: list[Change]) -> None:
+        """Deliver committed changes to local subscribers (thread-safe)."""
+        loop = self._loop
+        if not changes or not self._by_tenant or loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.fan_out(changes)
+        else:
+            loop.call_soon_threadsafe(self.fan_out, changes)
+
+    def fan_out(self, changes: list[Change]) -> None:
+        self.published += len(changes)
+        for change in changes:
+            for subscription in self._by_tenant.get(change.get("tenant_id"), ()):
+                subscription.offer(change)
+
+    def resync_all(self) -> None:
+        """Every connection refetches (e.g. the backplane missed notifications)."""
+        for subscribers in self._by_tenant.values():
+            for subscription in subscribers:
+                subscription.overflow()
+
+    def stats(self) -> dict[str, Any]:
+        subscriptions = [s for subs in self._by_tenant.values() for s in subs]
+        return {
+            "connections": len(subscriptions),
+            "tenants": len(self._by_tenant),
+            "published": self.published,
+            "pending": sum(len(s._pending) for s in subscriptions),
+            "resyncs": sum(s.resyncs for s in subscriptions),
+            "backplane": REALTIME_BACKPLANE,
+        }
+
+
+hub = Hub()
+
+# ---------------------------------------------------------------------------
+# Session hooks: collect on flush, publish on commit -------------------------
+# ---------------------------------------------------------------------------
+
+_KEY = "realtime_changes"
+
+
+def _changes(session: Session) -> list[Change]:
+    out = []
+    for objects, op in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            kind = KINDS.get(type(obj))
+            if kind is None or (op == "updated" and not session.is_modified(obj, include_collections=False)):
+                continue
+            out.append({"kind": kind, "id": obj.id, "op": op, "tenant_id": obj.tenant_id})
+    return out
+
+
+def collect(session: Session, changes: list[Change]) -> None:
+    """Send `changes` once the session's transaction commits (never if it rolls back)."""
+    if not changes:
+        return
+    connection = session.connection()
+    if REALTIME_BACKPLANE == "postgres" and connection.dialect.name == "postgresql":
+        from app.realtime import backplane
+
+        backplane.notify(connection, changes)         # NOTIFY is delivered on commit only
+    else:
+        session.info.setdefault(_KEY, []).extend(changes)
+
+
+def created(session: Session, kind: str, ids: list[int], tenant_id: Optional[int]) -> None:
+    """Report rows inserted with Core statements, which the flush hook never sees."""
+    if len(ids) > REALTIME_MAX_PENDING:               # would overflow every subscriber anyway
+        collect(session, [{"op": "resync", "tenant_id": tenant_id}])
+    else:
+        collect(session, [{"kind": kind, "id": i, "op": "created", "tenant_id": tenant_id} for i in ids])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    collect(session, _changes(session))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish(session: Session) -> None:
+    hub.publish(session.info.pop(_KEY, []))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard(session: Session, previous_transaction) -> None:
+    session.info.pop(_KEY, None)
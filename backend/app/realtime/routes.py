@@ -0,0 +1,131 @@
+"""SSE and WebSocket endpoints for the change feed.
+
+Browsers cannot set an Authorization header on an EventSource or a
+WebSocket, so the access token may also come as `?access_token=`. It is
+checked like any other request (`decode_token`, revocations, user cache);
+the session used for that is released before streaming starts, so an open
+feed holds no database connection.
+
+    REALTIME_HEARTBEAT      secs between keep-alives on an idle feed (default 15)
+    REALTIME_SEND_TIMEOUT   secs a WebSocket send may block before we drop it (default 10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import AsyncIterator, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from starlette.websockets import WebSocketDisconnect
+
+from app.auth.dependencies import get_active_claims, get_current_user, get_token_claims
+from app.db import get_async_session
+from app.models import User
+from app.realtime.hub import hub
+
+REALTIME_HEARTBEAT: float = float(os.getenv("REALTIME_HEARTBEAT", 15))
+REALTIME_SEND_TIMEOUT: float = float(os.getenv("REALTIME_SEND_TIMEOUT", 10))
+
+router = APIRouter(prefix="/realtime", tags=["realtime"])
+
+Kind = Literal["task", "gap", "evidence"]
+ALL_KINDS: List[str] = ["task", "gap", "evidence"]
+
+
+async def authenticate(token: Optional[str], session) -> User:
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated",
+                            headers={"WWW-Authenticate": "Bearer"})
+    claims = await get_active_claims(get_token_claims(token), session)
+    user = await get_current_user(claims, session)
+    await session.rollback()            # hand the connection back before the long-lived part
+    return user
+
+
+def _bearer(authorization: Optional[str], access_token: Optional[str]) -> Optional[str]:
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else access_token
+
+
+async def sse_stream(tenant_id: Optional[int], kinds: List[str], request: Request) -> AsyncIterator[str]:
+    """One SSE message per coalesced batch; comments keep idle proxies open."""
+    subscription = hub.subscribe(tenant_id, kinds)
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            batch = await subscription.next_batch(timeout=REALTIME_HEARTBEAT)
+            if batch is None:
+                yield ": keep-alive\n\n"
+            elif batch[0].get("op") == "resync":
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                yield f"event: changes\ndata: {json.dumps(batch)}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def events(
+    request: Request,
+    kind: Optional[List[Kind]] = Query(None),
+    access_token: Optional[str] = None,
+    session=Depends(get_async_session),
+):
+    """Server-Sent Events: `changes` (a JSON list) and `resync` messages."""
+    user = await authenticate(_bearer(request.headers.get("authorization"), access_token), session)
+    return StreamingResponse(
+        sse_stream(user.tenant_id, kind or ALL_KINDS, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _until_closed(websocket: WebSocket) -> None:
+    # The client never needs to talk; reading just notices when it goes away.
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws")
+async def websocket_feed(
+    websocket: WebSocket,
+    kind: Optional[List[Kind]] = Query(None),
+    access_token: Optional[str] = None,
+    session=Depends(get_async_session),
+):
+    """Same feed over a WebSocket: `{"type": "changes" | "resync", "changes": [...]}`."""
+    try:
+        user = await authenticate(_bearer(websocket.headers.get("authorization"), access_token), session)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    subscription = hub.subscribe(user.tenant_id, kind or ALL_KINDS)   # before accept: no gap
+    await websocket.accept()
+    closed = asyncio.ensure_future(_until_closed(websocket))
+    try:
+        while not closed.done():
+            batch_task = asyncio.ensure_future(subscription.next_batch(timeout=REALTIME_HEARTBEAT))
+            await asyncio.wait({batch_task, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if not batch_task.done():
+                batch_task.cancel()
+                break
+            batch = batch_task.result()
+            if batch is None:
+                message = {"type": "ping"}
+            elif batch[0].get("op") == "resync":
+                message = {"type": "resync"}
+            else:
+                message = {"type": "changes", "changes": batch}
+            # A client that stops reading must not pin its buffer forever.
+            await asyncio.wait_for(websocket.send_json(message), REALTIME_SEND_TIMEOUT)
+    except (WebSocketDisconnect, asyncio.TimeoutError, RuntimeError):
+        pass
+    finally:
+        closed.cancel()
+        hub.unsubscribe(subscription)
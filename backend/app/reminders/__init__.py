@@ -0,0 +1 @@
+"""Due-date scheduler: turns approaching/passed task due dates into reminders."""
@@ -0,0 +1,65 @@
+"""Where reminders go. Delivery is at-least-once: a crash between sending
+and recording a batch re-sends it, so receivers should dedupe on
+each reminder's `idempotency_key`.
+
+    REMINDER_WEBHOOK_URL   POST each batch here as JSON (default: just log)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import urllib.request
+from typing import List, Protocol
+
+import anyio
+
+from app.models import Reminder
+
+REMINDER_WEBHOOK_URL: str = os.getenv("REMINDER_WEBHOOK_URL", "")
+REMINDER_WEBHOOK_TIMEOUT: float = float(os.getenv("REMINDER_WEBHOOK_TIMEOUT", 10))
+
+log = logging.getLogger(__name__)
+
+
+def payload(reminder: Reminder) -> dict:
+    return {
+        "idempotency_key": reminder.idempotency_key,
+        "kind": reminder.kind,
+        "task_id": reminder.task_id,
+        "recipient_id": reminder.recipient_id,
+        "due_date": reminder.due_date.isoformat(),
+    }
+
+
+class Notifier(Protocol):
+    async def send(self, reminders: List[Reminder]) -> None: ...
+
+
+class LogNotifier:
+    async def send(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            log.info("Reminder %s", payload(reminder))
+
+
+class WebhookNotifier:
+    """One POST per batch; any non-2xx raises, so the batch is retried."""
+
+    def __init__(self, url: str, timeout: float = REMINDER_WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    async def send(self, reminders: List[Reminder]) -> None:
+        body = json.dumps({"reminders": [payload(r) for r in reminders]}).encode()
+        await anyio.to_thread.run_sync(self._post, body)
+
+
+def get_notifier() -> Notifier:
+    return WebhookNotifier(REMINDER_WEBHOOK_URL) if REMINDER_WEBHOOK_URL else LogNotifier()
@@ -0,0 +1,97 @@
+"""Write-time reminders, plus the reminder INSERT shared with the scheduler.
+
+The scheduler's scan only moves forward from its watermark, so a due date
+written *behind* it – a task created overdue, a deadline pulled into the
+past or into the lead window, a finished task reopened late – would never
+be seen. Writes catch those themselves: an `after_flush` hook queues the
+reminder inside the writing transaction. Due dates further out are left to
+the scan.
+
+✓ Same idempotency keys as the scan: whichever runs first wins, the other
+  is a no-op.
+✓ Core writes that bypass the ORM (bulk import) call `queue_for()`
+  themselves.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, func, inspect, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.models import Gap, Policy, Reminder, Task
+
+REMINDER_LEAD = timedelta(hours=float(os.getenv("REMINDER_LEAD_HOURS", 24)))
+
+
+def reminder_rows(kind: str, batch: Iterable, now: datetime) -> List[dict]:
+    """Reminder rows for `(due_date, task_id, recipient_id, tenant_id)` tuples."""
+    return [
+        {
+            "task_id": task_id, "kind": kind, "due_date": due, "recipient_id": recipient,
+            "tenant_id": tenant_id,
+            "idempotency_key": f"{task_id}:{kind}:{due.isoformat()}",
+            "status": "queued", "attempts": 0, "created_at": now,
+        }
+        for due, task_id, recipient, tenant_id in batch
+    ]
+
+
+def insert_reminders(conn: Connection, rows: List[dict]) -> None:
+    """INSERT … ON CONFLICT (idempotency_key) DO NOTHING."""
+    if not rows:
+        return
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+    if dialect is None:
+        known = set(conn.execute(
+            select(Reminder.idempotency_key)
+            .where(Reminder.idempotency_key.in_([r["idempotency_key"] for r in rows]))
+        ).scalars())
+        rows = [r for r in rows if r["idempotency_key"] not in known]
+        if rows:
+            conn.execute(insert(Reminder), rows)
+        return
+    conn.execute(dialect.insert(Reminder).values(rows)
+                 .on_conflict_do_nothing(index_elements=["idempotency_key"]))
+
+
+def due_tasks():
+    """`(due_date, id, recipient, tenant_id)` of open tasks; callers add the due-date range."""
+    return (
+        select(Task.due_date, Task.id, func.coalesce(Task.assigned_to, Policy.owner_id), Task.tenant_id)
+        .join(Gap, Gap.id == Task.gap_id)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .where(Task.status != "done")
+    )
+
+
+def queue_for(conn: Connection, task_ids: List[int], now: Optional[datetime] = None) -> int:
+    """Queue the reminders that are already due for `task_ids`; return how many tasks had one."""
+    now = now or datetime.utcnow()
+    batch = conn.execute(
+        due_tasks().where(Task.id.in_(task_ids), Task.due_date <= now + REMINDER_LEAD)
+    ).all()
+    insert_reminders(conn, reminder_rows("overdue", [r for r in batch if r[0] <= now], now)
+                     + reminder_rows("due_soon", [r for r in batch if r[0] > now], now))
+    return len(batch)
+
+# ---------------------------------------------------------------------------
+# Session hook ---------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Session, "after_flush")
+def _queue_written_due_dates(session: Session, flush_context) -> None:
+    ids = [obj.id for obj in session.new if isinstance(obj, Task) and obj.due_date is not None]
+    for obj in session.dirty:
+        if isinstance(obj, Task) and obj.due_date is not None:
+            attrs = inspect(obj).attrs
+            if attrs.due_date.history.has_changes() or attrs.status.history.has_changes():
+                ids.append(obj.id)
+    if ids:
+        queue_for(session.connection(), ids)
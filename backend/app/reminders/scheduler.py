@@ -0,0 +1,165 @@
+"""Reminder scheduler.
+
+Each tick has two phases:
+
+1. **Scan** – find tasks whose due date entered a window since the last
+   tick and insert one `Reminder` per (task, kind, due date):
+
+       due_soon   due_date ∈ (watermark + lead, now + lead]
+       overdue    due_date ∈ (watermark,        now]
+
+   Both are range scans on `ix_task_due_date`, walked in keyset batches –
+   the cost follows the number of tasks crossing a boundary, not the size
+   of the table. The window starts REMINDER_SETTLE_SECONDS before the
+   watermark, so a write committed just after the previous tick is still
+   seen; only the very first run looks back REMINDER_LOOKBACK. Due dates
+   written behind the watermark (a deadline moved into the past) are
+   queued by the write itself – see app/reminders/queue.py. Overlaps are
+   harmless because `idempotency_key` is unique and inserts use ON
+   CONFLICT DO NOTHING. A restart therefore never duplicates reminders.
+
+2. **Dispatch** – reminders are job rows: `BatchJobRunner` claims them with
+   `FOR UPDATE SKIP LOCKED` (conditional UPDATE on SQLite) and hands each
+   batch to the notifier.
+
+Any number of schedulers can run: the scan locks the `scheduler_state` row
+with SKIP LOCKED (others skip that tick) and advances the watermark with a
+compare-and-set, which is what protects SQLite.
+
+    python -m app.reminders.scheduler
+
+    REMINDER_INTERVAL        seconds between ticks (default 60)
+    REMINDER_LEAD_HOURS      "due soon" horizon (default 24)
+    REMINDER_SETTLE_SECONDS  re-scan overlap per tick; > any transaction (default 300)
+    REMINDER_LOOKBACK_HOURS  first-run catch-up (default 24)
+    REMINDER_BATCH_SIZE      tasks per scan batch, reminders per send (default 500)
+    REMINDERS_INLINE_WORKER  1 = run inside the API process (dev; default 0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.jobs import BatchJobRunner, SessionFactory, default_session_factory, serve
+from app.models import Reminder, SchedulerState, Task
+from app.reminders.notifiers import Notifier, get_notifier
+from app.reminders.queue import REMINDER_LEAD, due_tasks, insert_reminders, reminder_rows
+
+REMINDER_INTERVAL: float = float(os.getenv("REMINDER_INTERVAL", 60))
+REMINDER_SETTLE = timedelta(seconds=float(os.getenv("REMINDER_SETTLE_SECONDS", 300)))
+REMINDER_LOOKBACK = timedelta(hours=float(os.getenv("REMINDER_LOOKBACK_HOURS", 24)))
+REMINDER_BATCH_SIZE: int = int(os.getenv("REMINDER_BATCH_SIZE", 500))
+REMINDERS_INLINE_WORKER: bool = os.getenv("REMINDERS_INLINE_WORKER", "0").lower() in {"1", "true", "yes", "on"}
+
+STATE_NAME = "reminders"
+
+log = logging.getLogger(__name__)
+
+
+async def _scan_window(session, kind: str, low: datetime, high: datetime) -> int:
+    """Queue `kind` reminders for open tasks with low < due_date <= high."""
+    now, found, after = datetime.utcnow(), 0, None
+    while True:
+        stmt = (
+            due_tasks()
+            .where(Task.due_date > low, Task.due_date <= high)
+            .order_by(Task.due_date, Task.id)
+            .limit(REMINDER_BATCH_SIZE)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Task.due_date, Task.id) > after)
+        batch = (await session.exec(stmt)).all()
+        if not batch:
+            return found
+        rows = reminder_rows(kind, batch, now)
+        await session.run_sync(lambda s: insert_reminders(s.connection(), rows))
+        found += len(batch)
+        after = tuple(batch[-1][:2])             # (due_date, id)
+
+
+async def scan(session, now: Optional[datetime] = None) -> int:
+    """Queue reminders for due dates crossed since the last scan; commits."""
+    now = now or datetime.utcnow()
+    state = (await session.exec(
+        select(SchedulerState).where(SchedulerState.name == STATE_NAME)
+        .with_for_update(skip_locked=True)
+    )).first()
+    if state is None:
+        if await session.get(SchedulerState, STATE_NAME) is not None:
+            return 0                                    # another scheduler holds the lock
+        session.add(SchedulerState(name=STATE_NAME))    # first run ever
+        try:
+            await session.commit()
+        except IntegrityError:                          # another scheduler got there first
+            await session.rollback()
+            return 0
+        return await scan(session, now)
+
+    previous = state.watermark
+    since = now - REMINDER_LOOKBACK if previous is None else previous - REMINDER_SETTLE
+    found = await _scan_window(session, "due_soon", since + REMINDER_LEAD, now + REMINDER_LEAD)
+    found += await _scan_window(session, "overdue", since, now)
+
+    advanced = await session.exec(
+        update(SchedulerState)
+        .where(SchedulerState.name == STATE_NAME,
+               SchedulerState.watermark.is_(None) if previous is None
+               else SchedulerState.watermark == previous)
+        .values(watermark=now, updated_at=datetime.utcnow())
+    )
+    if advanced.rowcount != 1:                          # lost a race (SQLite): discard
+        await session.rollback()
+        return 0
+    await session.commit()
+    return found
+
+
+async def deliver(notifier: Notifier, session: AsyncSession, reminders: List[Reminder]) -> None:
+    await notifier.send(reminders)
+
+
+class ReminderScheduler:
+    def __init__(self, notifier: Optional[Notifier] = None,
+                 session_factory: Optional[SessionFactory] = None):
+        self.notifier = notifier or get_notifier()
+        self.session_factory = session_factory or default_session_factory
+        self.dispatcher = BatchJobRunner(
+            Reminder, lambda session, batch: deliver(self.notifier, session, batch),
+            batch_size=REMINDER_BATCH_SIZE, session_factory=self.session_factory,
+        )
+
+    async def tick(self, now: Optional[datetime] = None) -> tuple[int, int]:
+        """One scan plus a full drain of queued reminders → (queued, sent)."""
+        async with self.session_factory() as session:
+            queued = await scan(session, now)
+        sent = 0
+        while ran := await self.dispatcher.run_once():
+            sent += ran
+        return queued, sent
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        log.info("Reminder scheduler started (interval=%ss)", REMINDER_INTERVAL)
+        while not stop.is_set():
+            try:
+                await self.tick()
+            except Exception:                               # noqa: BLE001 – keep ticking
+                log.exception("Reminder tick failed")
+            try:
+                await asyncio.wait_for(stop.wait(), REMINDER_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(ReminderScheduler()))
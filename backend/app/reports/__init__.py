@@ -0,0 +1 @@
+"""Audit-ready reports, built in the background and cached by data version."""
@@ -0,0 +1,157 @@
+"""Report content and renderers.
+
+A report is a short summary plus a list of `Section`s (gaps & tasks,
+evidence manifest, task status history). Each section's rows are streamed from a server-side
+cursor and written out partition by partition, so a report of any size is
+never held in memory:
+
+    html  one self-contained page
+    zip   report.html plus one CSV per section
+"""
+
+from __future__ import annotations
+
+import csv
+import html
+import io
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import aliased
+
+from app.compliance.history import STATUSES
+from app.db import stream_partitions
+from app.models import Evidence, Gap, OwnerScore, Policy, PolicyScore, Task, TaskEvent, User
+
+REPORT_BATCH_SIZE: int = int(os.getenv("REPORT_BATCH_SIZE", 1000))
+
+Write = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class Section:
+    title: str
+    filename: str                       # CSV name inside the ZIP
+    statement: Select
+
+
+def _scope_filter(scope: str, scope_id: int):
+    return Policy.id == scope_id if scope == "policy" else Policy.owner_id == scope_id
+
+
+def sections(scope: str, scope_id: int) -> List[Section]:
+    in_scope = _scope_filter(scope, scope_id)
+    gaps = (
+        select(Policy.id.label("policy_id"), Policy.title.label("policy"),
+               Gap.id.label("gap_id"), Gap.severity, Gap.description,
+               Task.id.label("task_id"), Task.title.label("task"), Task.status,
+               User.email.label("assignee"), Task.due_date, Task.created_at.label("task_created_at"))
+        .select_from(Gap)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .outerjoin(Task, Task.gap_id == Gap.id)
+        .outerjoin(User, User.id == Task.assigned_to)
+        .where(in_scope)
+        .order_by(Policy.id, Gap.id, Task.id)
+    )
+    evidence = (
+        select(Evidence.id.label("evidence_id"), Gap.id.label("gap_id"), Task.id.label("task_id"),
+               Evidence.filename, Evidence.size, Evidence.sha256, Evidence.uploaded_at)
+        .join(Task, Task.id == Evidence.task_id)
+        .join(Gap, Gap.id == Task.gap_id)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .where(in_scope)
+        .order_by(Evidence.id)
+    )
+    actor = aliased(User)
+    history = (
+        select(Task.id.label("task_id"), Task.title.label("task"),
+               case(dict(enumerate(STATUSES)), value=TaskEvent.status).label("status"),
+               TaskEvent.at, actor.email.label("changed_by"))
+        .join(Task, Task.id == TaskEvent.task_id)
+        .join(Gap, Gap.id == Task.gap_id)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .outerjoin(actor, actor.id == TaskEvent.actor)
+        .where(in_scope)
+        .order_by(Task.id, TaskEvent.at, TaskEvent.id)
+    )
+    return [Section("Gaps and tasks", "gaps.csv", gaps),
+            Section("Evidence manifest", "evidence.csv", evidence),
+            Section("Task status history", "history.csv", history)]
+
+
+async def last_event(session, scope: str, scope_id: int) -> int:
+    """Newest `task_event.id` under the scope (0 if none) – the history's version stamp."""
+    newest = await session.execute(
+        select(func.max(TaskEvent.id))
+        .join(Task, Task.id == TaskEvent.task_id)
+        .join(Gap, Gap.id == Task.gap_id)
+        .join(Policy, Policy.id == Gap.policy_id)
+        .where(_scope_filter(scope, scope_id))
+    )
+    return newest.scalar() or 0
+
+
+async def load_summary(session, scope: str, scope_id: int) -> Tuple[int, dict]:
+    """(data version, summary fields); LookupError if the scope is gone."""
+    score = await session.get(PolicyScore if scope == "policy" else OwnerScore, scope_id)
+    if score is None:
+        raise LookupError(f"No {scope} {scope_id}")
+    if scope == "policy":
+        title = (await session.get(Policy, scope_id)).title
+    else:
+        title = (await session.get(User, scope_id)).email
+    return score.version, {
+        "title": title,
+        "scope": scope,
+        "version": score.version,
+        "score": f"{score.closed_weight / score.total_weight:.0%}" if score.total_weight else "n/a",
+        "gaps": score.gap_count,
+        "closed gaps": score.closed_gaps,
+        "evidence files": score.evidence_count,
+        "generated at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+    }
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+async def write_html(session, summary: dict, report_sections: List[Section], write: Write) -> None:
+    title = html.escape(f"Compliance report – {summary['title']}")
+    await write(
+        f"<!doctype html><html><head><meta charset='utf-8'><title>{title}</title>"
+        "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+        "td,th{border:1px solid #ccc;padding:2px 6px;text-align:left}</style></head>"
+        f"<body><h1>{title}</h1><dl>"
+        + "".join(f"<dt>{html.escape(k)}</dt><dd>{html.escape(_text(v))}</dd>" for k, v in summary.items())
+        + "</dl>"
+    )
+    for section in report_sections:
+        header = "".join(f"<th>{html.escape(c.name)}</th>" for c in section.statement.selected_columns)
+        await write(f"<h2>{html.escape(section.title)}</h2><table><tr>{header}</tr>")
+        async for rows in stream_partitions(session, section.statement, REPORT_BATCH_SIZE):
+            await write("".join(
+                "<tr>" + "".join(f"<td>{html.escape(_text(v))}</td>" for v in row) + "</tr>"
+                for row in rows
+            ))
+        await write("</table>")
+    await write("</body></html>")
+
+
+async def write_csv(session, section: Section, write: Write) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(c.name for c in section.statement.selected_columns)
+    async for rows in stream_partitions(session, section.statement, REPORT_BATCH_SIZE):
+        writer.writerows([_text(v) for v in row] for row in rows)
+        await write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    await write(buffer.getvalue())
@@ -0,0 +1,103 @@
+"""Report worker: renders queued `Report` rows and stores the artifacts.
+
+Output goes to a local temp file first (one partition at a time), then is
+streamed to storage under `reports/<scope>/<id>/<version>-<report>.<fmt>`.
+Once a build succeeds, older artifacts for the same scope and format are
+deleted – the newest version is the only one anyone can ask for.
+
+    python -m app.reports.worker
+
+or REPORTS_INLINE_WORKER=1 to run it inside the API process (dev).
+
+    REPORT_JOB_CONCURRENCY   reports built at once per process (default 2)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+import zipfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+import anyio
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.jobs import JobRunner, SessionFactory, serve
+from app.models import Report
+from app.reports.builder import last_event, load_summary, sections, write_csv, write_html
+from app.storage import STORAGE_CHUNK_SIZE, get_storage
+from app.storage.base import StorageBackend
+
+REPORT_JOB_CONCURRENCY: int = int(os.getenv("REPORT_JOB_CONCURRENCY", 2))
+REPORTS_INLINE_WORKER: bool = os.getenv("REPORTS_INLINE_WORKER", "0").lower() in {"1", "true", "yes", "on"}
+
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "zip": "application/zip"}
+
+log = logging.getLogger(__name__)
+
+
+def _writer(f: BinaryIO):
+    async def write(text: str) -> None:
+        await anyio.to_thread.run_sync(f.write, text.encode())
+    return write
+
+
+async def _read(f: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await anyio.to_thread.run_sync(f.read, STORAGE_CHUNK_SIZE):
+        yield chunk
+
+
+async def render(session, report: Report, summary: dict, out: BinaryIO) -> None:
+    report_sections = sections(report.scope, report.scope_id)
+    if report.format == "html":
+        await write_html(session, summary, report_sections, _writer(out))
+        return
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("report.html", "w", force_zip64=True) as entry:
+            await write_html(session, summary, report_sections, _writer(entry))
+        for section in report_sections:
+            with archive.open(section.filename, "w", force_zip64=True) as entry:
+                await write_csv(session, section, _writer(entry))
+
+
+class ReportBuilder:
+    """`JobRunner` handler for `Report` rows."""
+
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        self.storage = storage or get_storage()
+
+    async def __call__(self, session: AsyncSession, report: Report) -> None:
+        # Read the stamp before the data: if rows change mid-build the stamp
+        # is already stale and the next request simply rebuilds.
+        report.version, summary = await load_summary(session, report.scope, report.scope_id)
+        report.events_through = await last_event(session, report.scope, report.scope_id)
+        key = f"reports/{report.scope}/{report.scope_id}/{report.version}-{report.id}.{report.format}"
+        with tempfile.TemporaryFile() as out:
+            await render(session, report, summary, out)
+            await anyio.to_thread.run_sync(out.seek, 0)
+            stored = await self.storage.put_stream(key, _read(out))
+        report.key, report.size, report.sha256 = stored.key, stored.size, stored.sha256
+
+        superseded = (await session.exec(
+            select(Report).where(Report.scope == report.scope, Report.scope_id == report.scope_id,
+                                 Report.format == report.format, Report.status == "done",
+                                 Report.id != report.id)
+        )).all()
+        for old in superseded:
+            await self.storage.delete(old.key)
+            await session.delete(old)
+        log.info("Report %s (%s %s v%s): %d bytes", report.id, report.scope, report.scope_id,
+                 report.version, stored.size)
+
+
+def build_runner(session_factory: Optional[SessionFactory] = None, **builder_kw) -> JobRunner:
+    return JobRunner(Report, ReportBuilder(**builder_kw),
+                     concurrency=REPORT_JOB_CONCURRENCY, session_factory=session_factory)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(build_runner()))
@@ -0,0 +1,8 @@
+"""Full-text search over policy titles, gap descriptions and task titles.
+
+Postgres: a generated `search_vector tsvector` column plus GIN index on each
+table (kept current by the database itself), and a pg_trgm GIN index on the
+same text so typos still match. SQLite: FTS5 external-content tables kept in
+step by triggers. Both are created by `app.search.schema` and the matching
+Alembic migration.
+"""
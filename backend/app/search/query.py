@@ -0,0 +1,113 @@
+"""Dialect-specific search statements.
+
+`hits()` returns `(kind, id, rank)` rows for one table – higher rank is
+better – and is UNIONed across tables by the endpoint. `scope(table)` adds
+a filter on the content table (the caller's tenant). Highlighting runs
+only for the page being returned, never for every match.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, Table, column, func, literal, literal_column, or_, select, table, true
+from sqlalchemy.sql import ColumnElement
+
+from app.models import Gap, Policy, Task
+from app.search.schema import SEARCHABLE
+
+TABLES = {"policy": Policy.__table__, "gap": Gap.__table__, "task": Task.__table__}
+
+_WORD = re.compile(r"\w+")
+MAX_TERMS = 8
+
+Scope = Optional[Callable[[Table], ColumnElement]]
+
+# Control characters as highlight markers: the text is HTML-escaped before
+# they become <mark> tags, so stored content can never inject markup.
+_OPEN, _CLOSE = "\x02", "\x03"
+
+
+def terms(q: str) -> List[str]:
+    return _WORD.findall(q.lower())[:MAX_TERMS]
+
+
+def marked(snippet: str) -> str:
+    return html.escape(snippet).replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+class PostgresSearch:
+    """tsvector @@ prefix tsquery, OR pg_trgm similarity; ranked by both."""
+
+    HEADLINE = f"StartSel={_OPEN}, StopSel={_CLOSE}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+    def _parts(self, kind: str, words: List[str]):
+        t = TABLES[kind]
+        query = func.to_tsquery("english", " & ".join(f"{w}:*" for w in words))
+        return t, t.c[SEARCHABLE[kind]], literal_column(f"{t.name}.search_vector"), query
+
+    def hits(self, kind: str, words: List[str], raw: str, scope: Scope = None) -> Select:
+        t, text_col, vector, query = self._parts(kind, words)
+        rank = func.ts_rank_cd(vector, query) + func.similarity(text_col, raw)
+        return (
+            select(literal(kind).label("kind"), t.c.id.label("id"), rank.label("rank"))
+            .where(or_(vector.op("@@")(query), text_col.op("%")(raw)))
+            .where(scope(t) if scope else true())
+        )
+
+    def snippets(self, kind: str, words: List[str], raw: str, ids: List[int]) -> Select:
+        t, text_col, _, query = self._parts(kind, words)
+        return select(t.c.id, text_col, func.ts_headline("english", text_col, query, self.HEADLINE)) \
+            .where(t.c.id.in_(ids))
+
+
+class SqliteSearch:
+    """FTS5 prefix match, ranked by bm25."""
+
+    def _parts(self, kind: str, words: List[str]):
+        name = f"{TABLES[kind].name}_fts"
+        fts = table(name, column("rowid"))
+        match = " ".join(f'"{w}"*' for w in words)
+        return fts, literal_column(name), match
+
+    def hits(self, kind: str, words: List[str], raw: str, scope: Scope = None) -> Select:
+        fts, ref, match = self._parts(kind, words)
+        stmt = (
+            select(literal(kind).label("kind"), fts.c.rowid.label("id"), (-func.bm25(ref)).label("rank"))
+            .select_from(fts)
+            .where(ref.op("MATCH")(match))
+        )
+        if scope is None:
+            return stmt
+        # The FTS table only holds text: filter through its content table.
+        t = TABLES[kind]
+        return stmt.join(t, t.c.id == fts.c.rowid).where(scope(t))
+
+    def snippets(self, kind: str, words: List[str], raw: str, ids: List[int]) -> Select:
+        fts, ref, match = self._parts(kind, words)
+        t = TABLES[kind]
+        return (
+            select(t.c.id, t.c[SEARCHABLE[kind]], func.snippet(ref, 0, _OPEN, _CLOSE, "…", 24))
+            .select_from(fts.join(t, t.c.id == fts.c.rowid))
+            .where(ref.op("MATCH")(match), fts.c.rowid.in_(ids))
+        )
+
+
+def backend_for(dialect: str):
+    if dialect == "postgresql":
+        return PostgresSearch()
+    if dialect == "sqlite":
+        return SqliteSearch()
+    raise NotImplementedError(f"Search is not available on {dialect}")
+
+
+async def snippets(session, backend, words: List[str], raw: str,
+                   ids_by_kind: Dict[str, List[int]]) -> Dict[Tuple[str, int], Tuple[str, str]]:
+    """{(kind, id): (text, highlighted html)} for the rows on one page."""
+    out: Dict[Tuple[str, int], Tuple[str, str]] = {}
+    for kind, ids in ids_by_kind.items():
+        for id_, text_value, snippet in (await session.exec(backend.snippets(kind, words, raw, ids))).all():
+            out[(kind, id_)] = (text_value, marked(snippet or text_value))
+    return out
@@ -0,0 +1,56 @@
+"""Search DDL, run after `metadata.create_all` (dev/tests) – migrations
+carry the same statements for deployed databases. Everything is idempotent.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, text
+from sqlmodel import SQLModel
+
+# table → searched text column
+SEARCHABLE = {"policy": "title", "gap": "description", "task": "title"}
+
+
+def postgres_ddl() -> list[str]:
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for table, col in SEARCHABLE.items():
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('english', coalesce({col}, ''))) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{col}_trgm ON {table} USING gin ({col} gin_trgm_ops)",
+        ]
+    return statements
+
+
+def sqlite_ddl() -> list[str]:
+    statements = []
+    for table, col in SEARCHABLE.items():
+        fts = f"{table}_fts"
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{col}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col}); "
+            f"INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col}); END",
+        ]
+    return statements
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_search_schema(metadata, connection, **kw) -> None:
+    name = connection.dialect.name
+    statements = postgres_ddl() if name == "postgresql" else sqlite_ddl() if name == "sqlite" else []
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def _drop_search_schema(metadata, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for table in SEARCHABLE:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}_fts"))
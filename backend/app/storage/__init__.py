@@ -0,0 +1,40 @@
+"""Pluggable object storage for policy documents and evidence files.
+
+Config (env):
+
+    STORAGE_BACKEND           local | s3                  (default local)
+    STORAGE_LOCAL_ROOT        directory for `local`        (default ./storage)
+    S3_BUCKET / S3_ENDPOINT_URL / S3_REGION / S3_PART_SIZE  for `s3`
+    STORAGE_CHUNK_SIZE        bytes per streamed chunk     (default 1 MiB)
+    STORAGE_MAX_UPLOAD_BYTES  reject larger bodies with 413 (default 2 GiB)
+"""
+
+import os
+
+from .base import ObjectNotFound, PartTooLarge, StorageBackend, StoredObject, StoredPart, rechunk
+
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_LOCAL_ROOT: str = os.getenv("STORAGE_LOCAL_ROOT", "./storage")
+STORAGE_CHUNK_SIZE: int = int(os.getenv("STORAGE_CHUNK_SIZE", 1024 * 1024))
+STORAGE_MAX_UPLOAD_BYTES: int = int(os.getenv("STORAGE_MAX_UPLOAD_BYTES", 2 * 1024 ** 3))
+
+_storage: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    """Process-wide backend (also usable as a FastAPI dependency)."""
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "s3":
+            from .s3 import S3Storage
+            _storage = S3Storage.from_env()
+        else:
+            from .local import LocalStorage
+            _storage = LocalStorage(STORAGE_LOCAL_ROOT)
+    return _storage
+
+
+__all__ = [
+    "ObjectNotFound", "PartTooLarge", "StorageBackend", "StoredObject", "StoredPart",
+    "get_storage", "rechunk",
+]
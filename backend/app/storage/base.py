@@ -0,0 +1,110 @@
+"""Storage backend interface shared by every implementation.
+
+All methods are async and move data as iterators of bytes chunks, so no
+caller ever needs to hold a whole object in memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Sequence
+
+
+class ObjectNotFound(Exception):
+    """Raised when a key (or multipart upload) does not exist."""
+
+
+class PartTooLarge(Exception):
+    """Raised when one multipart part exceeds what the backend accepts."""
+
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    sha256: str
+
+
+@dataclass
+class StoredPart:
+    part_number: int
+    size: int
+    sha256: str
+
+
+class HashingCounter:
+    """Running SHA-256 + byte count over a stream as it passes through."""
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    async def wrap(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            self._hash.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    @property
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+async def rechunk(chunks: AsyncIterator[bytes], size: int) -> AsyncIterator[bytes]:
+    """Re-slice an arbitrary byte stream into `size`-byte blocks (last may be short)."""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class StorageBackend(ABC):
+    """Object store addressed by string keys (`evidence/12/ab34…`)."""
+
+    @abstractmethod
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> StoredObject:
+        """Write `chunks` to `key`, returning its size and SHA-256."""
+
+    @abstractmethod
+    def open_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield bytes `start..end` (inclusive; `end=None` → to EOF)."""
+
+    @abstractmethod
+    async def size(self, key: str) -> int:
+        """Object size in bytes; raises `ObjectNotFound`."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    async def move(self, src: str, dst: str) -> None:
+        """Rename an object. Backends override this with a server-side move."""
+        await self.put_stream(dst, self.open_range(src))
+        await self.delete(src)
+
+    # --- resumable multipart uploads --------------------------------------
+
+    @abstractmethod
+    async def create_multipart(self, key: str) -> str:
+        """Start a multipart upload for `key`; returns a backend upload id."""
+
+    @abstractmethod
+    async def upload_part(self, key: str, upload_id: str, part_number: int,
+                          chunks: AsyncIterator[bytes]) -> StoredPart:
+        """Store (or overwrite) one part; parts are numbered from 1."""
+
+    @abstractmethod
+    async def complete_multipart(self, key: str, upload_id: str,
+                                 part_numbers: Sequence[int]) -> StoredObject:
+        """Assemble the parts in order into `key`."""
+
+    @abstractmethod
+    async def abort_multipart(self, key: str, upload_id: str) -> None: ...
@@ -0,0 +1,94 @@
+"""Content-addressed, reference-counted evidence blobs.
+
+Evidence bytes are stored once per SHA-256 under
+`blobs/ab/cd/<sha256>-<generation>`; each `Evidence` row holds one
+reference. The generation suffix is new every time a blob row is created,
+so deleting a dead blob's object after commit can never hit the object of
+a blob re-created from the same bytes in the meantime. Attaching bytes that already exist
+is a single UPDATE (plus dropping the staged copy), and a blob's object is
+only deleted when its last reference goes – by the caller, after commit.
+
+None of these helpers commit – they run inside the caller's transaction.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import Blob
+from .base import StorageBackend, StoredObject
+
+
+def blob_key(sha256: str) -> str:
+    return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}-{uuid.uuid4().hex[:12]}"
+
+
+async def add_reference(session, sha256: str) -> Optional[Blob]:
+    """Take a reference on an existing blob; `None` if the hash is unknown."""
+    result = await session.execute(
+        update(Blob)
+        .where(Blob.sha256 == sha256, Blob.refcount > 0)
+        .values(refcount=Blob.refcount + 1)
+        .returning(Blob.key, Blob.size)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return Blob(sha256=sha256, key=row.key, size=row.size)
+
+
+async def ingest(session, storage: StorageBackend, staged: StoredObject) -> Blob:
+    """Turn a freshly staged upload into a blob reference.
+
+    Known hash → the staged copy is dropped. New hash → the staged object
+    is moved (renamed, not re-written) to its content address.
+    """
+    blob = await add_reference(session, staged.sha256)
+    if blob is not None:
+        await storage.delete(staged.key)
+        return blob
+
+    blob = Blob(sha256=staged.sha256, key=blob_key(staged.sha256), size=staged.size, refcount=1)
+    await storage.move(staged.key, blob.key)
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(session.get_bind().dialect.name)
+    if dialect is None:
+        session.add(blob)
+        await session.flush()
+        return blob
+    # A concurrent first upload of the same bytes may insert first: count both.
+    stmt = dialect.insert(Blob).values(**blob.model_dump())
+    key = (await session.execute(stmt.on_conflict_do_update(
+        index_elements=["sha256"], set_={"refcount": Blob.refcount + 1},
+    ).returning(Blob.key))).scalar_one()
+    if key != blob.key:                 # theirs won; our copy is referenced by nobody
+        await storage.delete(blob.key)
+        blob.key = key
+    return blob
+
+
+async def release(session, sha256: str) -> Optional[list[str]]:
+    """Drop one reference; delete the blob row when none remain.
+
+    The decrement row-locks the blob until commit, so a concurrent
+    `add_reference` cannot resurrect it meanwhile. Returns the object keys
+    to delete *once the transaction has committed* (empty while other
+    references remain), or None if no blob exists for `sha256`
+    (pre-dedup evidence).
+    """
+    result = await session.execute(
+        update(Blob)
+        .where(Blob.sha256 == sha256)
+        .values(refcount=Blob.refcount - 1)
+        .returning(Blob.refcount, Blob.key)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    if row.refcount > 0:
+        return []
+    await session.execute(delete(Blob).where(Blob.sha256 == sha256))
+    return [row.key]
@@ -0,0 +1,121 @@
+"""Local-filesystem storage backend (dev, tests, single-node installs)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional, Sequence
+
+import anyio
+
+from .base import HashingCounter, ObjectNotFound, StorageBackend, StoredObject, StoredPart
+
+READ_CHUNK = 1024 * 1024
+
+
+class LocalStorage(StorageBackend):
+    """Objects live at `<root>/<key>`; multipart parts under `<root>/.uploads/`."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return path
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self._path(f".uploads/{upload_id}")
+
+    async def _write(self, path: Path, chunks: AsyncIterator[bytes]) -> HashingCounter:
+        """Stream into a temp file next to `path`, then atomically rename."""
+        await anyio.Path(path.parent).mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        counter = HashingCounter()
+        try:
+            async with await anyio.open_file(tmp, "wb") as f:
+                async for chunk in counter.wrap(chunks):
+                    await f.write(chunk)
+            await anyio.to_thread.run_sync(os.replace, tmp, path)
+        except BaseException:
+            await anyio.Path(tmp).unlink(missing_ok=True)
+            raise
+        return counter
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> StoredObject:
+        counter = await self._write(self._path(key), chunks)
+        return StoredObject(key=key, size=counter.size, sha256=counter.hexdigest)
+
+    async def open_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        if not path.is_file():
+            raise ObjectNotFound(key)
+        remaining = None if end is None else end - start + 1
+        async with await anyio.open_file(path, "rb") as f:
+            await f.seek(start)
+            while remaining is None or remaining > 0:
+                n = READ_CHUNK if remaining is None else min(READ_CHUNK, remaining)
+                chunk = await f.read(n)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def size(self, key: str) -> int:
+        try:
+            return (await anyio.Path(self._path(key)).stat()).st_size
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+
+    async def exists(self, key: str) -> bool:
+        return await anyio.Path(self._path(key)).is_file()
+
+    async def delete(self, key: str) -> None:
+        await anyio.Path(self._path(key)).unlink(missing_ok=True)
+
+    async def move(self, src: str, dst: str) -> None:
+        source, target = self._path(src), self._path(dst)
+        if not source.is_file():
+            raise ObjectNotFound(src)
+        await anyio.Path(target.parent).mkdir(parents=True, exist_ok=True)
+        await anyio.to_thread.run_sync(os.replace, source, target)
+
+    # --- resumable multipart uploads --------------------------------------
+
+    async def create_multipart(self, key: str) -> str:
+        upload_id = uuid.uuid4().hex
+        await anyio.Path(self._upload_dir(upload_id)).mkdir(parents=True)
+        return upload_id
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int,
+                          chunks: AsyncIterator[bytes]) -> StoredPart:
+        directory = self._upload_dir(upload_id)
+        if not directory.is_dir():
+            raise ObjectNotFound(upload_id)
+        counter = await self._write(directory / f"{part_number:05d}", chunks)
+        return StoredPart(part_number=part_number, size=counter.size, sha256=counter.hexdigest)
+
+    async def complete_multipart(self, key: str, upload_id: str,
+                                 part_numbers: Sequence[int]) -> StoredObject:
+        directory = self._upload_dir(upload_id)
+        if not directory.is_dir():
+            raise ObjectNotFound(upload_id)
+
+        async def parts() -> AsyncIterator[bytes]:
+            for n in part_numbers:
+                async for chunk in self.open_range(f".uploads/{upload_id}/{n:05d}"):
+                    yield chunk
+
+        stored = await self.put_stream(key, parts())
+        await self.abort_multipart(key, upload_id)
+        return stored
+
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        await anyio.to_thread.run_sync(
+            lambda: shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+        )
@@ -0,0 +1,150 @@
+"""S3-compatible storage backend (AWS S3, MinIO, …).
+
+Wraps a boto3-style client; every call runs in a worker thread. Only one
+part (S3_PART_SIZE, ≥ 5 MiB) is ever buffered in memory, even for
+`put_stream`, which goes through a multipart upload once the object is
+larger than a single part.
+
+boto3 is optional – it is only imported by `S3Storage.from_env()`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, AsyncIterator, Optional, Sequence
+
+import anyio
+
+from .base import HashingCounter, ObjectNotFound, PartTooLarge, StorageBackend, StoredObject, StoredPart, rechunk
+
+S3_PART_SIZE: int = int(os.getenv("S3_PART_SIZE", 8 * 1024 * 1024))
+READ_CHUNK = 1024 * 1024
+
+
+def _is_missing(exc: Exception) -> bool:
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+    return code in {"404", "NoSuchKey", "NoSuchUpload", "NotFound"}
+
+
+class S3Storage(StorageBackend):
+    def __init__(self, client: Any, bucket: str, part_size: int = S3_PART_SIZE):
+        self.client = client
+        self.bucket = bucket
+        self.part_size = part_size
+
+    @classmethod
+    def from_env(cls) -> "S3Storage":
+        import boto3
+
+        client = boto3.client(
+            "s3",
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,   # MinIO
+            region_name=os.getenv("S3_REGION") or None,
+        )
+        return cls(client, os.environ["S3_BUCKET"])
+
+    async def _call(self, method: str, **kwargs: Any) -> Any:
+        fn = getattr(self.client, method)
+        try:
+            return await anyio.to_thread.run_sync(lambda: fn(Bucket=self.bucket, **kwargs))
+        except Exception as exc:
+            if _is_missing(exc):
+                raise ObjectNotFound(kwargs.get("UploadId") or kwargs.get("Key")) from exc
+            raise
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> StoredObject:
+        counter = HashingCounter()
+        parts = rechunk(counter.wrap(chunks), self.part_size)
+        first = await anext(parts, b"")
+        second = await anext(parts, None)
+        if second is None:                          # fits in one request
+            await self._call("put_object", Key=key, Body=first)
+            return StoredObject(key=key, size=counter.size, sha256=counter.hexdigest)
+
+        upload_id = await self.create_multipart(key)
+        try:
+            number = 0
+            for body in (first, second):
+                number += 1
+                await self._put_part(key, upload_id, number, body)
+            async for body in parts:
+                number += 1
+                await self._put_part(key, upload_id, number, body)
+            await self._finish(key, upload_id)
+        except BaseException:
+            await self.abort_multipart(key, upload_id)
+            raise
+        return StoredObject(key=key, size=counter.size, sha256=counter.hexdigest)
+
+    async def open_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = (await self._call("get_object", Key=key, Range=byte_range))["Body"]
+        try:
+            while chunk := await anyio.to_thread.run_sync(body.read, READ_CHUNK):
+                yield chunk
+        finally:
+            body.close()
+
+    async def size(self, key: str) -> int:
+        return (await self._call("head_object", Key=key))["ContentLength"]
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self.size(key)
+            return True
+        except ObjectNotFound:
+            return False
+
+    async def delete(self, key: str) -> None:
+        await self._call("delete_object", Key=key)
+
+    async def move(self, src: str, dst: str) -> None:
+        # Server-side copy: the bytes never come back through this process.
+        await self._call("copy_object", Key=dst, CopySource={"Bucket": self.bucket, "Key": src})
+        await self.delete(src)
+
+    # --- resumable multipart uploads --------------------------------------
+
+    async def create_multipart(self, key: str) -> str:
+        return (await self._call("create_multipart_upload", Key=key))["UploadId"]
+
+    async def _put_part(self, key: str, upload_id: str, number: int, body: bytes) -> None:
+        await self._call("upload_part", Key=key, UploadId=upload_id, PartNumber=number, Body=body)
+
+    async def upload_part(self, key: str, upload_id: str, part_number: int,
+                          chunks: AsyncIterator[bytes]) -> StoredPart:
+        # S3 needs a Content-Length per part, so one part is buffered.
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > self.part_size:
+                raise PartTooLarge(f"Part exceeds {self.part_size} bytes")
+        await self._put_part(key, upload_id, part_number, bytes(body))
+        return StoredPart(part_number=part_number, size=len(body),
+                          sha256=hashlib.sha256(body).hexdigest())
+
+    async def _finish(self, key: str, upload_id: str,
+                      part_numbers: Optional[Sequence[int]] = None) -> None:
+        listed = (await self._call("list_parts", Key=key, UploadId=upload_id)).get("Parts", [])
+        etags = {p["PartNumber"]: p["ETag"] for p in listed}
+        numbers = part_numbers or sorted(etags)
+        await self._call(
+            "complete_multipart_upload", Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": n, "ETag": etags[n]} for n in numbers]},
+        )
+
+    async def complete_multipart(self, key: str, upload_id: str,
+                                 part_numbers: Sequence[int]) -> StoredObject:
+        await self._finish(key, upload_id, part_numbers)
+        # Parts may have arrived from different workers; hash the result once.
+        counter = HashingCounter()
+        async for _ in counter.wrap(self.open_range(key)):
+            pass
+        return StoredObject(key=key, size=counter.size, sha256=counter.hexdigest)
+
+    async def abort_multipart(self, key: str, upload_id: str) -> None:
+        try:
+            await self._call("abort_multipart_upload", Key=key, UploadId=upload_id)
+        except ObjectNotFound:
+            pass
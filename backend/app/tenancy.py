@@ -0,0 +1,167 @@
+"""Tenant-scoped sessions.
+
+A session becomes tenant-scoped once `scope(session, tenant_id)` has run –
+every /api/v1 request does this via the `tenant_session` dependency, right
+after authentication. From then on:
+
+✓ every ORM read (select, get, relationship loads, ORM update/delete) of a
+  `TenantScoped` model gets `tenant_id = :tenant` added, so handlers need no
+  tenant filters of their own and a row id from another tenant is a 404;
+✓ new `TenantScoped` rows are stamped with the tenant on flush; writing a
+  row that belongs to another tenant raises;
+✓ on Postgres with TENANT_RLS=1, `app.tenant_id` is set for each
+  transaction so the row-level-security policies (see the migrations)
+  enforce the same rule in the database: unset or '' only for unscoped
+  sessions, NO_TENANT for a session scoped to rows without a tenant.
+
+Core statements on `Model.__table__` bypass the ORM: add `tenant_clause()`.
+Unscoped sessions (workers, CLI, migrations) see every tenant; rows written
+there inherit the tenant of their parent row.
+
+    TENANT_RLS   1/0 – set app.tenant_id per transaction, Postgres only (default 0)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Depends
+from sqlalchemy import event, text, true
+from sqlalchemy.orm import Session, with_loader_criteria
+from sqlmodel import SQLModel
+
+from app.auth.dependencies import get_current_user
+from app.db import _env_flag, get_async_session
+from app.models import Evidence, Gap, Policy, Task, TenantScoped, User
+
+TENANT_RLS: bool = _env_flag("TENANT_RLS", False)
+
+_KEY = "tenant_id"
+NO_TENANT = "none"          # app.tenant_id for scope(None): never '' – that means "unscoped"
+
+# model → (relationship to its parent, parent model, foreign-key attribute)
+_PARENTS = {
+    Policy: ("owner", User, "owner_id"),
+    Gap: ("policy", Policy, "policy_id"),
+    Task: ("gap", Gap, "gap_id"),
+    Evidence: ("task", Task, "task_id"),
+}
+
+
+class CrossTenantWrite(Exception):
+    """A scoped session tried to write a row that belongs to another tenant."""
+
+
+def _sync(session: Any) -> Session:
+    # AsyncSession and ThreadedSession both wrap a sync Session.
+    return getattr(session, "sync_session", session)
+
+
+def is_scoped(session: Any) -> bool:
+    return _KEY in _sync(session).info
+
+
+def current_tenant(session: Any) -> Optional[int]:
+    return _sync(session).info.get(_KEY)
+
+
+def tenant_clause(table: Any, session: Any):
+    """`table.tenant_id = <tenant>` for Core statements in a scoped session (else TRUE)."""
+    if not is_scoped(session):
+        return true()
+    tenant_id = current_tenant(session)
+    return table.c.tenant_id.is_(None) if tenant_id is None else table.c.tenant_id == tenant_id
+
+
+def _set_rls(connection: Any, tenant_id: Optional[int]) -> None:
+    connection.execute(text("SELECT set_config('app.tenant_id', :tenant, true)"),
+                       {"tenant": NO_TENANT if tenant_id is None else str(tenant_id)})
+
+
+async def scope(session: Any, tenant_id: Optional[int]) -> None:
+    """Confine `session` to `tenant_id` (None = rows that have no tenant)."""
+    _sync(session).info[_KEY] = tenant_id
+    if TENANT_RLS and session.get_bind().dialect.name == "postgresql":
+        # Authentication may already have opened this transaction.
+        await session.run_sync(lambda s: _set_rls(s.connection(), tenant_id))
+
+
+async def tenant_session(
+    user: User = Depends(get_current_user),
+    session=Depends(get_async_session),
+):
+    """The request's session, scoped to the caller's organization."""
+    await scope(session, user.tenant_id)
+    _sync(session).info["actor"] = user.id          # attributed in the task history
+    return session
+
+# ---------------------------------------------------------------------------
+# Session hooks --------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_reads(state) -> None:
+    info = state.session.info
+    if _KEY not in info or state.is_column_load or state.is_relationship_load:
+        return                      # relationship/column loads inherit the criteria below
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    tenant_id = info[_KEY]
+    state.statement = state.statement.options(*(
+        with_loader_criteria(
+            model,
+            model.tenant_id.is_(None) if tenant_id is None else model.tenant_id == tenant_id,
+            include_aliases=True,
+        )
+        for model in _scoped_models()
+    ))
+
+
+@lru_cache(maxsize=1)
+def _scoped_models() -> tuple[type, ...]:
+    # The mixin itself has no mapped column, so criteria go on each table model.
+    return tuple(m.class_ for m in SQLModel._sa_registry.mappers if issubclass(m.class_, TenantScoped))
+
+
+def _parent_tenant(session: Session, obj: Any) -> Optional[int]:
+    relation, parent_model, fk = _PARENTS.get(type(obj), (None, None, None))
+    if relation is None:
+        return None
+    parent = obj.__dict__.get(relation)                  # set but not yet flushed
+    if parent is None and getattr(obj, fk) is not None:
+        with session.no_autoflush:
+            parent = session.get(parent_model, getattr(obj, fk))
+    if parent is None:
+        return None
+    if parent.tenant_id is None and parent in session.new:
+        parent.tenant_id = _parent_tenant(session, parent)
+    return parent.tenant_id
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_tenant(session: Session, flush_context, instances) -> None:
+    scoped = _KEY in session.info
+    tenant_id = session.info.get(_KEY)
+    for obj in session.new:
+        if not isinstance(obj, TenantScoped):
+            continue
+        if scoped:
+            if obj.tenant_id is None:
+                obj.tenant_id = tenant_id
+            elif obj.tenant_id != tenant_id:
+                raise CrossTenantWrite(f"{type(obj).__name__} belongs to tenant {obj.tenant_id}, "
+                                       f"session is scoped to {tenant_id}")
+        elif obj.tenant_id is None:
+            obj.tenant_id = _parent_tenant(session, obj)
+    if scoped:
+        for obj in session.dirty:
+            if isinstance(obj, TenantScoped) and obj.tenant_id != tenant_id:
+                raise CrossTenantWrite(f"{type(obj).__name__} {getattr(obj, 'id', '')} moved out of "
+                                       f"tenant {tenant_id}")
+
+
+@event.listens_for(Session, "after_begin")
+def _begin_rls(session: Session, transaction, connection) -> None:
+    if TENANT_RLS and _KEY in session.info and connection.dialect.name == "postgresql":
+        _set_rls(connection, session.info[_KEY])
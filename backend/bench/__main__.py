@@ -0,0 +1,115 @@
+"""Command-line entry point: `python -m bench --help`."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+
+def _parse(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark the API's hot paths.")
+    parser.add_argument("--database", default="sqlite",
+                        help="'sqlite' (fresh temp file) or a DATABASE_URL to seed, e.g. a local Postgres")
+    parser.add_argument("--reset", action="store_true",
+                        help="drop and recreate every table first (required for a non-sqlite --database)")
+    parser.add_argument("--base-url", help="drive a running server instead of the app in-process")
+    parser.add_argument("--endpoints", default="login,me,policies,gaps,tasks,dashboard,scores,search",
+                        help="comma-separated scenarios")
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--policies", type=int, default=5, help="per tenant")
+    parser.add_argument("--gaps", type=int, default=4, help="per policy")
+    parser.add_argument("--tasks", type=int, default=2, help="per gap")
+    parser.add_argument("--evidence", type=int, default=1, help="per task")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds discarded per scenario")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed p95 growth / RPS drop vs the baseline (default 0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse(argv)
+    if args.database == "sqlite":
+        database_url = f"sqlite:///{Path(tempfile.mkdtemp(prefix='bench-')) / 'bench.db'}"
+    elif not args.reset:
+        sys.exit("refusing to seed an existing database without --reset (it drops every table)")
+    else:
+        database_url = args.database
+
+    # The app reads its config at import time: settle it first.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("DB_ECHO", "0")
+    os.environ.setdefault("METRICS_ENABLED", "0")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")     # measure the endpoints, not 429s
+
+    from sqlmodel import SQLModel
+
+    from app.db import engine
+    from app.main import app
+    from .load import SCENARIOS, compare, run
+    from .seed import Scale, seed
+
+    unknown = set(args.endpoints.split(",")) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"unknown endpoints: {', '.join(sorted(unknown))} (have {', '.join(SCENARIOS)})")
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    scale = Scale(args.tenants, args.policies, args.gaps, args.tasks, args.evidence)
+    seeded = seed(engine, scale)
+    print(f"seeded {seeded.counts} into {engine.url.render_as_string(hide_password=True)}", file=sys.stderr)
+
+    scenarios = [SCENARIOS[name] for name in args.endpoints.split(",")]
+    started_at = datetime.utcnow()
+    endpoints = asyncio.run(run(scenarios, seeded, app=app, base_url=args.base_url,
+                                concurrency=args.concurrency, duration=args.duration, warmup=args.warmup))
+    results = {
+        "meta": {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "database": engine.dialect.name,
+            "target": args.base_url or "in-process",
+            "python": platform.python_version(),
+            "scale": asdict(scale),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+        },
+        "endpoints": endpoints,
+    }
+
+    print(f"{'endpoint':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in endpoints.items():
+        print(f"{name:<12}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        problems = compare(json.loads(args.baseline.read_text()), results, args.threshold)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Closed-loop load generator and result bookkeeping.
+
+Each scenario is driven by `concurrency` workers that issue requests back to
+back for `duration` seconds. Requests go through `httpx` – in-process via
+`ASGITransport` (no server, no network) or to a live `base_url`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.auth.security import create_access_token
+
+from .seed import PASSWORD, Seeded
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # (owner index, rng) → (path, extra httpx kwargs)
+    request: Callable[[int, random.Random, Seeded], tuple[str, dict[str, Any]]]
+    auth: bool = True
+
+
+def _get(path: str) -> Callable[[int, random.Random, Seeded], tuple[str, dict[str, Any]]]:
+    return lambda i, rnd, seeded: (path.format(owner=seeded.owner_ids[i]), {})
+
+
+SCENARIOS: dict[str, Scenario] = {s.name: s for s in [
+    Scenario("login", "POST", lambda i, rnd, seeded: (
+        "/auth/login", {"data": {"username": seeded.emails[i], "password": PASSWORD}}), auth=False),
+    Scenario("me", "GET", _get("/me")),
+    Scenario("policies", "GET", _get("/api/v1/policies?owner_id={owner}")),
+    Scenario("gaps", "GET", _get("/api/v1/gaps?owner_id={owner}&severity=high")),
+    Scenario("tasks", "GET", _get("/api/v1/tasks?assigned_to={owner}&status=open")),
+    Scenario("dashboard", "GET", _get("/api/v1/dashboard")),
+    Scenario("scores", "GET", _get("/api/v1/scores/me")),
+    Scenario("search", "GET", lambda i, rnd, seeded: (
+        f"/api/v1/search?q={rnd.choice(['encryption', 'backup', 'vendor', 'retention'])}", {})),
+]}
+
+# ---------------------------------------------------------------------------
+# Statistics -----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)              # noqa: E731
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "max_ms": ms(ordered[-1]) if ordered else 0.0,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Regressions of `current` against `baseline` beyond `threshold` (0.2 = 20 %).
+
+    A scenario regresses when its p95 grows, or its throughput drops, by more
+    than the threshold; new errors always count. Scenarios missing from
+    either side are ignored.
+    """
+    problems = []
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            problems.append(f"{name}: p95 {before['p95_ms']} → {now['p95_ms']} ms")
+        if before["rps"] and now["rps"] < before["rps"] * (1 - threshold):
+            problems.append(f"{name}: {before['rps']} → {now['rps']} req/s")
+        if now["errors"] > before["errors"]:
+            problems.append(f"{name}: {before['errors']} → {now['errors']} errors")
+    return problems
+
+# ---------------------------------------------------------------------------
+# Driver ---------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, seeded: Seeded, *,
+                concurrency: int, duration: float, warmup: float = 0.0, seed: int = 1) -> dict[str, Any]:
+    """Run one scenario; latencies from the first `warmup` seconds are dropped."""
+    tokens = [create_access_token(subject=email) for email in seeded.emails]
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+    measure_from, deadline = start + warmup, start + warmup + duration
+
+    async def worker(n: int) -> None:
+        nonlocal errors
+        rnd = random.Random(seed * 1000 + n)
+        while (sent := time.perf_counter()) < deadline:
+            i = rnd.randrange(len(seeded.owner_ids))
+            path, kwargs = scenario.request(i, rnd, seeded)
+            headers = {"Authorization": f"Bearer {tokens[i]}"} if scenario.auth else {}
+            try:
+                response = await client.request(scenario.method, path, headers=headers, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if sent < measure_from:
+                continue
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - sent)
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - measure_from)
+
+
+async def run(scenarios: list[Scenario], seeded: Seeded, *, app: Any = None, base_url: Optional[str] = None,
+              concurrency: int = 8, duration: float = 10.0, warmup: float = 1.0) -> dict[str, dict]:
+    """Drive every scenario in turn against `app` (in-process) or `base_url`."""
+    transport = httpx.ASGITransport(app=app) if base_url is None else None
+    async with httpx.AsyncClient(transport=transport, base_url=base_url or "http://bench",
+                                 timeout=30) as client:
+        return {
+            scenario.name: await drive(client, scenario, seeded, concurrency=concurrency,
+                                       duration=duration, warmup=warmup)
+            for scenario in scenarios
+        }
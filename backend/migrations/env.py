@@ -30,6 +30,18 @@ from models import *
 
 target_metadata = SQLModel.metadata
 
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Hide the search schema (raw DDL, see app/search/schema.py) from autogenerate."""
+    if reflected and compare_to is None:
+        if type_ == "table" and (name.endswith("_fts") or "_fts_" in name):
+            return False
+        if type_ == "column" and name == "search_vector":
+            return False
+        if type_ == "index" and (name.endswith("_search_vector") or name.endswith("_trgm")):
+            return False
+    return True
+
 # ─── Migration modes ──────────────────────────────────────────────────────────
 def run_migrations_offline() -> None:
     """Run migrations without DB connection (generates SQL only)."""
@@ -37,6 +49,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -56,6 +69,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,37 @@
+"""add blob table
+
+Revision ID: 0079fdbec767
+Revises: 8197b9fbbb6f
+Create Date: 2026-10-18 14:21:05.388190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0079fdbec767'
+down_revision: Union[str, None] = '8197b9fbbb6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'blob',
+        sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('refcount', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('blob')
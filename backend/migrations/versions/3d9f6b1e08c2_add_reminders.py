@@ -0,0 +1,61 @@
+"""add reminders
+
+Revision ID: 3d9f6b1e08c2
+Revises: e81b2f4c7a65
+Create Date: 2026-10-18 17:21:07.815204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9f6b1e08c2'
+down_revision: Union[str, None] = 'e81b2f4c7a65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reminder',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('due_date', sa.DateTime(), nullable=False),
+        sa.Column('recipient_id', sa.Integer(), nullable=True),
+        sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.ForeignKeyConstraint(['recipient_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['task_id'], ['task.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+    )
+    op.create_index('ix_reminder_status', 'reminder', ['status'])
+    op.create_index('ix_reminder_task_id', 'reminder', ['task_id'])
+    op.create_table(
+        'scheduler_state',
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduler_state')
+    op.drop_index('ix_reminder_task_id', table_name='reminder')
+    op.drop_index('ix_reminder_status', table_name='reminder')
+    op.drop_table('reminder')
@@ -0,0 +1,46 @@
+"""add list endpoint indexes
+
+Revision ID: 46da1cf733d2
+Revises: 902e7914a635
+Create Date: 2026-10-18 10:03:17.220914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '46da1cf733d2'
+down_revision: Union[str, None] = '902e7914a635'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) – mirrors `__table_args__` in app/models.py.
+INDEXES = [
+    ('ix_policy_created_at_id', 'policy', ['created_at', 'id']),
+    ('ix_policy_owner_id_created_at_id', 'policy', ['owner_id', 'created_at', 'id']),
+    ('ix_gap_created_at_id', 'gap', ['created_at', 'id']),
+    ('ix_gap_policy_id_created_at_id', 'gap', ['policy_id', 'created_at', 'id']),
+    ('ix_gap_severity_created_at_id', 'gap', ['severity', 'created_at', 'id']),
+    ('ix_task_created_at_id', 'task', ['created_at', 'id']),
+    ('ix_task_gap_id_created_at_id', 'task', ['gap_id', 'created_at', 'id']),
+    ('ix_task_assigned_to_created_at_id', 'task', ['assigned_to', 'created_at', 'id']),
+    ('ix_task_status_created_at_id', 'task', ['status', 'created_at', 'id']),
+    ('ix_task_due_date', 'task', ['due_date']),
+    ('ix_evidence_uploaded_at_id', 'evidence', ['uploaded_at', 'id']),
+    ('ix_evidence_task_id_uploaded_at_id', 'evidence', ['task_id', 'uploaded_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,50 @@
+"""add analysis_job table
+
+Revision ID: 5c1e7a9d2b40
+Revises: 0079fdbec767
+Create Date: 2026-10-18 15:02:44.117530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2b40'
+down_revision: Union[str, None] = '0079fdbec767'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'analysis_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('policy_id', sa.Integer(), nullable=False),
+        sa.Column('chunks_total', sa.Integer(), nullable=False),
+        sa.Column('chunks_done', sa.Integer(), nullable=False),
+        sa.Column('gaps_created', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.ForeignKeyConstraint(['policy_id'], ['policy.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_analysis_job_status', 'analysis_job', ['status'])
+    op.create_index('ix_analysis_job_policy_id', 'analysis_job', ['policy_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_analysis_job_policy_id', table_name='analysis_job')
+    op.drop_index('ix_analysis_job_status', table_name='analysis_job')
+    op.drop_table('analysis_job')
@@ -0,0 +1,73 @@
+"""add compliance score rollups
+
+Revision ID: 7858a8b6fbe8
+Revises: 46da1cf733d2
+Create Date: 2026-10-18 11:26:52.018733
+
+Backfill existing data after upgrading with:
+
+    python -m app.compliance.scores rebuild
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7858a8b6fbe8'
+down_revision: Union[str, None] = '46da1cf733d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'gap_score',
+        sa.Column('gap_id', sa.Integer(), nullable=False),
+        sa.Column('policy_id', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Integer(), nullable=False),
+        sa.Column('closed', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('gap_id'),
+    )
+    op.create_index(op.f('ix_gap_score_policy_id'), 'gap_score', ['policy_id'])
+
+    op.create_table(
+        'policy_score',
+        sa.Column('policy_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('total_weight', sa.Integer(), nullable=False),
+        sa.Column('closed_weight', sa.Integer(), nullable=False),
+        sa.Column('gap_count', sa.Integer(), nullable=False),
+        sa.Column('closed_gaps', sa.Integer(), nullable=False),
+        sa.Column('evidence_count', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('policy_id'),
+    )
+    op.create_index(op.f('ix_policy_score_owner_id'), 'policy_score', ['owner_id'])
+
+    op.create_table(
+        'owner_score',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('total_weight', sa.Integer(), nullable=False),
+        sa.Column('closed_weight', sa.Integer(), nullable=False),
+        sa.Column('gap_count', sa.Integer(), nullable=False),
+        sa.Column('closed_gaps', sa.Integer(), nullable=False),
+        sa.Column('evidence_count', sa.Integer(), nullable=False),
+        sa.Column('policy_count', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('owner_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('owner_score')
+    op.drop_index(op.f('ix_policy_score_owner_id'), table_name='policy_score')
+    op.drop_table('policy_score')
+    op.drop_index(op.f('ix_gap_score_policy_id'), table_name='gap_score')
+    op.drop_table('gap_score')
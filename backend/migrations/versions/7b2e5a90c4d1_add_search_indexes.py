@@ -0,0 +1,70 @@
+"""add search indexes
+
+Revision ID: 7b2e5a90c4d1
+Revises: 3d9f6b1e08c2
+Create Date: 2026-10-18 18:02:44.130592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e5a90c4d1'
+down_revision: Union[str, None] = '3d9f6b1e08c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in step with app/search/schema.py (migrations don't import the app).
+SEARCHABLE = {'policy': 'title', 'gap': 'description', 'task': 'title'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, col in SEARCHABLE.items():
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('english', coalesce({col}, ''))) STORED"
+            )
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)")
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{col}_trgm ON {table} USING gin ({col} gin_trgm_ops)")
+    elif dialect == 'sqlite':
+        for table, col in SEARCHABLE.items():
+            fts = f"{table}_fts"
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{col}, content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {col}) VALUES ('delete', old.id, old.{col}); "
+                f"INSERT INTO {fts}(rowid, {col}) VALUES (new.id, new.{col}); END"
+            )
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")   # index existing rows
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for table, col in SEARCHABLE.items():
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{col}_trgm")
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        for table in SEARCHABLE:
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
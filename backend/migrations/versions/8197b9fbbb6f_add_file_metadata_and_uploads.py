@@ -0,0 +1,74 @@
+"""add file metadata and uploads
+
+Revision ID: 8197b9fbbb6f
+Revises: 7858a8b6fbe8
+Create Date: 2026-10-18 13:08:44.671205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8197b9fbbb6f'
+down_revision: Union[str, None] = '7858a8b6fbe8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('policy') as batch_op:
+        batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    with op.batch_alter_table('evidence') as batch_op:
+        batch_op.add_column(sa.Column('filename', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    op.create_table(
+        'upload',
+        sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=False),
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('backend_upload_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('filename', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('content_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'upload_part',
+        sa.Column('upload_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('part_number', sa.Integer(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.ForeignKeyConstraint(['upload_id'], ['upload.id']),
+        sa.PrimaryKeyConstraint('upload_id', 'part_number'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('upload_part')
+    op.drop_table('upload')
+    with op.batch_alter_table('evidence') as batch_op:
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size')
+        batch_op.drop_column('filename')
+    with op.batch_alter_table('policy') as batch_op:
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size')
@@ -0,0 +1,37 @@
+"""add user profile columns
+
+Revision ID: 902e7914a635
+Revises: 72278e544804
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '902e7914a635'
+down_revision: Union[str, None] = '72278e544804'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # `app.models.User` and `app.auth.models.User` now share one table.
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('role', sqlmodel.sql.sqltypes.AutoString(),
+                                      nullable=False, server_default='owner'))
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(),
+                                      nullable=False, server_default=sa.func.now()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('created_at')
+        batch_op.drop_column('role')
+        batch_op.drop_column('name')
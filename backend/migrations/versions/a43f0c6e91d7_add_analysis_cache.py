@@ -0,0 +1,51 @@
+"""add analysis cache
+
+Revision ID: a43f0c6e91d7
+Revises: 5c1e7a9d2b40
+Create Date: 2026-10-18 15:47:19.602381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a43f0c6e91d7'
+down_revision: Union[str, None] = '5c1e7a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'analysis_cache',
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('model', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('prompt_version', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('findings', sa.JSON(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index('ix_analysis_cache_last_used_at', 'analysis_cache', ['last_used_at'])
+    with op.batch_alter_table('gap') as batch_op:
+        batch_op.add_column(sa.Column('source_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    with op.batch_alter_table('analysis_job') as batch_op:
+        batch_op.add_column(sa.Column('chunks_cached', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('gaps_removed', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('analysis_job') as batch_op:
+        batch_op.drop_column('gaps_removed')
+        batch_op.drop_column('chunks_cached')
+    with op.batch_alter_table('gap') as batch_op:
+        batch_op.drop_column('source_hash')
+    op.drop_index('ix_analysis_cache_last_used_at', table_name='analysis_cache')
+    op.drop_table('analysis_cache')
@@ -0,0 +1,52 @@
+"""rls no tenant sentinel
+
+Revision ID: a9d4e2f7c1b3
+Revises: b6e1c3a8d2f5
+Create Date: 2026-10-18 23:48:02.571903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e2f7c1b3'
+down_revision: Union[str, None] = 'b6e1c3a8d2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['user', 'policy', 'gap', 'task', 'evidence', 'upload', 'analysis_job', 'report', 'reminder',
+          'gap_score', 'policy_score', 'owner_score', 'task_event', 'task_snapshot']
+
+OLD_POLICY = (
+    "coalesce(current_setting('app.tenant_id', true), '') = '' "
+    "OR tenant_id = current_setting('app.tenant_id', true)::int"
+)
+# Matches app/tenancy.py: unset / '' = unscoped session (workers, migrations, login) sees
+# everything; 'none' (NO_TENANT) = a user without a tenant, who sees only untenanted rows.
+# CASE, not OR: Postgres may evaluate either side of an OR, and 'none'::int fails.
+POLICY = (
+    "CASE coalesce(current_setting('app.tenant_id', true), '') "
+    "WHEN '' THEN true "
+    "WHEN 'none' THEN tenant_id IS NULL "
+    "ELSE tenant_id = current_setting('app.tenant_id', true)::int END"
+)
+
+
+def _replace(policy: str) -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.execute(f'DROP POLICY IF EXISTS tenant_isolation ON "{table}"')
+        op.execute(f'CREATE POLICY tenant_isolation ON "{table}" USING ({policy}) WITH CHECK ({policy})')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace(POLICY)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace(OLD_POLICY)
@@ -0,0 +1,31 @@
+"""add report events_through
+
+Revision ID: b6e1c3a8d2f5
+Revises: f4b7d2c9a813
+Create Date: 2026-10-18 23:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1c3a8d2f5'
+down_revision: Union[str, None] = 'f4b7d2c9a813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing reports predate the history section: 0 makes them stale once any event exists.
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('events_through', sa.BigInteger(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.drop_column('events_through')
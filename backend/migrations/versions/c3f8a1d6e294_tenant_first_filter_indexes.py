@@ -0,0 +1,46 @@
+"""tenant first filter indexes
+
+Revision ID: c3f8a1d6e294
+Revises: a9d4e2f7c1b3
+Create Date: 2026-10-18 23:59:12.408316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e294'
+down_revision: Union[str, None] = 'a9d4e2f7c1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Low-cardinality filters lead with tenant_id; FK-led indexes (gap_id, policy_id,
+# owner_id, assigned_to, task_id) already name rows of a single tenant. ix_task_due_date
+# stays for the reminder scan, which spans every tenant.
+REPLACED = [
+    ('ix_gap_severity_created_at_id', 'gap', ['severity', 'created_at', 'id']),
+    ('ix_task_status_created_at_id', 'task', ['status', 'created_at', 'id']),
+]
+INDEXES = [
+    ('ix_gap_tenant_id_severity_created_at_id', 'gap', ['tenant_id', 'severity', 'created_at', 'id']),
+    ('ix_task_tenant_id_status_created_at_id', 'task', ['tenant_id', 'status', 'created_at', 'id']),
+    ('ix_task_tenant_id_due_date', 'task', ['tenant_id', 'due_date']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in REPLACED:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REPLACED:
+        op.create_index(name, table, columns)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,60 @@
+"""add refresh tokens
+
+Revision ID: c5a1d7e3f902
+Revises: 7b2e5a90c4d1
+Create Date: 2026-10-18 18:40:12.552817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a1d7e3f902'
+down_revision: Union[str, None] = '7b2e5a90c4d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_token',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('used_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_hash'),
+    )
+    op.create_index('ix_refresh_token_user_id', 'refresh_token', ['user_id'])
+    op.create_index('ix_refresh_token_session_id', 'refresh_token', ['session_id'])
+    op.create_index('ix_refresh_token_expires_at', 'refresh_token', ['expires_at'])
+    op.create_table(
+        'revoked_token',
+        sa.Column('jti', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index('ix_revoked_token_expires_at', 'revoked_token', ['expires_at'])
+    op.create_index('ix_revoked_token_revoked_at', 'revoked_token', ['revoked_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revoked_token_revoked_at', table_name='revoked_token')
+    op.drop_index('ix_revoked_token_expires_at', table_name='revoked_token')
+    op.drop_table('revoked_token')
+    op.drop_index('ix_refresh_token_expires_at', table_name='refresh_token')
+    op.drop_index('ix_refresh_token_session_id', table_name='refresh_token')
+    op.drop_index('ix_refresh_token_user_id', table_name='refresh_token')
+    op.drop_table('refresh_token')
@@ -0,0 +1,113 @@
+"""add tenancy
+
+Revision ID: d8f3b6a1e4c7
+Revises: c5a1d7e3f902
+Create Date: 2026-10-18 19:52:37.104928
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b6a1e4c7'
+down_revision: Union[str, None] = 'c5a1d7e3f902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose tenant_id references organization.id ...
+REFERENCING = ['user', 'policy', 'gap', 'task', 'evidence', 'upload', 'analysis_job', 'report', 'reminder']
+# ... and the rollups, which carry it without a foreign key (see app/models.py).
+ROLLUPS = ['gap_score', 'policy_score', 'owner_score']
+
+INDEXES = {
+    'ix_user_tenant_id': ('user', ['tenant_id']),
+    'ix_policy_tenant_id_created_at_id': ('policy', ['tenant_id', 'created_at', 'id']),
+    'ix_gap_tenant_id_created_at_id': ('gap', ['tenant_id', 'created_at', 'id']),
+    'ix_task_tenant_id_created_at_id': ('task', ['tenant_id', 'created_at', 'id']),
+    'ix_evidence_tenant_id_uploaded_at_id': ('evidence', ['tenant_id', 'uploaded_at', 'id']),
+}
+
+# Matches app/tenancy.py: no app.tenant_id set (workers, migrations, login) sees everything.
+RLS_POLICY = (
+    "coalesce(current_setting('app.tenant_id', true), '') = '' "
+    "OR tenant_id = current_setting('app.tenant_id', true)::int"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'organization',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('slug', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('slug'),
+    )
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    for table in REFERENCING:
+        if sqlite:
+            # A plain ADD COLUMN … REFERENCES: a batch rebuild would drop the search triggers.
+            op.execute(f'ALTER TABLE "{table}" ADD COLUMN tenant_id INTEGER REFERENCES organization (id)')
+        else:
+            op.add_column(table, sa.Column('tenant_id', sa.Integer(), nullable=True))
+            op.create_foreign_key(f'fk_{table}_tenant_id_organization', table, 'organization',
+                                  ['tenant_id'], ['id'])
+    for table in ROLLUPS:
+        op.add_column(table, sa.Column('tenant_id', sa.Integer(), nullable=True))
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns)
+
+    # Existing data becomes one "default" organization.
+    bind = op.get_bind()
+    if bind.execute(sa.text('SELECT 1 FROM "user" LIMIT 1')).first() is not None:
+        organization = sa.table('organization', sa.column('id'), sa.column('name'),
+                                sa.column('slug'), sa.column('created_at'))
+        bind.execute(organization.insert().values(name='Default', slug='default',
+                                                  created_at=datetime.utcnow()))
+        tenant_id = bind.execute(sa.text("SELECT id FROM organization WHERE slug = 'default'")).scalar_one()
+        for table in REFERENCING + ROLLUPS:
+            bind.execute(sa.text(f'UPDATE "{table}" SET tenant_id = :tenant'), {'tenant': tenant_id})
+
+    if bind.dialect.name == 'postgresql':
+        for table in REFERENCING + ROLLUPS:
+            op.execute(f'ALTER TABLE "{table}" ENABLE ROW LEVEL SECURITY')
+            op.execute(f'ALTER TABLE "{table}" FORCE ROW LEVEL SECURITY')
+            op.execute(f'CREATE POLICY tenant_isolation ON "{table}" '
+                       f'USING ({RLS_POLICY}) WITH CHECK ({RLS_POLICY})')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table in REFERENCING + ROLLUPS:
+            op.execute(f'DROP POLICY IF EXISTS tenant_isolation ON "{table}"')
+            op.execute(f'ALTER TABLE "{table}" NO FORCE ROW LEVEL SECURITY')
+            op.execute(f'ALTER TABLE "{table}" DISABLE ROW LEVEL SECURITY')
+    for name, (table, _) in INDEXES.items():
+        op.drop_index(name, table_name=table)
+    for table in ROLLUPS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('tenant_id')
+    for table in REFERENCING:
+        if bind.dialect.name == 'sqlite':
+            # DROP COLUMN refuses a column with a REFERENCES clause: rebuild the table,
+            # then put back the search triggers the rebuild dropped.
+            triggers = bind.execute(sa.text(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :t"), {'t': table},
+            ).scalars().all()
+            with op.batch_alter_table(table, recreate='always') as batch_op:
+                batch_op.drop_column('tenant_id')
+            for sql in triggers:
+                op.execute(sql)
+        else:
+            op.drop_constraint(f'fk_{table}_tenant_id_organization', table, type_='foreignkey')
+            op.drop_column(table, 'tenant_id')
+    op.drop_table('organization')
@@ -0,0 +1,73 @@
+"""add task history
+
+Revision ID: e2a9c4f7b610
+Revises: d8f3b6a1e4c7
+Create Date: 2026-10-18 21:07:45.318264
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4f7b610'
+down_revision: Union[str, None] = 'd8f3b6a1e4c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.compliance.history.STATUS_CODES at the time of writing.
+STATUS_CODES = {'open': 0, 'in_progress': 1, 'done': 2}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_event',
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.SmallInteger(), nullable=False),
+        sa.Column('at', sa.DateTime(), nullable=False),
+        sa.Column('actor', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_event_task_id_at', 'task_event', ['task_id', 'at'])
+    op.create_index('ix_task_event_at', 'task_event', ['at'], postgresql_using='brin')
+    op.create_table(
+        'task_snapshot',
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('taken_at', sa.DateTime(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('taken_at', 'task_id'),
+    )
+    # Baseline: history before this point is unknown, so record where every task stands now.
+    task = sa.table('task', sa.column('id'), sa.column('status'), sa.column('tenant_id'))
+    snapshot = sa.table('task_snapshot', sa.column('taken_at', sa.DateTime()), sa.column('task_id'),
+                        sa.column('status'), sa.column('tenant_id'))
+    op.execute(snapshot.insert().from_select(
+        ['taken_at', 'task_id', 'status', 'tenant_id'],
+        sa.select(sa.literal(datetime.utcnow(), sa.DateTime()), task.c.id,
+                  sa.case(STATUS_CODES, value=task.c.status, else_=0), task.c.tenant_id),
+    ))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in ('task_event', 'task_snapshot'):
+            op.execute(f'ALTER TABLE "{table}" ENABLE ROW LEVEL SECURITY')
+            op.execute(f'ALTER TABLE "{table}" FORCE ROW LEVEL SECURITY')
+            op.execute(
+                f'CREATE POLICY tenant_isolation ON "{table}" USING ('
+                "coalesce(current_setting('app.tenant_id', true), '') = '' "
+                "OR tenant_id = current_setting('app.tenant_id', true)::int)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_snapshot')
+    op.drop_index('ix_task_event_at', table_name='task_event')
+    op.drop_index('ix_task_event_task_id_at', table_name='task_event')
+    op.drop_table('task_event')
@@ -0,0 +1,53 @@
+"""add report table
+
+Revision ID: e81b2f4c7a65
+Revises: a43f0c6e91d7
+Create Date: 2026-10-18 16:38:52.440913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b2f4c7a65'
+down_revision: Union[str, None] = 'a43f0c6e91d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'report',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('scope_id', sa.Integer(), nullable=False),
+        sa.Column('format', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('size', sa.BigInteger(), nullable=True),
+        sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_status', 'report', ['status'])
+    op.create_index('ix_report_scope_scope_id_format_version', 'report',
+                    ['scope', 'scope_id', 'format', 'version'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_report_scope_scope_id_format_version', table_name='report')
+    op.drop_index('ix_report_status', table_name='report')
+    op.drop_table('report')
@@ -0,0 +1,41 @@
+"""add rate limit bucket
+
+Revision ID: f4b7d2c9a813
+Revises: e2a9c4f7b610
+Create Date: 2026-10-18 22:31:09.640517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b7d2c9a813'
+down_revision: Union[str, None] = 'e2a9c4f7b610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Buckets are disposable: on Postgres skip the WAL (a crash just resets them).
+    prefixes = ['UNLOGGED'] if op.get_bind().dialect.name == 'postgresql' else []
+    op.create_table(
+        'rate_limit_bucket',
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.Column('allowed', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        prefixes=prefixes,
+    )
+    op.create_index('ix_rate_limit_bucket_updated_at', 'rate_limit_bucket', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rate_limit_bucket_updated_at', table_name='rate_limit_bucket')
+    op.drop_table('rate_limit_bucket')
@@ -0,0 +1,99 @@
+import os
+
+# The app's lifespan touches the real engine; keep it off Postgres in tests.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.main import app
+from app.auth import cache as auth_cache
+from app.auth.revocation import revocations
+from app.ratelimit import MemoryStore, get_store
+from app.db import get_async_session, get_session
+
+
+# File-backed SQLite so the sync (seeding) and async (request) engines
+# share one database.
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def test_engine(db_url):
+    # Ensure models are registered
+    from app.auth.models import User  # import models so SQLModel metadata includes them
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def async_test_engine(db_url, test_engine):
+    # NullPool: TestClient runs each test on its own event loop.
+    return create_async_engine(
+        db_url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool
+    )
+
+
+# Fixture to create and clean up database
+@pytest.fixture
+def session(test_engine):
+    with Session(test_engine) as session:
+        yield session
+
+
+# Fixture to provide a TestClient with overridden dependencies
+@pytest.fixture
+def client(session, async_test_engine):
+    def get_test_session():
+        yield session
+
+    async def get_test_async_session():
+        async with AsyncSession(async_test_engine, expire_on_commit=False) as s:
+            yield s
+
+    auth_cache.token_cache.clear()
+    auth_cache.user_cache.clear()
+    revocations.clear()
+    if isinstance(get_store(), MemoryStore):
+        get_store().clear()
+    app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_async_session] = get_test_async_session
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.pop(get_session, None)
+    app.dependency_overrides.pop(get_async_session, None)
+
+
+@pytest.fixture
+def user(session):
+    from app.models import User
+    user = User(email="owner@example.com", hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    from app.auth.security import create_access_token
+    return {"Authorization": f"Bearer {create_access_token(subject=user.email)}"}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    from app.storage import get_storage
+    from app.storage.local import LocalStorage
+    backend = LocalStorage(tmp_path / "storage")
+    app.dependency_overrides[get_storage] = lambda: backend
+    yield backend
+    app.dependency_overrides.pop(get_storage, None)
@@ -1,37 +1,4 @@
-import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy.pool import StaticPool
-
-from app.main import app
-from app.db import get_session
-
-# Create a new in-memory SQLite engine for testing
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
-
-# Fixture to create and clean up database
-@pytest.fixture
-def session():
-    # Ensure models are registered
-    from app.auth.models import User  # import models so SQLModel metadata includes them
-    SQLModel.metadata.create_all(test_engine)
-    with Session(test_engine) as session:
-        yield session
-    SQLModel.metadata.drop_all(test_engine)
-
-# Fixture to provide a TestClient with overridden dependency
-@pytest.fixture
-def client(session):
-    def get_test_session():
-        yield session
-
-    app.dependency_overrides[get_session] = get_test_session
-    with TestClient(app) as client:
-        yield client
+# Fixtures (`session`, `client`) live in tests/conftest.py.
 
 
 def test_register_login_me(client):
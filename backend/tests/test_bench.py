@@ -0,0 +1,42 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.main import app
+from app.models import OwnerScore, Task
+from bench.load import SCENARIOS, compare, percentile, run, summarize
+from bench.seed import Scale, seed
+
+
+def test_percentiles_use_nearest_rank():
+    ordered = [float(n) for n in range(1, 101)]
+    assert [percentile(ordered, p) for p in (50, 95, 99, 100)] == [50, 95, 99, 100]
+    assert percentile([0.2], 99) == 0.2 and percentile([], 50) == 0.0
+
+    summary = summarize([0.001, 0.003, 0.002], errors=1, elapsed=2.0)
+    assert summary == {"requests": 3, "errors": 1, "rps": 1.5, "p50_ms": 2.0,
+                       "p95_ms": 3.0, "p99_ms": 3.0, "max_ms": 3.0}
+
+
+def test_compare_flags_latency_throughput_and_error_regressions():
+    def result(**endpoints):
+        return {"endpoints": {name: {"p95_ms": p95, "rps": rps, "errors": errors}
+                              for name, (p95, rps, errors) in endpoints.items()}}
+
+    baseline = result(me=(10.0, 1000.0, 0), policies=(20.0, 300.0, 0), gone=(1.0, 1.0, 0))
+    assert compare(baseline, result(me=(11.9, 850.0, 0), policies=(20.0, 300.0, 0)), 0.2) == []
+    problems = compare(baseline, result(me=(12.5, 1000.0, 0), policies=(20.0, 200.0, 2), new=(99.0, 1.0, 0)), 0.2)
+    assert problems == ["me: p95 10.0 → 12.5 ms", "policies: 300.0 → 200.0 req/s", "policies: 0 → 2 errors"]
+
+
+def test_seed_and_drive_in_process(client, test_engine, session):
+    seeded = seed(test_engine, Scale(tenants=3, policies=2, gaps=2, tasks=2, evidence=1))
+    assert seeded.counts == {"organizations": 3, "users": 3, "policies": 6, "gaps": 12, "tasks": 24, "evidence": 24}
+    assert len(session.exec(select(Task)).all()) == 24
+    assert len(session.exec(select(OwnerScore)).all()) == 3       # rollups rebuilt
+
+    scenarios = [SCENARIOS[name] for name in ("me", "policies", "search")]
+    results = asyncio.run(run(scenarios, seeded, app=app, concurrency=2, duration=0.2, warmup=0))
+    for name, result in results.items():
+        assert result["requests"] > 0 and result["errors"] == 0, name
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
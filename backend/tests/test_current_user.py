@@ -0,0 +1,56 @@
+from sqlalchemy import event
+
+from app.auth import cache
+from app.auth.models import User
+from app.auth.security import create_access_token, hash_password
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token(subject=email)}"}
+
+
+def test_me_is_served_from_cache(client, session, async_test_engine):
+    session.add(User(email="c@example.com", hashed_password=hash_password("pw")))
+    session.commit()
+    headers = _auth("c@example.com")
+
+    statements = []
+    event.listen(async_test_engine.sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    assert client.get("/me", headers=headers).status_code == 200
+    cold = len(statements)
+    assert cold >= 1
+    for _ in range(3):
+        assert client.get("/me", headers=headers).json()["email"] == "c@example.com"
+    assert len(statements) == cold          # warm requests: no SQL
+
+    stats = client.get("/metrics/auth-cache").json()
+    assert stats["tokens"]["hits"] == 3
+    assert stats["users"]["hits"] == 3
+
+
+def test_invalidate_user_forces_reload(client, session):
+    session.add(User(email="r@example.com", hashed_password="x", role="staff"))
+    session.commit()
+    headers = _auth("r@example.com")
+    client.get("/me", headers=headers)
+    assert cache.user_cache.get("r@example.com").role == "staff"
+
+    cache.invalidate_user("r@example.com")
+    assert cache.user_cache.get("r@example.com") is None
+
+
+def test_token_for_unknown_user_is_rejected(client):
+    assert client.get("/me", headers=_auth("ghost@example.com")).status_code == 401
+
+
+def test_ttl_cache_evicts_lru_and_expired():
+    c = cache.TTLCache(maxsize=2)
+    c.set("a", 1, expires_at=2**40)
+    c.set("b", 2, expires_at=2**40)
+    c.get("a")
+    c.set("c", 3, expires_at=2**40)
+    assert c.get("b") is None and c.get("a") == 1
+    c.set("old", 0, expires_at=0)
+    assert c.get("old") is None
@@ -0,0 +1,56 @@
+from sqlalchemy import event
+
+from app.models import Evidence, Gap, Policy, Task
+
+
+def _grow(session, user, policies=1, gaps=2, tasks=3):
+    for p in range(policies):
+        policy = Policy(owner_id=user.id, title=f"P{p}", file_path="p.pdf")
+        session.add(policy)
+        session.flush()
+        for g in range(gaps):
+            gap = Gap(policy_id=policy.id, description="d", severity=("low", "high")[g % 2])
+            session.add(gap)
+            session.flush()
+            for t in range(tasks):
+                task = Task(gap_id=gap.id, title="t", status=("open", "done", "in_progress")[t % 3])
+                session.add(task)
+                session.flush()
+                session.add(Evidence(task_id=task.id, file_path="e.pdf"))
+    session.commit()
+
+
+def _count_queries(client, async_test_engine, url, headers):
+    client.get(url, headers=headers)                 # warm the current-user cache
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_test_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(async_test_engine.sync_engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_summary_counts(client, session, user, auth_headers, async_test_engine):
+    _grow(session, user, policies=1, gaps=2, tasks=3)
+    _, body = _count_queries(client, async_test_engine, "/api/v1/dashboard", auth_headers)
+    assert body[0]["tasks"] == {"open": 2, "in_progress": 2, "done": 2}
+    assert body[0]["gaps"] == {"low": 1, "medium": 0, "high": 1}
+    assert body[0]["evidence"] == 6
+
+
+def test_query_count_is_flat_as_tree_grows(client, session, user, auth_headers, async_test_engine):
+    _grow(session, user, policies=1, gaps=1, tasks=1)
+    small = {
+        url: _count_queries(client, async_test_engine, url, auth_headers)[0]
+        for url in ("/api/v1/dashboard", "/api/v1/dashboard/tree")
+    }
+    _grow(session, user, policies=4, gaps=3, tasks=4)
+    for url, n in small.items():
+        count, body = _count_queries(client, async_test_engine, url, auth_headers)
+        assert count == n, url
+        assert len(body) == 5
+    tree = _count_queries(client, async_test_engine, "/api/v1/dashboard/tree", auth_headers)[1]
+    assert len(tree[0]["gaps"][0]["tasks"][0]["evidence"]) == 1
@@ -0,0 +1,35 @@
+from app import db
+
+
+def test_to_async_url_swaps_driver():
+    assert db.to_async_url("postgresql://u:p@h:5432/d") == "postgresql+asyncpg://u:p@h:5432/d"
+    assert db.to_async_url("postgresql+psycopg2://u:p@h/d") == "postgresql+asyncpg://u:p@h/d"
+    assert db.to_async_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+
+
+def test_engine_options_pool_and_timeout(monkeypatch):
+    monkeypatch.setattr(db, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    sync = db.engine_options("postgresql://h/d")
+    assert sync["pool_size"] == db.DB_POOL_SIZE
+    assert sync["max_overflow"] == db.DB_MAX_OVERFLOW
+    assert sync["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    async_ = db.engine_options("postgresql+asyncpg://h/d", is_async=True)
+    assert async_["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    # SQLite picks its own pool; no pool sizing is passed.
+    assert "pool_size" not in db.engine_options("sqlite://")
+
+
+def test_threaded_session_round_trip(session):
+    from sqlmodel import select
+    from app.auth.models import User
+    import asyncio
+
+    async def scenario():
+        s = db.ThreadedSession(session)
+        s.add(User(email="t@example.com", hashed_password="x"))
+        await s.commit()
+        return (await s.exec(select(User))).first()
+
+    assert asyncio.run(scenario()).email == "t@example.com"
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from sqlmodel import select
+
+from app.auth import hashing
+from app.auth.models import User
+
+
+def test_pool_rejects_when_saturated():
+    pool = hashing.HashingPool(workers=1, queue_limit=0)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(lambda: None)
+        release.set()
+        await blocked
+        return exc.value
+
+    err = asyncio.run(scenario())
+    pool.shutdown()
+    assert err.status_code == 503
+    assert err.headers["Retry-After"] == str(hashing.HASH_RETRY_AFTER)
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_login_rehashes_stale_hash(client, session):
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("pw")
+    session.add(User(email="old@example.com", hashed_password=weak))
+    session.commit()
+
+    r = client.post("/auth/login", data={"username": "old@example.com", "password": "pw"})
+    assert r.status_code == 200
+
+    session.expire_all()
+    user = session.exec(select(User).where(User.email == "old@example.com")).one()
+    assert user.hashed_password != weak
+    assert client.get("/metrics/hashing").json()["completed"] >= 1
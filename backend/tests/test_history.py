@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from app.compliance import history
+from app.models import Gap, Policy, Task, TaskEvent, TaskSnapshot
+
+
+@pytest.fixture
+def tree(session, user):
+    policy = Policy(owner_id=user.id, title="HIPAA", file_path="p.pdf")
+    gap = Gap(policy=policy, description="No BAA", severity="high")
+    tasks = [Task(gap=gap, title="Sign BAA"), Task(gap=gap, title="Countersign BAA")]
+    session.add_all(tasks)
+    session.commit()
+    return policy, gap, tasks
+
+
+def _as_of(client, headers, at, **params):
+    r = client.get("/api/v1/tasks/as-of", params={"at": at.isoformat(), **params}, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_status_changes_are_appended_with_their_actor(client, auth_headers, session, user, tree):
+    _, _, (sign, _) = tree
+    for status in ("in_progress", "done", "done"):
+        r = client.patch(f"/api/v1/tasks/{sign.id}", json={"status": status}, headers=auth_headers)
+        assert r.status_code == 200 and r.json()["status"] == status
+
+    events = client.get(f"/api/v1/tasks/{sign.id}/history", headers=auth_headers).json()
+    assert [(e["status"], e["actor"]) for e in events] == [
+        ("open", None), ("in_progress", user.id), ("done", user.id)]    # a no-op write adds nothing
+    assert client.patch(f"/api/v1/tasks/{sign.id}", json={"status": "blocked"},
+                        headers=auth_headers).status_code == 422
+
+
+def test_as_of_replays_from_the_newest_snapshot(client, auth_headers, session, tree):
+    policy, _, (sign, countersign) = tree
+    created = datetime.utcnow()
+    client.patch(f"/api/v1/tasks/{sign.id}", json={"status": "done"}, headers=auth_headers)
+    taken_at = datetime.utcnow()
+    assert history.snapshot(session.connection(), taken_at) == 2
+    session.commit()
+    client.patch(f"/api/v1/tasks/{countersign.id}", json={"status": "in_progress"}, headers=auth_headers)
+    session.delete(session.get(Task, sign.id))
+    session.commit()
+
+    before = _as_of(client, auth_headers, created)
+    assert before["snapshot_at"] is None
+    assert before["counts"] == {"open": 2, "in_progress": 0, "done": 0}
+
+    at_snapshot = _as_of(client, auth_headers, taken_at)
+    assert datetime.fromisoformat(at_snapshot["snapshot_at"]) == taken_at
+    assert at_snapshot["counts"] == {"open": 1, "in_progress": 0, "done": 1}
+
+    now = _as_of(client, auth_headers, datetime.utcnow(), policy_id=policy.id)
+    assert now["counts"] == {"open": 0, "in_progress": 1, "done": 0}      # the deleted task is gone
+    assert _as_of(client, auth_headers, datetime.utcnow(), policy_id=policy.id + 1)["total"] == 0
+
+
+def test_snapshots_are_periodic_and_imports_are_recorded(client, auth_headers, session, tree):
+    _, gap, _ = tree
+    conn = session.connection()
+    now = datetime.utcnow() + timedelta(minutes=history.HISTORY_SNAPSHOT_LAG_MINUTES)
+    assert history.snapshot_if_due(conn, now) == 2
+    assert history.snapshot_if_due(conn, now + timedelta(hours=1)) is None
+    assert history.snapshot_if_due(conn, now + timedelta(hours=history.HISTORY_SNAPSHOT_HOURS)) == 2
+    session.commit()
+    assert len(session.exec(select(TaskSnapshot)).all()) == 4
+
+    body = json.dumps({"gap_id": gap.id, "title": "Archive BAA", "status": "done"}) + "\n"
+    assert client.post("/api/v1/import/tasks", content=body, headers=auth_headers).json()["inserted"] == 1
+    imported = session.exec(select(Task).where(Task.title == "Archive BAA")).one()
+    event = session.exec(select(TaskEvent).where(TaskEvent.task_id == imported.id)).one()
+    assert history.STATUSES[event.status] == "done"
+
+
+def test_an_event_committed_after_the_snapshot_is_still_replayed(client, auth_headers, session, tree):
+    _, _, (sign, _) = tree
+    for event in session.exec(select(TaskEvent)):
+        event.at -= timedelta(hours=2)
+    session.commit()
+    assert history.snapshot(session.connection()) == 2
+    session.commit()
+    # a transaction that stamped its event a minute ago commits only now
+    session.add(TaskEvent(task_id=sign.id, status=history.STATUS_CODES["done"],
+                          tenant_id=sign.tenant_id, at=datetime.utcnow() - timedelta(minutes=1)))
+    session.commit()
+    assert _as_of(client, auth_headers, datetime.utcnow())["counts"] == {"open": 1, "in_progress": 0, "done": 1}
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import signal
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app import lifecycle
+from app.Routers import health
+
+
+@pytest.fixture
+def probe(client, monkeypatch):
+    health.database_check.reset()
+    yield client
+    health.database_check.reset()
+
+
+def test_ready_reports_database_and_lifecycle(probe, monkeypatch):
+    assert probe.get("/health").json() == {"status": "ok"}
+    r = probe.get("/ready")
+    assert r.status_code == 200 and r.json()["database"] == "ok"
+
+    monkeypatch.setattr(lifecycle.state, "draining", True)
+    assert probe.get("/ready").json() == {"status": "draining"}
+
+
+def test_ready_check_is_cached_and_reports_failures(probe, monkeypatch):
+    calls = []
+
+    async def failing_ping():
+        calls.append(1)
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(lifecycle, "ping", failing_ping)
+    monkeypatch.setattr(health, "READY_CACHE_SECONDS", 60)
+    for _ in range(3):
+        r = probe.get("/ready")
+        assert r.status_code == 503
+        assert r.json()["database"] == "ConnectionError: connection refused"
+    assert len(calls) == 1
+    assert probe.get("/health").status_code == 200       # liveness doesn't touch the DB
+
+
+def _stamped_engine(tmp_path, revision):
+    engine = create_engine(f"sqlite:///{tmp_path / 'prod.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        if revision:
+            conn.execute(text("INSERT INTO alembic_version VALUES (:r)"), {"r": revision})
+    return engine
+
+
+def test_production_startup_checks_the_alembic_head_without_ddl(tmp_path, monkeypatch):
+    monkeypatch.setattr(lifecycle, "DB_AUTO_CREATE", False)
+    with lifecycle.engine.connect() as conn:
+        _, (head,) = lifecycle.schema_heads(conn)
+
+    monkeypatch.setattr(lifecycle, "engine", _stamped_engine(tmp_path, head))
+    lifecycle.prepare_schema()
+    with lifecycle.engine.connect() as conn:                # no tables were created
+        tables = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+    assert tables == ["alembic_version"]
+
+    lifecycle.engine.dispose()
+    (tmp_path / "prod.db").unlink()
+    monkeypatch.setattr(lifecycle, "engine", _stamped_engine(tmp_path, "0079fdbec767"))
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        lifecycle.prepare_schema()
+
+
+def test_drain_waits_for_in_flight_requests(monkeypatch):
+    monkeypatch.setattr(lifecycle.state, "in_flight", 1)
+    monkeypatch.setattr(lifecycle.state, "draining", False)
+
+    async def finish_later():
+        await asyncio.sleep(0.1)
+        lifecycle.state.in_flight -= 1
+
+    async def main():
+        finisher = asyncio.create_task(finish_later())
+        drained = await lifecycle.drain(timeout=5)
+        await finisher
+        return drained
+
+    assert asyncio.run(main()) is True
+    assert lifecycle.state.draining
+
+    lifecycle.state.in_flight = 1
+    assert asyncio.run(lifecycle.drain(timeout=0.1)) is False
+
+
+def test_prewarm_fills_the_pool(monkeypatch):
+    pings = []
+    real_ping = lifecycle.ping
+
+    async def counting_ping():
+        pings.append(1)
+        await real_ping()
+
+    monkeypatch.setattr(lifecycle, "ping", counting_ping)
+    asyncio.run(lifecycle.prewarm(connections=3))
+    assert len(pings) == 3
+
+
+def test_sigterm_reports_not_ready_before_the_server_shuts_down(monkeypatch):
+    monkeypatch.setattr(lifecycle.state, "draining", False)
+    received = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+
+    async def main():
+        uninstall = lifecycle.install_sigterm_handler(delay=0.2)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        during = (lifecycle.state.draining, list(received))    # not-ready, server not told yet
+        await asyncio.sleep(0.3)
+        uninstall()
+        return during
+
+    try:
+        assert asyncio.run(main()) == (True, [])
+        assert received == [signal.SIGTERM]                     # then handed over
+    finally:
+        signal.signal(signal.SIGTERM, original)
@@ -0,0 +1,80 @@
+import logging
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from app import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _sample(body: str, name: str) -> float:
+    match = re.search(rf"^{re.escape(name)} (\S+)$", body, re.MULTILINE)
+    assert match, f"{name} not in /metrics"
+    return float(match.group(1))
+
+
+def test_requests_are_timed_per_route_with_their_sql(client, auth_headers, user):
+    for _ in range(2):
+        assert client.get(f"/api/v1/policies?owner_id={user.id}", headers=auth_headers).status_code == 200
+    assert client.get("/api/v1/no-such-thing/7", headers=auth_headers).status_code == 404
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = r.text
+    labels = 'method="GET",route="/api/v1/policies"'
+    assert _sample(body, f'http_requests_total{{{labels},status="200"}}') == 2
+    # Unknown paths share one label instead of one series per URL.
+    assert _sample(body, 'http_requests_total{method="GET",route="<unmatched>",status="404"}') == 1
+    assert _sample(body, f"http_request_duration_seconds_count{{{labels}}}") == 2
+    assert _sample(body, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 2
+    assert _sample(body, f"http_request_db_queries_sum{{{labels}}}") >= 2   # list query (+ count)
+    assert _sample(body, "db_queries_total") >= _sample(body, f"http_request_db_queries_sum{{{labels}}}")
+    assert _sample(body, 'http_requests_in_progress{method="GET"}') == 1    # the scrape itself
+
+
+def test_slow_queries_are_logged_with_their_route(client, auth_headers, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        client.get("/api/v1/policies", headers=auth_headers)
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("slow query")]
+    assert slow and all("/api/v1/policies" in m and "SELECT" in m for m in slow)
+
+
+def test_pool_checkout_waits_and_occupancy(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=metrics.TimedQueuePool, pool_size=2)
+    metrics.watch_pool(engine)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            body = metrics.render()
+            assert _sample(body, 'db_pool_connections{pool="sync",state="checked_out"}') == 1
+        assert _sample(metrics.render(), 'db_pool_checkout_wait_seconds_count{pool="sync"}') == 1
+    finally:
+        metrics.COLLECTORS.pop()
+        engine.dispose()
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = metrics.Histogram("test_latency_seconds", "t", buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.1, 0.5, 3):
+            hist.observe(value=value)
+        lines = hist.render().splitlines()[2:]
+        assert lines == [
+            'test_latency_seconds_bucket{le="0.1"} 2',
+            'test_latency_seconds_bucket{le="1.0"} 3',
+            'test_latency_seconds_bucket{le="+Inf"} 4',
+            "test_latency_seconds_sum 3.65",
+            "test_latency_seconds_count 4",
+        ]
+    finally:
+        metrics.REGISTRY.remove(hist)
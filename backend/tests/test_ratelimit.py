@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.ratelimit import DatabaseStore, Limit, MemoryStore, RateLimitMiddleware, parse_rules
+
+
+def _client(spec, store):
+    app = FastAPI()
+
+    @app.api_route("/auth/login", methods=["GET", "POST"])
+    def login():
+        return {"ok": True}
+
+    @app.get("/api/v1/items")
+    def items():
+        return []
+
+    app.add_middleware(RateLimitMiddleware, rules=parse_rules(spec), store=store)
+    return TestClient(app)
+
+
+def test_refuses_with_retry_after_and_separates_clients(monkeypatch):
+    monkeypatch.setattr("app.ratelimit.RATE_LIMIT_PROXIES", 1)
+    client = _client("POST /auth/login ip=2/60", MemoryStore())
+    alice = {"X-Forwarded-For": "203.0.113.7"}
+
+    first = client.post("/auth/login", headers=alice)
+    assert first.status_code == 200
+    assert (first.headers["RateLimit-Limit"], first.headers["RateLimit-Remaining"]) == ("2", "1")
+    assert first.headers["RateLimit-Policy"] == "2;w=60"
+    assert client.post("/auth/login", headers=alice).status_code == 200
+
+    refused = client.post("/auth/login", headers=alice)
+    assert refused.status_code == 429
+    assert refused.json() == {"detail": "Too many requests"}
+    assert refused.headers["Retry-After"] == "30"
+    assert refused.headers["RateLimit-Remaining"] == "0"
+
+    # Spoofed hops to the left of our proxy's entry do not buy a fresh bucket.
+    assert client.post("/auth/login", headers={"X-Forwarded-For": "1.2.3.4, 203.0.113.7"}).status_code == 429
+    assert client.post("/auth/login", headers={"X-Forwarded-For": "198.51.100.1"}).status_code == 200
+    assert client.get("/auth/login", headers=alice).status_code == 200          # method not limited
+    assert "RateLimit-Limit" not in client.get("/auth/login", headers=alice).headers
+
+
+def test_user_buckets_are_per_token_and_skip_anonymous_requests():
+    client = _client("* /api/v1/ user=1/60", MemoryStore())
+    one, two = ({"Authorization": f"Bearer token-{n}"} for n in (1, 2))
+
+    assert client.get("/api/v1/items", headers=one).status_code == 200
+    assert client.get("/api/v1/items", headers=one).status_code == 429
+    assert client.get("/api/v1/items", headers=two).status_code == 200
+    assert client.get("/api/v1/items").status_code == 200
+    assert client.get("/api/v1/items").status_code == 200
+
+
+def test_database_store_shares_one_budget_between_workers(test_engine):
+    limit = Limit("route", 3, 3)                         # 1 token per second
+    workers = DatabaseStore(test_engine), DatabaseStore(test_engine)
+
+    async def take(now):
+        return [await w.take("POST /auth/login|route|", limit, now) for w in workers]
+
+    first, second = asyncio.run(take(1000.0)), asyncio.run(take(1000.0))
+    assert [d.allowed for d in first + second] == [True, True, True, False]
+    assert second[1].retry_after == pytest.approx(1.0)
+
+    later = asyncio.run(take(1001.5))                    # 1.5 tokens back
+    assert [d.allowed for d in later] == [True, False]
+    assert later[1].remaining == pytest.approx(0.5)
+
+
+def test_parse_rules_rejects_malformed_limits():
+    rules = parse_rules("post /auth/login ip=10/60 route=100/1; * /api/v1/ user=5/1")
+    assert [r.name for r in rules] == ["POST /auth/login", "* /api/v1/"]
+    assert rules[0].limits[1] == Limit("route", 100, 1.0)
+    for bad in ("POST /x host=1/1", "POST /x ip=10", "POST /x ip=/60"):
+        with pytest.raises(ValueError):
+            parse_rules(bad)
+
+
+def test_memory_store_sweeps_full_buckets_first():
+    store, limit = MemoryStore(max_keys=3), Limit("ip", 2, 2)
+    store.take_now("idle", limit, 0.0)                    # full again at t=1
+    store.take_now("busy-1", limit, 5.0)
+    store.take_now("busy-2", limit, 5.0)
+    store.take_now("new", limit, 5.5)
+    assert set(store._buckets) == {"busy-1", "busy-2", "new"}
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.models import Gap, Organization, Policy, Task
+from app.realtime import backplane, hub as hub_module
+from app.realtime.hub import Subscription, hub
+from app.realtime.routes import sse_stream
+
+
+@pytest.fixture
+def gap(session, user):
+    gap = Gap(policy=Policy(owner_id=user.id, title="HIPAA", file_path="p.pdf"), description="No BAA",
+              severity="high")
+    session.add(gap)
+    session.commit()
+    return gap
+
+
+def test_subscription_coalesces_and_overflows_to_resync(monkeypatch):
+    monkeypatch.setattr(hub_module, "REALTIME_COALESCE_MS", 0)
+    monkeypatch.setattr(hub_module, "REALTIME_MAX_PENDING", 3)
+
+    async def scenario():
+        sub = Subscription(None, ["task"])
+        for op in ("created", "updated", "updated"):
+            sub.offer({"kind": "task", "id": 1, "op": op, "tenant_id": None})
+        sub.offer({"kind": "gap", "id": 1, "op": "updated", "tenant_id": None})     # not subscribed
+        sub.offer({"kind": "task", "id": 2, "op": "deleted", "tenant_id": None})
+        first = await sub.next_batch(timeout=1)
+        assert await sub.next_batch(timeout=0.01) is None
+
+        for i in range(5):                                    # a consumer that fell behind
+            sub.offer({"kind": "task", "id": i, "op": "updated", "tenant_id": None})
+        return first, await sub.next_batch(timeout=1), sub.resyncs
+
+    first, second, resyncs = asyncio.run(scenario())
+    assert first == [{"kind": "task", "id": 1, "op": "created"}, {"kind": "task", "id": 2, "op": "deleted"}]
+    assert (second, resyncs) == ([{"op": "resync"}], 1)
+
+
+def test_websocket_pushes_the_tenants_committed_changes(client, auth_headers, session, gap, monkeypatch):
+    monkeypatch.setattr(hub_module, "REALTIME_COALESCE_MS", 200)
+    token = auth_headers["Authorization"].split()[1]
+    other = Organization(name="Other", slug="other")
+    session.add(other)
+    session.flush()
+
+    with client.websocket_connect(f"/realtime/ws?access_token={token}&kind=task") as ws:
+        foreign = Policy(owner_id=gap.policy.owner_id, tenant_id=other.id, title="x", file_path="x")
+        session.add(Task(gap=Gap(policy=foreign, description="x", severity="low"), title="Not yours"))
+        session.commit()
+        task = Task(gap_id=gap.id, title="Sign BAA")
+        session.add(task)
+        session.commit()
+        task.status = "done"                                   # same burst: still one "created"
+        session.commit()
+        gap.description = "No signed BAA"                      # kind not subscribed
+        session.commit()
+
+        message = ws.receive_json()
+        assert message == {"type": "changes", "changes": [{"kind": "task", "id": task.id, "op": "created"}]}
+        assert hub.stats()["connections"] == 1
+    assert client.get("/metrics/realtime").json()["connections"] == 0
+
+
+def test_feeds_require_a_valid_token(client):
+    assert client.get("/realtime/events").status_code == 401
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/realtime/ws?access_token=nope") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+
+def test_sse_stream_frames_batches(monkeypatch):
+    monkeypatch.setattr(hub_module, "REALTIME_COALESCE_MS", 0)
+
+    class Request:
+        async def is_disconnected(self):
+            return False
+
+    async def scenario():
+        stream = sse_stream(7, ["gap"], Request())
+        frames = [await anext(stream)]
+        hub.publish([{"kind": "gap", "id": 3, "op": "updated", "tenant_id": 7},
+                     {"kind": "gap", "id": 4, "op": "updated", "tenant_id": 8}])
+        frames.append(await anext(stream))
+        await stream.aclose()
+        return frames, hub.stats()["connections"]
+
+    frames, connections = asyncio.run(scenario())
+    assert frames[0].startswith("retry:")
+    assert frames[1] == 'event: changes\ndata: [{"kind": "gap", "id": 3, "op": "updated"}]\n\n'
+    assert connections == 0
+
+
+def test_backplane_payloads_fit_a_notify(monkeypatch):
+    monkeypatch.setattr(backplane, "MAX_PAYLOAD", 200)
+    changes = [{"kind": "task", "id": i, "op": "updated", "tenant_id": 1} for i in range(20)]
+    payloads = backplane._payloads(changes)
+    assert len(payloads) > 1 and all(len(p) <= 200 for p in payloads)
+    assert [c for p in payloads for c in json.loads(p)] == changes
+
+
+def test_bulk_import_reaches_the_feed(client, auth_headers, gap, monkeypatch):
+    monkeypatch.setattr(hub_module, "REALTIME_COALESCE_MS", 0)
+    token = auth_headers["Authorization"].split()[1]
+
+    def import_tasks(n):
+        body = "\n".join(json.dumps({"gap_id": gap.id, "title": f"Task {i}"}) for i in range(n))
+        assert client.post("/api/v1/import/tasks", content=body, headers=auth_headers).json()["inserted"] == n
+
+    with client.websocket_connect(f"/realtime/ws?access_token={token}&kind=task") as ws:
+        import_tasks(2)
+        message = ws.receive_json()
+        assert [(c["op"], c["kind"]) for c in message["changes"]] == [("created", "task")] * 2
+
+        monkeypatch.setattr(hub_module, "REALTIME_MAX_PENDING", 2)
+        import_tasks(3)                                        # too many to list: refetch
+        assert ws.receive_json() == {"type": "resync"}
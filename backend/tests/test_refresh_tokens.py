@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from jose import jwt
+
+from sqlmodel import select
+
+from app.auth import revocation
+from app.auth.revocation import revocations
+from app.models import RefreshToken, RevokedToken
+
+
+def _login(client, email="rt@example.com", password="pw"):
+    client.post("/auth/register", json={"email": email, "password": password})
+    r = client.post("/auth/login", data={"username": email, "password": password})
+    assert r.status_code == 200
+    return r.json()
+
+
+def _me(client, tokens):
+    return client.get("/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+
+def test_login_returns_a_refresh_token_that_rotates(client, session, monkeypatch):
+    tokens = _login(client)
+    assert tokens["refresh_token"] and tokens["expires_in"] == 15 * 60
+
+    # Refreshing never touches bcrypt.
+    monkeypatch.setattr("app.auth.security.pwd_context.verify_and_update",
+                        lambda *a: (_ for _ in ()).throw(AssertionError("bcrypt on refresh")))
+    r = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 200
+    rotated = r.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert _me(client, rotated).status_code == 200
+
+    rows = session.exec(select(RefreshToken)).all()
+    assert len(rows) == 2 and len({row.session_id for row in rows}) == 1
+    assert tokens["refresh_token"] not in {row.token_hash for row in rows}     # stored hashed
+    assert client.post("/auth/refresh", json={"refresh_token": "nope"}).status_code == 401
+
+
+def test_replaying_a_rotated_refresh_token_revokes_the_session(client, session):
+    first = _login(client)
+    second = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).json()
+
+    replay = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert replay.status_code == 401
+    # The attacker's and the victim's tokens are all dead now.
+    assert client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 401
+    assert _me(client, second).status_code == 401
+    assert _me(client, first).status_code == 401
+    assert all(row.revoked_at for row in session.exec(select(RefreshToken)).all())
+
+
+def test_logout_revokes_only_that_session(client):
+    laptop = _login(client)
+    phone = client.post("/auth/login", data={"username": "rt@example.com", "password": "pw"}).json()
+
+    r = client.post("/auth/logout", headers={"Authorization": f"Bearer {laptop['access_token']}"})
+    assert r.status_code == 204
+    assert _me(client, laptop).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": laptop["refresh_token"]}).status_code == 401
+    assert _me(client, phone).status_code == 200
+
+
+def test_other_workers_pick_up_revocations_on_sync(client, session, monkeypatch):
+    tokens = _login(client)
+    assert _me(client, tokens).status_code == 200
+
+    # Another worker revoked this session: only the table knows.
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    session.add(RevokedToken(jti=claims["sid"], expires_at=datetime.utcnow() + timedelta(days=1)))
+    session.commit()
+    assert _me(client, tokens).status_code == 200            # not synced yet: served from memory
+
+    monkeypatch.setattr(revocation, "AUTH_REVOCATION_SYNC", 0)
+    assert _me(client, tokens).status_code == 401
+    assert revocations.stats()["size"] == 1
+
+
+def test_sync_loads_live_revocations_only(client, session, auth_headers):
+    now = datetime.utcnow()
+    session.add(RevokedToken(jti="old", expires_at=now + timedelta(hours=1), revoked_at=now - timedelta(hours=1)))
+    session.add(RevokedToken(jti="gone", expires_at=now - timedelta(seconds=1), revoked_at=now - timedelta(hours=1)))
+    session.commit()
+    assert client.get("/me", headers=auth_headers).status_code == 200     # first request syncs
+
+    assert revocations.is_revoked({"jti": "old"})
+    assert not revocations.is_revoked({"jti": "gone"})
+    assert revocations.watermark == now - timedelta(hours=1)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Gap, Policy, Reminder, Task
+from app.reminders.scheduler import ReminderScheduler
+
+NOW = datetime.utcnow().replace(microsecond=0)   # write-time reminders use the wall clock
+
+
+class RecordingNotifier:
+    def __init__(self, fail=False):
+        self.batches, self.fail = [], fail
+
+    async def send(self, reminders):
+        if self.fail:
+            raise ConnectionError("webhook down")
+        self.batches.append([(r.task_id, r.kind) for r in reminders])
+
+
+@pytest.fixture
+def gap(session, user):
+    policy = Policy(owner_id=user.id, title="HIPAA", file_path="p.pdf")
+    session.add(policy)
+    session.flush()
+    gap = Gap(policy_id=policy.id, description="No BAA", severity="high")
+    session.add(gap)
+    session.commit()
+    return gap
+
+
+def _task(session, gap, due, status="open"):
+    task = Task(gap_id=gap.id, title=f"due {due}", due_date=due, status=status)
+    session.add(task)
+    session.commit()
+    return task.id
+
+
+def _scheduler(async_test_engine, notifier):
+    factory = lambda: AsyncSession(async_test_engine, expire_on_commit=False)
+    return ReminderScheduler(notifier=notifier, session_factory=factory)
+
+
+def test_tick_queues_and_sends_each_reminder_once(session, gap, user, async_test_engine):
+    soon = _task(session, gap, NOW + timedelta(hours=3))
+    late = _task(session, gap, NOW - timedelta(hours=2))
+    _task(session, gap, NOW - timedelta(hours=1), status="done")
+    _task(session, gap, NOW + timedelta(days=5))            # outside the lead window
+    _task(session, gap, None)
+
+    notifier = RecordingNotifier()
+    scheduler = _scheduler(async_test_engine, notifier)
+    assert asyncio.run(scheduler.tick(NOW)) == (2, 2)
+    assert sorted(notifier.batches[0]) == [(soon, "due_soon"), (late, "overdue")]
+    reminders = session.exec(select(Reminder)).all()
+    assert {r.recipient_id for r in reminders} == {user.id}    # falls back to policy owner
+    assert {r.status for r in reminders} == {"done"}
+
+    # A restarted scheduler carries on from the watermark: only the look-back is not re-scanned.
+    restarted = _scheduler(async_test_engine, notifier)
+    assert asyncio.run(restarted.tick(NOW + timedelta(minutes=1))) == (0, 0)
+    assert len(session.exec(select(Reminder)).all()) == 2
+
+    # Time passes: the due-soon task goes overdue, the 5-day one enters the lead window.
+    asyncio.run(restarted.tick(NOW + timedelta(days=4, hours=1)))
+    kinds = sorted((r.task_id, r.kind) for r in session.exec(select(Reminder)).all())
+    assert (soon, "overdue") in kinds and len(kinds) == 4
+
+
+def test_concurrent_schedulers_do_not_duplicate(session, gap, async_test_engine):
+    for hours in range(1, 21):
+        _task(session, gap, NOW - timedelta(hours=hours))
+    a, b = RecordingNotifier(), RecordingNotifier()
+
+    async def both():
+        await asyncio.gather(_scheduler(async_test_engine, a).tick(NOW),
+                             _scheduler(async_test_engine, b).tick(NOW))
+
+    asyncio.run(both())
+    sent = [t for batch in a.batches + b.batches for t in batch]
+    assert len(sent) == len(set(sent)) == 20
+    assert len(session.exec(select(Reminder)).all()) == 20
+
+
+def test_failed_delivery_is_retried(session, gap, async_test_engine):
+    _task(session, gap, NOW - timedelta(hours=1))
+    asyncio.run(_scheduler(async_test_engine, RecordingNotifier(fail=True)).tick(NOW))
+    assert session.exec(select(Reminder.status)).one() == "queued"
+
+    notifier = RecordingNotifier()
+    assert asyncio.run(_scheduler(async_test_engine, notifier).tick(NOW))[1] == 1
+
+
+def test_scan_is_a_due_date_range_query(session, gap, async_test_engine):
+    _task(session, gap, NOW - timedelta(hours=1))
+    statements = []
+    event.listen(async_test_engine.sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    asyncio.run(_scheduler(async_test_engine, RecordingNotifier()).tick(NOW))
+    scans = [s for s in statements if "FROM task" in s and "due_date >" in s]
+    assert scans and all("task.due_date <=" in s for s in scans)
+
+
+def test_due_dates_written_behind_the_watermark_are_queued_by_the_write(
+        client, auth_headers, session, gap, async_test_engine):
+    task = _task(session, gap, NOW + timedelta(days=5))
+    notifier = RecordingNotifier()
+    scheduler = _scheduler(async_test_engine, notifier)
+    assert asyncio.run(scheduler.tick(NOW)) == (0, 0)
+
+    session.get(Task, task).due_date = NOW - timedelta(days=3)
+    session.commit()
+    body = json.dumps({"gap_id": gap.id, "title": "Renew BAA",
+                       "due_date": (NOW - timedelta(days=2)).isoformat()}) + "\n"
+    assert client.post("/api/v1/import/tasks", content=body, headers=auth_headers).json()["inserted"] == 1
+
+    # Both due dates lie far behind the scan window; the writes queued them.
+    assert asyncio.run(scheduler.tick(NOW + timedelta(minutes=1))) == (0, 2)
+    assert sorted(kind for batch in notifier.batches for _, kind in batch) == ["overdue", "overdue"]
@@ -0,0 +1,103 @@
+import asyncio
+import csv
+import io
+import zipfile
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Evidence, Gap, Policy, Report, Task
+from app.reports.worker import build_runner
+
+
+@pytest.fixture
+def tree(session, user):
+    policy = Policy(owner_id=user.id, title="HIPAA <Security>", file_path="p.pdf")
+    session.add(policy)
+    session.flush()
+    gap = Gap(policy_id=policy.id, description="No BAA with vendor", severity="high")
+    session.add(gap)
+    session.flush()
+    task = Task(gap_id=gap.id, title="Sign BAA", assigned_to=user.id, status="done")
+    session.add(task)
+    session.flush()
+    session.add(Evidence(task_id=task.id, file_path="blobs/x", filename="baa.pdf", size=3, sha256="ab" * 32))
+    session.commit()
+    return policy, task
+
+
+def _build(async_test_engine, storage):
+    factory = lambda: AsyncSession(async_test_engine, expire_on_commit=False)
+    return asyncio.run(build_runner(session_factory=factory, storage=storage).run_once())
+
+
+def test_report_is_built_in_background_then_served_from_cache(
+        client, auth_headers, tree, session, async_test_engine, storage):
+    policy, task = tree
+    url = f"/api/v1/reports/policies/{policy.id}"
+
+    r = client.get(url, headers=auth_headers)
+    assert r.status_code == 202
+    job = client.get(r.headers["Location"], headers=auth_headers).json()
+    assert job["status"] == "queued"
+    assert client.get(url, headers=auth_headers).json()["id"] == job["id"]   # no duplicate job
+
+    assert _build(async_test_engine, storage) == 1
+    r = client.get(url, headers=auth_headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/html")
+    assert "HIPAA &lt;Security&gt;" in r.text and "No BAA with vendor" in r.text
+    assert "ab" * 32 in r.text
+    assert _build(async_test_engine, storage) == 0              # cache hit: nothing queued
+
+    # Any edit under the policy bumps the data version → rebuild.
+    task.title = "Sign BAA with Acme"
+    session.add(task)
+    session.commit()
+    assert client.get(url, headers=auth_headers).status_code == 202
+    _build(async_test_engine, storage)
+    assert "Sign BAA with Acme" in client.get(url, headers=auth_headers).text
+
+    reports = session.exec(select(Report)).all()
+    assert len(reports) == 1                                    # superseded artifact dropped
+    assert len(list((storage.root / "reports").rglob("*.html"))) == 1
+
+
+def test_zip_report_has_html_and_csv_sections(client, auth_headers, tree, user,
+                                              async_test_engine, storage):
+    url = f"/api/v1/reports/owners/{user.id}?format=zip"
+    assert client.get(url, headers=auth_headers).status_code == 202
+    _build(async_test_engine, storage)
+
+    r = client.get(url, headers=auth_headers)
+    archive = zipfile.ZipFile(io.BytesIO(r.content))
+    assert archive.namelist() == ["report.html", "gaps.csv", "evidence.csv", "history.csv"]
+    gaps = list(csv.DictReader(io.StringIO(archive.read("gaps.csv").decode())))
+    assert gaps[0]["task"] == "Sign BAA" and gaps[0]["assignee"] == user.email
+    evidence = list(csv.DictReader(io.StringIO(archive.read("evidence.csv").decode())))
+    assert evidence[0]["sha256"] == "ab" * 32
+    history = list(csv.DictReader(io.StringIO(archive.read("history.csv").decode())))
+    assert [(h["task"], h["status"]) for h in history] == [("Sign BAA", "done")]
+
+
+def test_unknown_scope_is_404(client, auth_headers):
+    assert client.get("/api/v1/reports/policies/999", headers=auth_headers).status_code == 404
+
+
+def test_new_task_event_makes_the_cached_report_stale(client, auth_headers, tree, session,
+                                                      async_test_engine, storage):
+    from app.compliance import history
+
+    policy, task = tree
+    url = f"/api/v1/reports/policies/{policy.id}"
+    client.get(url, headers=auth_headers)
+    _build(async_test_engine, storage)
+    assert client.get(url, headers=auth_headers).status_code == 200
+
+    history.record(session.connection(), [(task.id, "in_progress", task.tenant_id)])
+    session.commit()
+    assert client.get(url, headers=auth_headers).status_code == 202
+    _build(async_test_engine, storage)
+    page = client.get(url, headers=auth_headers).text
+    assert "Task status history" in page and "in_progress" in page
@@ -0,0 +1,63 @@
+import pytest
+
+from app.compliance import scores
+from app.models import Evidence, Gap, OwnerScore, Policy, PolicyScore, Task
+
+
+@pytest.fixture
+def tree(session, user):
+    policy = Policy(owner_id=user.id, title="HIPAA", file_path="p.pdf")
+    session.add(policy)
+    session.flush()
+    high = Gap(policy_id=policy.id, description="No BAA", severity="high")
+    low = Gap(policy_id=policy.id, description="Old SOP", severity="low")
+    session.add_all([high, low])
+    session.flush()
+    tasks = [Task(gap_id=high.id, title="Sign BAA"), Task(gap_id=low.id, title="Review SOP")]
+    session.add_all(tasks)
+    session.commit()
+    return policy, high, low, tasks
+
+
+def test_scores_follow_task_status(session, user, tree):
+    policy, high, low, (sign, review) = tree
+    row = session.get(PolicyScore, policy.id)
+    assert (row.total_weight, row.closed_weight, row.gap_count) == (4, 0, 2)
+
+    sign.status = "done"
+    session.add(sign)
+    session.commit()
+    session.refresh(row)
+    assert (row.closed_weight, row.closed_gaps) == (3, 1)
+    assert row.version >= 2
+
+    owner = session.get(OwnerScore, user.id)
+    session.refresh(owner)
+    assert (owner.total_weight, owner.closed_weight, owner.policy_count) == (4, 3, 1)
+
+    session.add(Task(gap_id=high.id, title="Countersign"))   # reopens the high gap
+    session.add(Evidence(task_id=review.id, file_path="e.pdf"))
+    session.commit()
+    session.refresh(row)
+    assert (row.closed_weight, row.evidence_count) == (0, 1)
+
+
+def test_rebuild_repairs_drift(session, user, tree):
+    policy = tree[0]
+    session.connection().execute(scores.gap_score.delete())
+    session.connection().execute(scores.policy_score.delete())
+    session.commit()
+    assert session.get(PolicyScore, policy.id) is None
+
+    scores.rebuild(session.connection())
+    session.commit()
+    assert session.get(PolicyScore, policy.id).total_weight == 4
+
+
+def test_score_endpoints(client, session, user, auth_headers, tree):
+    policy = tree[0]
+    r = client.get(f"/api/v1/scores/policies/{policy.id}", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json()["score"] == 0.0 and r.json()["gap_count"] == 2
+    assert client.get("/api/v1/scores/me", headers=auth_headers).json()["total_weight"] == 4
+    assert client.get("/api/v1/scores/policies/999", headers=auth_headers).status_code == 404
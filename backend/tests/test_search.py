@@ -0,0 +1,70 @@
+import pytest
+from sqlmodel import select
+
+from app.models import Gap, Policy, Task
+
+
+@pytest.fixture
+def corpus(session, user):
+    policy = Policy(owner_id=user.id, title="Encryption at rest policy", file_path="p.pdf")
+    other = Policy(owner_id=user.id, title="Visitor log", file_path="v.pdf")
+    session.add_all([policy, other])
+    session.flush()
+    gaps = [
+        Gap(policy_id=policy.id, severity="high",
+            description="Laptops lack full-disk encryption; <script> tags are not stripped"),
+        Gap(policy_id=policy.id, severity="medium", description="No BAA signed with the backup vendor"),
+        Gap(policy_id=other.id, severity="low", description="Visitor badges are reused"),
+    ]
+    session.add_all(gaps)
+    session.flush()
+    session.add(Task(gap_id=gaps[1].id, title="Get BAA countersigned"))
+    session.commit()
+    return policy, gaps
+
+
+def _search(client, headers, **params):
+    r = client.get("/api/v1/search", params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_search_ranks_across_kinds_and_highlights(client, auth_headers, corpus):
+    result = _search(client, auth_headers, q="encrypt")
+    assert {(h["kind"], h["text"]) for h in result["items"]} == {
+        ("policy", "Encryption at rest policy"),
+        ("gap", "Laptops lack full-disk encryption; <script> tags are not stripped"),
+    }
+    gap_hit = next(h for h in result["items"] if h["kind"] == "gap")
+    assert "<mark>encryption</mark>" in gap_hit["highlight"]
+    assert "&lt;script&gt;" in gap_hit["highlight"]           # stored text is escaped
+
+    hits = _search(client, auth_headers, q="baa", kind="task")["items"]
+    assert [h["kind"] for h in hits] == ["task"]
+
+
+def test_search_follows_writes_and_paginates(client, auth_headers, corpus, session):
+    policy, gaps = corpus
+    gaps[2].description = "Badge encryption keys are shared"
+    session.add(gaps[2])
+    session.delete(session.exec(select(Task)).one())
+    session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "encryption", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        result = _search(client, auth_headers, **params)
+        seen += [(h["kind"], h["id"]) for h in result["items"]]
+        if not (cursor := result["next_cursor"]):
+            break
+    assert len(seen) == len(set(seen)) == 3
+    assert ("gap", gaps[2].id) in seen
+
+    assert _search(client, auth_headers, q="reused")["items"] == []    # old text is gone
+    assert _search(client, auth_headers, q="countersigned")["items"] == []  # deleted task
+
+
+def test_search_rejects_empty_queries(client, auth_headers):
+    assert client.get("/api/v1/search", params={"q": "!!"}, headers=auth_headers).status_code == 400
+    assert client.get("/api/v1/search", params={"q": "x", "cursor": "@@"},
+                      headers=auth_headers).status_code == 400
@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from app.models import Evidence, Gap, Policy, Task
+from app.storage import ObjectNotFound
+from app.storage.s3 import S3Storage
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client we use."""
+
+    class Missing(Exception):
+        def __init__(self, code):
+            self.response = {"Error": {"Code": code}}
+
+    def __init__(self):
+        self.objects, self.uploads = {}, {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = bytes(Body)
+
+    def get_object(self, Bucket, Key, Range):
+        if Key not in self.objects:
+            raise self.Missing("NoSuchKey")
+        start, end = Range[len("bytes="):].split("-")
+        data = self.objects[Key]
+        return {"Body": io.BytesIO(data[int(start): int(end) + 1 if end else None])}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self.Missing("404")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def copy_object(self, Bucket, Key, CopySource):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"u{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+
+    def list_parts(self, Bucket, Key, UploadId):
+        return {"Parts": [{"PartNumber": n, "ETag": f"e{n}"} for n in self.uploads[UploadId]]}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        if self.uploads.pop(UploadId, None) is None:
+            raise self.Missing("NoSuchUpload")
+
+
+async def _chunks(data, size=7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _read(backend, key, start=0, end=None):
+    return b"".join([c async for c in backend.open_range(key, start, end)])
+
+
+def test_s3_backend_streams_through_multipart():
+    data = bytes(range(256)) * 10
+    backend = S3Storage(FakeS3Client(), "bucket", part_size=1000)
+
+    async def scenario():
+        stored = await backend.put_stream("k", _chunks(data))
+        assert stored.size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert await _read(backend, "k") == data
+        assert await _read(backend, "k", 10, 19) == data[10:20]
+        await backend.move("k", "moved")
+        assert not await backend.exists("k")
+        await backend.delete("moved")
+        with pytest.raises(ObjectNotFound):
+            await backend.size("moved")
+
+    asyncio.run(scenario())
+    assert backend.client.uploads == {}
+
+
+@pytest.fixture
+def task(session, user):
+    policy = Policy(owner_id=user.id, title="HIPAA", file_path="")
+    session.add(policy)
+    session.flush()
+    gap = Gap(policy_id=policy.id, description="d", severity="low")
+    session.add(gap)
+    session.flush()
+    task = Task(gap_id=gap.id, title="t")
+    session.add(task)
+    session.commit()
+    return task
+
+
+def test_evidence_upload_and_ranged_download(client, storage, task, auth_headers):
+    data = b"%PDF-" + b"x" * 5000
+    r = client.post(f"/api/v1/tasks/{task.id}/evidence", params={"filename": "sop.pdf"},
+                    content=data, headers={**auth_headers, "Content-Type": "application/pdf"})
+    assert r.status_code == 201
+    evidence = r.json()
+    assert evidence["sha256"] == hashlib.sha256(data).hexdigest()
+    assert evidence["size"] == len(data)
+
+    url = f"/api/v1/evidence/{evidence['id']}/file"
+    full = client.get(url, headers=auth_headers)
+    assert full.content == data and full.headers["accept-ranges"] == "bytes"
+    part = client.get(url, headers={**auth_headers, "Range": "bytes=100-199"})
+    assert part.status_code == 206 and part.content == data[100:200]
+    assert part.headers["content-range"] == f"bytes 100-199/{len(data)}"
+    tail = client.get(url, headers={**auth_headers, "Range": "bytes=-10"})
+    assert tail.content == data[-10:]
+    bad = client.get(url, headers={**auth_headers, "Range": "bytes=99999-"})
+    assert bad.status_code == 416
+
+    r = client.post(f"/api/v1/tasks/{task.id}/evidence", headers={**auth_headers, "Content-Length": "lots"})
+    assert r.status_code == 400
+
+
+def test_policy_file_replacement_and_download_names(client, storage, task, auth_headers):
+    policy_id = task.gap.policy_id
+    for data in (b"v1", b"v2"):
+        assert client.put(f"/api/v1/policies/{policy_id}/file", content=data,
+                          headers=auth_headers).status_code == 200
+    stored = [p.read_bytes() for p in (storage.root / "policies").rglob("*") if p.is_file()]
+    assert stored == [b"v2"]                               # the replaced version is gone
+
+    r = client.post(f"/api/v1/tasks/{task.id}/evidence", params={"filename": 'Q3 "final" ✓.pdf'},
+                    content=b"x", headers=auth_headers)
+    disposition = client.get(f"/api/v1/evidence/{r.json()['id']}/file",
+                             headers=auth_headers).headers["content-disposition"]
+    assert disposition == ('attachment; filename="Q3 _final_ _.pdf"; '
+                           "filename*=UTF-8''Q3%20%22final%22%20%E2%9C%93.pdf")
+
+
+def test_resumable_upload(client, storage, task, session, auth_headers):
+    r = client.post("/api/v1/uploads", json={"kind": "evidence", "target_id": task.id,
+                                             "filename": "scan.pdf"}, headers=auth_headers)
+    upload_id = r.json()["id"]
+    client.put(f"/api/v1/uploads/{upload_id}/parts/1", content=b"aaa", headers=auth_headers)
+    client.put(f"/api/v1/uploads/{upload_id}/parts/2", content=b"XXX", headers=auth_headers)
+    # a dropped connection is retried by re-sending the same part
+    client.put(f"/api/v1/uploads/{upload_id}/parts/2", content=b"bbb", headers=auth_headers)
+    status = client.get(f"/api/v1/uploads/{upload_id}", headers=auth_headers).json()
+    assert [p["part_number"] for p in status["parts"]] == [1, 2]
+
+    done = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers).json()
+    assert done["sha256"] == hashlib.sha256(b"aaabbb").hexdigest()
+    assert session.get(Evidence, done["id"]).filename == "scan.pdf"
+    assert client.get(f"/api/v1/evidence/{done['id']}/file", headers=auth_headers).content == b"aaabbb"
+    again = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+    assert again.status_code == 409
+
+
+def test_identical_evidence_is_stored_once(client, storage, task, session, auth_headers):
+    from app.models import Blob
+
+    data = b"same SOP bytes" * 100
+    digest = hashlib.sha256(data).hexdigest()
+    first = client.post(f"/api/v1/tasks/{task.id}/evidence", content=data, headers=auth_headers).json()
+    second = client.post(f"/api/v1/tasks/{task.id}/evidence", content=data, headers=auth_headers).json()
+    assert first["file_path"] == second["file_path"]
+    by_hash = client.post(f"/api/v1/tasks/{task.id}/evidence/by-hash",
+                          json={"sha256": digest, "filename": "copy.pdf"}, headers=auth_headers)
+    assert by_hash.status_code == 201
+    assert client.post(f"/api/v1/tasks/{task.id}/evidence/by-hash", json={"sha256": "0" * 64},
+                       headers=auth_headers).status_code == 404
+
+    blob = session.get(Blob, digest)
+    assert blob.refcount == 3
+    files = [p for p in (storage.root).rglob("*") if p.is_file()]
+    assert len(files) == 1                                 # staged duplicates dropped
+
+    for evidence in (first, second):
+        assert client.delete(f"/api/v1/evidence/{evidence['id']}",
+                             headers=auth_headers).status_code == 204
+    assert storage.root.joinpath(first["file_path"]).is_file()
+    client.delete(f"/api/v1/evidence/{by_hash.json()['id']}", headers=auth_headers)
+    assert not storage.root.joinpath(first["file_path"]).exists()
+    session.expire_all()
+    assert session.get(Blob, digest) is None
+
+
+def test_oversized_s3_part_is_413(client, task, auth_headers):
+    from app.main import app
+    from app.storage import get_storage
+
+    app.dependency_overrides[get_storage] = lambda: S3Storage(FakeS3Client(), "bucket", part_size=10)
+    try:
+        r = client.post("/api/v1/uploads", json={"kind": "evidence", "target_id": task.id},
+                        headers=auth_headers)
+        part = client.put(f"/api/v1/uploads/{r.json()['id']}/parts/1", content=b"x" * 11,
+                          headers=auth_headers)
+        assert part.status_code == 413
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+
+def test_blob_recreated_before_a_delayed_delete_keeps_its_bytes(async_test_engine, storage):
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.storage import blobs
+
+    data = b"the only copy of the signed BAA"
+
+    async def upload(session, name):
+        staged = await storage.put_stream(f"staging/{name}", _chunks(data))
+        return await blobs.ingest(session, storage, staged)
+
+    async def scenario():
+        async with AsyncSession(async_test_engine) as session:
+            first = await upload(session, "a")
+            await session.commit()
+            doomed = await blobs.release(session, first.sha256)
+            await session.commit()
+            again = await upload(session, "b")            # same bytes, between commit and delete
+            await session.commit()
+            for key in doomed:
+                await storage.delete(key)
+            return first, again
+
+    first, again = asyncio.run(scenario())
+    assert again.key != first.key
+    assert storage.root.joinpath(again.key).read_bytes() == data
@@ -0,0 +1,126 @@
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, select
+
+from app.auth.security import create_access_token
+from app.models import Gap, Organization, Policy, Task, User
+from app.tenancy import CrossTenantWrite, current_tenant
+
+
+@pytest.fixture
+def tenants(session):
+    """Two organizations, each with an owner and one policy → gap → task."""
+    out = []
+    for name in ("acme", "globex"):
+        org = Organization(name=name.title(), slug=name)
+        owner = User(email=f"owner@{name}.example", hashed_password="x")
+        session.add(org)
+        session.flush()
+        owner.tenant_id = org.id
+        policy = Policy(owner=owner, title=f"{name} encryption policy", file_path=f"{name}.pdf")
+        gap = Gap(policy=policy, description=f"{name} encryption keys not rotated", severity="high")
+        session.add(Task(gap=gap, title=f"Rotate {name} encryption keys", assigned_to=None))
+        session.commit()
+        out.append({"org": org.id, "policy": policy.id, "gap": gap.id,
+                    "headers": {"Authorization": f"Bearer {create_access_token(subject=owner.email)}"}})
+    return out
+
+
+def test_unscoped_writes_inherit_the_parent_tenant(session, tenants):
+    acme, globex = tenants
+    assert {g.tenant_id for g in session.exec(select(Gap).where(Gap.policy_id == acme["policy"]))} == {acme["org"]}
+    assert {t.tenant_id for t in session.exec(select(Task).where(Task.gap_id == globex["gap"]))} == {globex["org"]}
+
+
+def test_lists_search_and_lookups_stay_inside_the_tenant(client, tenants):
+    acme, globex = tenants
+    policies = client.get("/api/v1/policies", headers=acme["headers"]).json()["items"]
+    assert [p["id"] for p in policies] == [acme["policy"]]
+    gaps = client.get("/api/v1/gaps", headers=globex["headers"]).json()["items"]
+    assert [g["id"] for g in gaps] == [globex["gap"]]
+
+    hits = client.get("/api/v1/search", params={"q": "encryption"}, headers=acme["headers"]).json()["items"]
+    assert {h["text"].split()[0].lower() for h in hits} == {"acme", "rotate"}
+    assert all("globex" not in h["text"].lower() for h in hits)
+
+    as_of = client.get("/api/v1/tasks/as-of", params={"at": datetime.utcnow().isoformat()},
+                       headers=globex["headers"]).json()
+    assert as_of["counts"]["open"] == 1          # task history is scoped too
+
+    # Another tenant's id is indistinguishable from one that does not exist.
+    r = client.post(f"/api/v1/policies/{globex['policy']}/analysis", headers=acme["headers"])
+    assert r.status_code == 404
+
+
+def test_api_writes_are_stamped_and_bulk_is_scoped(client, session, tenants):
+    acme, globex = tenants
+    body = "\n".join(json.dumps(row) for row in [
+        {"policy_id": acme["policy"], "description": "Backups untested", "severity": "low"},
+        {"policy_id": globex["policy"], "description": "Smuggled", "severity": "low"},
+    ]) + "\n"
+    report = client.post("/api/v1/import/gaps", content=body, headers=acme["headers"]).json()
+    assert (report["inserted"], report["failed"]) == (1, 1)
+    assert "does not exist" in report["errors"][0]["errors"][0]
+    imported = session.exec(select(Gap).where(Gap.description == "Backups untested")).one()
+    assert imported.tenant_id == acme["org"]
+
+    lines = client.get("/api/v1/export/gaps", headers=globex["headers"]).text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [globex["gap"]]
+
+
+def test_scoped_session_refuses_foreign_rows(test_engine, tenants):
+    acme, globex = tenants
+    with Session(test_engine) as s:
+        s.info["tenant_id"] = acme["org"]
+        assert current_tenant(s) == acme["org"]
+        assert s.get(Policy, globex["policy"]) is None
+        assert s.get(Policy, acme["policy"]) is not None
+
+        s.add(Gap(policy_id=acme["policy"], description="stamped", severity="low"))
+        s.flush()
+        assert s.exec(select(Gap).where(Gap.description == "stamped")).one().tenant_id == acme["org"]
+
+        s.add(Gap(policy_id=globex["policy"], tenant_id=globex["org"], description="x", severity="low"))
+        with pytest.raises(CrossTenantWrite):
+            s.flush()
+
+
+def test_register_starts_a_new_organization(client, session):
+    for email in ("a@example.com", "b@example.com"):
+        assert client.post("/auth/register", json={"email": email, "password": "pw"}).status_code == 201
+    orgs = session.exec(select(Organization).order_by(Organization.id)).all()
+    assert orgs[0].slug == "example-com" and orgs[1].slug.startswith("example-com-")
+    users = session.exec(select(User).order_by(User.id)).all()
+    assert [u.tenant_id for u in users] == [o.id for o in orgs]
+
+
+def test_evidence_by_hash_needs_the_bytes_in_your_own_tenant(client, session, storage, tenants):
+    acme, globex = tenants
+    task_of = {t["org"]: session.exec(select(Task.id).where(Task.gap_id == t["gap"])).one() for t in tenants}
+    data = b"acme penetration test report"
+    client.post(f"/api/v1/tasks/{task_of[acme['org']]}/evidence", content=data, headers=acme["headers"])
+    digest = {"sha256": hashlib.sha256(data).hexdigest()}
+
+    stolen = client.post(f"/api/v1/tasks/{task_of[globex['org']]}/evidence/by-hash", json=digest,
+                         headers=globex["headers"])
+    assert stolen.status_code == 404                  # a known hash is not a key to the file
+    reused = client.post(f"/api/v1/tasks/{task_of[acme['org']]}/evidence/by-hash", json=digest,
+                         headers=acme["headers"])
+    assert reused.status_code == 201
+
+
+def test_rls_setting_tells_a_tenantless_user_from_an_unscoped_session():
+    from app import tenancy
+
+    sent = []
+
+    class Connection:
+        def execute(self, statement, params):
+            sent.append(params["tenant"])
+
+    tenancy._set_rls(Connection(), None)
+    tenancy._set_rls(Connection(), 7)
+    assert sent == [tenancy.NO_TENANT, "7"]        # '' would disable the policy